@@ -1,6 +1,9 @@
 """Forms for user registration and profile editing."""
 from django import forms
+from django.conf import settings
 from django.contrib.auth.forms import UserCreationForm
+from django.core.files.uploadedfile import UploadedFile
+from mediafiles.processing import normalize_image
 from .models import User
 
 
@@ -111,13 +114,16 @@ class UserProfileForm(forms.ModelForm):
             ),
         }
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, rejected_uploads=(), **kwargs):
         super().__init__(*args, **kwargs)
+        self.rejected_uploads = set(rejected_uploads)
         # Добавляем help_text для некоторых полей
         self.fields["phone"].help_text = "Контактный телефон для связи"
         self.fields["city"].help_text = "Ваш город проживания"
         self.fields["birth_date"].help_text = "Для расчета возрастной категории"
-        self.fields["photo"].help_text = "JPG, PNG до 5МБ"
+        self.fields["photo"].help_text = (
+            f"JPG, PNG до {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}МБ"
+        )
         widgets = {
             "first_name": forms.TextInput(attrs={"class": "form-control"}),
             "last_name": forms.TextInput(attrs={"class": "form-control"}),
@@ -131,3 +137,19 @@ class UserProfileForm(forms.ModelForm):
             "photo": forms.FileInput(attrs={"class": "form-control"}),
             "bio": forms.Textarea(attrs={"class": "form-control", "rows": 4}),
         }
+
+    def clean_photo(self):
+        """Reject oversized uploads and strip EXIF / downscale new photos."""
+        if "photo" in self.rejected_uploads:
+            raise forms.ValidationError(
+                f"Файл слишком большой. Максимальный размер - "
+                f"{settings.MAX_UPLOAD_SIZE // (1024 * 1024)}МБ."
+            )
+
+        photo = self.cleaned_data.get("photo")
+        if not isinstance(photo, UploadedFile):
+            # Фото не менялось (или удалено)
+            return photo
+        if photo.size > settings.MAX_UPLOAD_SIZE:
+            raise forms.ValidationError("Файл слишком большой.")
+        return normalize_image(photo)
@@ -8,6 +8,10 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView, UpdateView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Q, Count, Sum
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from mediafiles.uploadhandlers import BoundedTemporaryFileUploadHandler
 
 from tournaments.models import Tournament, Match, Rating, Participant, RatingHistory
 from .forms import UserRegistrationForm, UserProfileForm
@@ -166,6 +170,7 @@ class UserProfileView(LoginRequiredMixin, DetailView):
         return context
 
 
+@method_decorator(csrf_exempt, name="dispatch")
 class UserProfileEditView(LoginRequiredMixin, UpdateView):
     """View for editing user profile."""
 
@@ -173,8 +178,19 @@ class UserProfileEditView(LoginRequiredMixin, UpdateView):
     form_class = UserProfileForm
     template_name = "accounts/profile_edit.html"
 
+    def dispatch(self, request, *args, **kwargs):
+        # Обработчик загрузки нужно установить до чтения request.POST,
+        # поэтому CSRF проверяется здесь, а не в middleware
+        request.upload_handlers = [BoundedTemporaryFileUploadHandler(request)]
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
     def get_object(self, queryset=None):
         return self.request.user
 
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["rejected_uploads"] = getattr(self.request, "rejected_uploads", ())
+        return kwargs
+
     def get_success_url(self):
         return reverse_lazy("profile", kwargs={"username": self.request.user.username})
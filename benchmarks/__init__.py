@@ -0,0 +1,2 @@
+"""Performance checks: view benchmarks (test_views.py) and query plans
+(test_query_plans.py)."""
@@ -0,0 +1,212 @@
+"""Execution plans of the hot queries of the site.
+
+The views run against a small generated league; the SQL they execute is
+captured and explained with the same helper as the slow-query log. A
+query passes when its table is read through an index rather than a full
+scan and, for the paginated lists, when the ORDER BY comes straight from
+an index instead of a sort of the whole result. Plans are checked on
+SQLite (``EXPLAIN QUERY PLAN``) and PostgreSQL (``EXPLAIN``); on
+PostgreSQL sequential scans are disabled for the test so that a small
+table does not hide a missing index.
+
+Unlike the view benchmarks these tests are fast and always run.
+"""
+import re
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+
+from monitoring.slowlog import explain
+from tournaments.models import Match
+
+
+class CapturedQueries:
+    """Execute wrapper keeping the SQL and parameters of every query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def matching(self, *fragments):
+        return [
+            (sql, params)
+            for sql, params in self.queries
+            if sql.startswith("SELECT")
+            and all(fragment in sql for fragment in fragments)
+        ]
+
+
+def full_scans(plan, table):
+    """Return the plan lines that read every row of ``table``."""
+    if connection.vendor == "postgresql":
+        pattern = re.compile(rf"Seq Scan on {table}\b")
+    else:
+        # "SCAN t USING INDEX i" - обход индекса, "SCAN t" - всей таблицы
+        pattern = re.compile(rf"\bSCAN {table}(?: AS \w+)?$")
+    return [line.strip() for line in plan.splitlines() if pattern.search(line.strip())]
+
+
+def sorts(plan):
+    """Return the plan lines that sort rows instead of reading them in order."""
+    if connection.vendor == "postgresql":
+        pattern = re.compile(r"^(?:->\s+)?(?:Incremental )?Sort\b")
+    else:
+        pattern = re.compile(r"USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY")
+    return [line.strip() for line in plan.splitlines() if pattern.search(line.strip())]
+
+
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        # Манифест статики есть только после collectstatic
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    },
+    SLOW_QUERY_THRESHOLD_MS=0,
+    QUERY_INSTRUMENTATION=False,
+)
+class QueryPlanTests(TestCase):
+    """The hot queries of the lists and filters read through indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "generate_load_dataset",
+            users=400,
+            tournaments=30,
+            matches=1500,
+            courts=300,
+            partner_searches=200,
+            articles=10,
+            seed=7,
+            stdout=StringIO(),
+        )
+        cls.player = Match.objects.order_by("pk").first().player1
+
+    def setUp(self):
+        cache.clear()
+        if connection.vendor == "postgresql":
+            # На маленьких таблицах Seq Scan дешевле любого индекса
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+    def capture(self, url, user=None):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        captured = CapturedQueries()
+        with connection.execute_wrapper(captured):
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return captured
+
+    def assertIndexed(self, queries, table, ordered=False, using=None):
+        """Fail when a query scans all of ``table`` (or sorts, if ``ordered``).
+
+        ``using`` is a pattern the plan must contain, for queries where the
+        choice between several indexes matters.
+        """
+        self.assertTrue(queries, f"no queries on {table} captured")
+        for sql, params in queries:
+            plan = explain(connection, sql, params)
+            self.assertFalse(
+                full_scans(plan, table), f"full scan of {table}:\n{sql}\n\n{plan}"
+            )
+            if ordered and " ORDER BY " in sql:
+                self.assertFalse(
+                    sorts(plan), f"sort instead of index order:\n{sql}\n\n{plan}"
+                )
+            if using:
+                self.assertRegex(
+                    plan, using, f"expected index not used:\n{sql}\n\n{plan}"
+                )
+
+    def test_home_tournament_filter(self):
+        captured = self.capture("/?category=MEN&level=2.5-3.5")
+        self.assertIndexed(
+            captured.matching('"tournaments_tournament"."end_date" >='),
+            "tournaments_tournament",
+        )
+
+    def test_home_recent_results(self):
+        captured = self.capture("/")
+        self.assertIndexed(
+            captured.matching('ORDER BY "tournaments_match"."updated_at" DESC'),
+            "tournaments_match",
+            ordered=True,
+        )
+
+    def test_match_list_ordering(self):
+        captured = self.capture("/matches/")
+        self.assertIndexed(
+            captured.matching('FROM "tournaments_match"'),
+            "tournaments_match",
+            ordered=True,
+        )
+
+    def test_match_list_status_filter(self):
+        captured = self.capture("/matches/?status=FINISHED")
+        self.assertIndexed(
+            captured.matching(
+                'FROM "tournaments_match"', '"tournaments_match"."status" ='
+            ),
+            "tournaments_match",
+            ordered=True,
+        )
+
+    def test_rating_list_ordering(self):
+        captured = self.capture("/rating/")
+        self.assertIndexed(
+            captured.matching(
+                'FROM "tournaments_rating"', '"tournaments_rating"."points" DESC'
+            ),
+            "tournaments_rating",
+            ordered=True,
+        )
+
+    def test_tournament_detail_matches(self):
+        tournament = Match.objects.order_by("pk").first().tournament_id
+        captured = self.capture(f"/tournaments/{tournament}/")
+        self.assertIndexed(
+            captured.matching(
+                'FROM "tournaments_match"', 'ORDER BY "tournaments_match"."round"'
+            ),
+            "tournaments_match",
+            ordered=True,
+        )
+
+    def test_court_list_ordering(self):
+        for url in ("/courts/", "/courts/?region=CENTER"):
+            with self.subTest(url=url):
+                captured = self.capture(url)
+                self.assertIndexed(
+                    # COUNT(*) по почти всем активным кортам индексу не нужен
+                    captured.matching('FROM "tournaments_courtlocation"', "ORDER BY"),
+                    "tournaments_courtlocation",
+                    ordered=True,
+                )
+
+    def test_my_games_match_lookups(self):
+        captured = self.capture("/my-games/", user=self.player)
+        # Индекс по статусу здесь хуже: он перебирает матчи всех игроков
+        self.assertIndexed(
+            captured.matching('FROM "tournaments_match"'),
+            "tournaments_match",
+            using="player[12]",
+        )
+
+    def test_partner_search_filters(self):
+        captured = self.capture("/partner-search/?sport=TENNIS&level=3.0")
+        self.assertIndexed(
+            captured.matching('FROM "tournaments_partnersearch"', '"is_active"'),
+            "tournaments_partnersearch",
+            ordered=True,
+        )
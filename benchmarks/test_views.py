@@ -0,0 +1,373 @@
+"""Latency and query budgets of every page against a large generated league.
+
+Each URL of the tournaments, accounts, news and info apps is requested
+``BENCHMARK_ITERATIONS`` times with the test client. The query count (the
+largest seen) and the p95 latency must stay within ``budgets.json``; the
+measurements are written to a JSON report for trend tracking.
+
+The suite takes a few minutes, so it only runs when asked to::
+
+    RUN_BENCHMARKS=1 python manage.py test benchmarks
+
+Environment variables:
+
+* ``BENCHMARK_SCALE`` - fraction of the ``generate_load_dataset`` defaults
+  (100k users, 1M matches), 0.05 by default;
+* ``BENCHMARK_ITERATIONS`` - measured requests per case, 20 by default;
+* ``BENCHMARK_LATENCY_FACTOR`` - multiplier of the latency budgets for a
+  slower machine, 1 by default;
+* ``BENCHMARK_REPORT`` - path of the report, ``benchmark-report.json``;
+* ``BENCHMARK_UPDATE_BUDGETS=1`` - rewrite ``budgets.json`` from this run
+  (query counts as measured, p95 latency doubled but at least +20 ms).
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import time
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import URLPattern, reverse
+
+from accounts import urls as accounts_urls
+from info import urls as info_urls
+from monitoring.queries import collect_queries
+from news import urls as news_urls
+from news.counters import flush_views
+from news.models import Article, Comment
+from tournaments import urls as tournaments_urls
+from tournaments.models import Match, PartnerSearch, Tournament
+
+User = get_user_model()
+
+BUDGETS_PATH = Path(__file__).with_name("budgets.json")
+SCALE = float(os.environ.get("BENCHMARK_SCALE", 0.05))
+ITERATIONS = int(os.environ.get("BENCHMARK_ITERATIONS", 20))
+LATENCY_FACTOR = float(os.environ.get("BENCHMARK_LATENCY_FACTOR", 1))
+REPORT_PATH = Path(os.environ.get("BENCHMARK_REPORT", "benchmark-report.json"))
+UPDATE_BUDGETS = os.environ.get("BENCHMARK_UPDATE_BUDGETS") == "1"
+# Первые запросы прогревают кэши и шаблоны и не учитываются
+WARMUP = 2
+
+
+class Case:
+    """One benchmarked request.
+
+    ``kwargs`` is a dict of URL arguments or a callable returning it for
+    the request number, for views that consume their object (deleting a
+    comment). ``user`` is None, "player" or "staff".
+    """
+
+    def __init__(
+        self,
+        url_name,
+        kwargs=None,
+        query=None,
+        user=None,
+        method="get",
+        data=None,
+        key=None,
+    ):
+        self.url_name = url_name
+        self.kwargs = kwargs or {}
+        self.query = query or {}
+        self.user = user
+        self.method = method
+        self.data = data
+        self.key = key or url_name
+
+    def url(self, iteration):
+        kwargs = self.kwargs(iteration) if callable(self.kwargs) else self.kwargs
+        url = reverse(self.url_name, kwargs=kwargs)
+        return f"{url}?{urlencode(self.query)}" if self.query else url
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def url_names(module, namespace=None):
+    names = {
+        pattern.name
+        for pattern in module.urlpatterns
+        if isinstance(pattern, URLPattern) and pattern.name
+    }
+    return {f"{namespace}:{name}" if namespace else name for name in names}
+
+
+@skipUnless(os.environ.get("RUN_BENCHMARKS") == "1", "set RUN_BENCHMARKS=1 to run")
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        # Манифест статики есть только после collectstatic
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    },
+    SLOW_QUERY_THRESHOLD_MS=0,
+    QUERY_INSTRUMENTATION=False,
+)
+class ViewBenchmarks(TestCase):
+    """Every page of the site within its query and latency budget."""
+
+    @classmethod
+    def setUpTestData(cls):
+        started = time.perf_counter()
+        call_command(
+            "generate_load_dataset",
+            users=max(1000, int(100_000 * SCALE)),
+            tournaments=max(50, int(5_000 * SCALE)),
+            matches=int(1_000_000 * SCALE),
+            courts=max(20, int(300 * SCALE)),
+            partner_searches=int(20_000 * SCALE),
+            articles=int(5_000 * SCALE),
+            seed=1,
+            stdout=StringIO(),
+        )
+        call_command("refresh_court_stats", stdout=StringIO())
+        cls.dataset_seconds = time.perf_counter() - started
+
+        cls.staff = User.objects.create_user(
+            "bench_staff", password="bench", is_staff=True
+        )
+        scheduled = Match.objects.filter(status="SCHEDULED").order_by("pk").first()
+        cls.player = scheduled.player1
+        cls.match = scheduled
+        cls.ongoing = Tournament.objects.get(pk=scheduled.tournament_id)
+        cls.upcoming = (
+            Tournament.objects.filter(status="UPCOMING").order_by("pk").first()
+        )
+        cls.finished = (
+            Tournament.objects.filter(status="FINISHED").order_by("pk").first()
+        )
+        cls.court = cls.match.court_location
+        cls.search = PartnerSearch.objects.filter(is_active=True).order_by("pk").first()
+
+        cls.article = (
+            Article.objects.filter(published=True).order_by("-created_at").first()
+        )
+        for number in range(60):
+            Comment.objects.create(
+                article=cls.article, author=cls.player, content=f"Комментарий {number}"
+            )
+        runs = WARMUP + ITERATIONS
+        cls.deletable = [
+            Comment.objects.create(
+                article=cls.article, author=cls.staff, content="Удалить"
+            ).pk
+            for _ in range(runs)
+        ]
+        cls.pending = [
+            Comment.objects.create(
+                article=cls.article,
+                author=cls.player,
+                content="На модерации",
+                is_approved=False,
+            ).pk
+            for _ in range(runs)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        # Просмотры статей копятся в памяти процесса
+        flush_views()
+
+    def cases(self):
+        today = self.match.scheduled_date.date().isoformat()
+        return [
+            # tournaments
+            Case("home"),
+            Case(
+                "home",
+                query={"category": "MEN", "level": "2.5-3.5"},
+                key="home_filtered",
+            ),
+            Case("tournament_list"),
+            Case(
+                "tournament_list",
+                query={"status": "FINISHED", "page": 5},
+                key="tournament_list_finished",
+            ),
+            Case("tournament_feed", {"fmt": "rss"}),
+            Case("tournament_detail", {"pk": self.ongoing.pk}),
+            Case("tournament_register", {"pk": self.upcoming.pk}, user="player"),
+            Case("tournament_draw", {"pk": self.finished.pk}, user="staff"),
+            Case("match_list"),
+            Case(
+                "match_list",
+                query={"status": "FINISHED", "page": 10},
+                key="match_list_finished",
+            ),
+            Case("match_result_feed", {"fmt": "rss"}),
+            Case("match_detail", {"pk": self.match.pk}),
+            Case("match_submit_result", {"pk": self.match.pk}, user="player"),
+            Case("court_list"),
+            Case("court_list", query={"near": "55.75,37.62"}, key="court_list_near"),
+            Case("courts_nearby", query={"near": "55.75,37.62"}),
+            Case("court_detail", {"pk": self.court.pk}),
+            Case("court_free_slots", {"pk": self.court.pk}, query={"date": today}),
+            Case("partner_search_list"),
+            Case(
+                "partner_search_list",
+                query={"sport": "TENNIS", "level": "3.0", "time": "будни вечером"},
+                key="partner_search_list_filtered",
+            ),
+            Case("partner_search_create", user="player"),
+            Case("partner_search_matches", {"pk": self.search.pk}, user="player"),
+            Case("rating_list"),
+            Case(
+                "rating_list", query={"gender": "F", "page": 3}, key="rating_list_women"
+            ),
+            Case("my_games", user="player"),
+            Case("admin_dashboard", user="staff"),
+            # accounts
+            Case("register"),
+            Case("login"),
+            Case("logout", user="player", method="post"),
+            Case("my_profile", user="player"),
+            Case("profile_edit", user="player"),
+            Case("profile", {"username": self.player.username}, user="staff"),
+            # news
+            Case("article_list"),
+            Case(
+                "article_list", query={"q": "турнир финал"}, key="article_list_search"
+            ),
+            Case("article_feed", {"fmt": "rss"}),
+            Case("article_detail", {"slug": self.article.slug}),
+            Case("article_comments", {"slug": self.article.slug}),
+            Case(
+                "add_comment",
+                {"slug": self.article.slug},
+                user="player",
+                method="post",
+                data={"content": "Отличный матч!"},
+            ),
+            Case(
+                "delete_comment",
+                lambda iteration: {"pk": self.deletable[iteration]},
+                user="staff",
+                method="post",
+            ),
+            Case(
+                "approve_comment",
+                lambda iteration: {"pk": self.pending[iteration]},
+                user="staff",
+                method="post",
+            ),
+            # info
+            Case("info:hub"),
+            Case("info:rating_system"),
+            Case("info:tournament_systems"),
+            Case("info:ntrp"),
+            Case("info:levels"),
+            Case("info:points"),
+        ]
+
+    def measure(self, case):
+        users = {"player": self.player, "staff": self.staff}
+        client = Client()
+        durations, queries, statuses = [], [], set()
+        for iteration in range(WARMUP + ITERATIONS):
+            if case.user:
+                # Вход - не часть измеряемого запроса
+                client.force_login(users[case.user])
+            url = case.url(iteration)
+            with collect_queries() as collected:
+                started = time.perf_counter()
+                response = getattr(client, case.method)(url, case.data)
+                elapsed = time.perf_counter() - started
+            self.assertLess(response.status_code, 400, f"{case.key}: {url}")
+            if iteration >= WARMUP:
+                durations.append(elapsed * 1000)
+                queries.append(collected.count)
+                statuses.add(response.status_code)
+        return {
+            "queries": max(queries),
+            "p50_ms": round(statistics.median(durations), 2),
+            "p95_ms": round(percentile(durations, 0.95), 2),
+            "max_ms": round(max(durations), 2),
+            "status": sorted(statuses),
+        }
+
+    def test_every_url_is_benchmarked(self):
+        names = (
+            url_names(tournaments_urls)
+            | url_names(accounts_urls)
+            | url_names(news_urls)
+            | url_names(info_urls, info_urls.app_name)
+        )
+        covered = {case.url_name for case in self.cases()}
+        self.assertEqual(names - covered, set(), "URLs without a benchmark case")
+
+    def test_views_within_budgets(self):
+        budgets = json.loads(BUDGETS_PATH.read_text(encoding="utf-8"))
+        results = {}
+        for case in self.cases():
+            cache.clear()
+            results[case.key] = self.measure(case)
+
+        self.write_report(results)
+        if UPDATE_BUDGETS:
+            self.write_budgets(results)
+            return
+
+        for key, result in results.items():
+            with self.subTest(case=key):
+                budget = budgets.get(key)
+                self.assertIsNotNone(
+                    budget, f"No budget for {key}: run with BENCHMARK_UPDATE_BUDGETS=1"
+                )
+                self.assertLessEqual(
+                    result["queries"],
+                    budget["queries"],
+                    f"{key}: {result['queries']} queries, budget {budget['queries']}",
+                )
+                limit = budget["p95_ms"] * LATENCY_FACTOR
+                self.assertLessEqual(
+                    result["p95_ms"],
+                    limit,
+                    f"{key}: p95 {result['p95_ms']} ms, budget {limit:.0f} ms",
+                )
+
+    def write_report(self, results):
+        report = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "scale": SCALE,
+            "iterations": ITERATIONS,
+            "dataset_seconds": round(self.dataset_seconds, 1),
+            "results": results,
+        }
+        REPORT_PATH.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    def write_budgets(self, results):
+        budgets = {
+            key: {
+                "queries": result["queries"],
+                # Запас на шум: вдвое, но не меньше 20 мс; округление до 5 мс
+                "p95_ms": math.ceil(
+                    max(result["p95_ms"] * 2, result["p95_ms"] + 20) / 5
+                )
+                * 5,
+            }
+            for key, result in sorted(results.items())
+        }
+        BUDGETS_PATH.write_text(
+            json.dumps(budgets, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
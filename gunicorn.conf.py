@@ -0,0 +1,18 @@
+"""Gunicorn settings, read automatically from the project directory."""
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tennis_league.settings")
+
+
+def on_starting(server):
+    """Fold metrics files left by workers of a previous run."""
+    from monitoring.metrics import REGISTRY
+
+    REGISTRY.retire_dead()
+
+
+def child_exit(server, worker):
+    """Fold the metrics file of an exited worker into the shared totals."""
+    from monitoring.metrics import REGISTRY
+
+    REGISTRY.retire(worker.pid)
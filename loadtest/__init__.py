@@ -0,0 +1,19 @@
+"""Load generator for a locally started production-like server.
+
+Replays scripted user journeys (see ``journeys``) from many concurrent
+virtual users over plain asyncio sockets and reports throughput, latency
+percentiles and error rates per step. Only the standard library is used,
+so it runs from any Python without installing anything.
+
+Typical run against the ``Procfile`` setup on a generated dataset::
+
+    python manage.py generate_load_dataset
+    python manage.py collectstatic --noinput
+    DEBUG=False gunicorn tennis_league.wsgi --workers 4 --bind 127.0.0.1:8000
+    python -m loadtest --users 10,25,50,100 --duration 60 --json loadtest.json
+
+Each number in ``--users`` is a stage; the closing table shows how the
+p95 latency of the home page and of the result confirmation grows with
+the number of users. The journeys write to the database (registrations,
+match results), so run them against a throwaway copy.
+"""
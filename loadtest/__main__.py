@@ -0,0 +1,202 @@
+"""Command line of the load generator: ``python -m loadtest --help``."""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from .journeys import JOURNEYS, Context, Skip
+from .stats import Recorder, format_summary
+
+# Шаги, по которым судим о деградации: главная и подтверждение результата
+KEY_STEPS = ("home", "result_confirm")
+
+
+def parse_mix(value):
+    """Parse "browse=6,result=2" into journey weights."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in JOURNEYS:
+            raise argparse.ArgumentTypeError(
+                f"unknown journey {name!r}, choose from {', '.join(JOURNEYS)}"
+            )
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_stages(value):
+    try:
+        stages = [int(users) for users in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected a list of user counts, e.g. 10,50,100"
+        )
+    if not stages or min(stages) < 1:
+        raise argparse.ArgumentTypeError("user counts must be positive")
+    return stages
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest",
+        description=(
+            "Replay user journeys against a running site "
+            "and report per-step latency."
+        ),
+    )
+    parser.add_argument(
+        "--url", default="http://127.0.0.1:8000", help="Site root (http only)"
+    )
+    parser.add_argument(
+        "--users",
+        type=parse_stages,
+        default=[10],
+        help=(
+            "Concurrent virtual users; "
+            "a list such as 10,50,100 runs one stage per count"
+        ),
+    )
+    parser.add_argument("--duration", type=float, default=60, help="Seconds per stage")
+    parser.add_argument(
+        "--ramp-up",
+        type=float,
+        default=5,
+        help="Seconds over which the users of a stage start",
+    )
+    parser.add_argument(
+        "--think",
+        type=float,
+        default=1.0,
+        help="Mean pause between journeys of a user, s",
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix("browse=5,leaderboard=2,register=1,result=2"),
+        help="Journey weights, default browse=5,leaderboard=2,register=1,result=2",
+    )
+    parser.add_argument(
+        "--prefix", default="load", help="Username prefix of generate_load_dataset"
+    )
+    parser.add_argument(
+        "--accounts",
+        type=int,
+        default=100_000,
+        help="Number of generated accounts to log in as",
+    )
+    parser.add_argument(
+        "--password", default="loadtest", help="Password of generated accounts"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout, s")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--slo-ms",
+        type=float,
+        default=1000,
+        help="p95 above which a stage counts as degraded",
+    )
+    parser.add_argument(
+        "--json", type=Path, help="Write the stage summaries to this file"
+    )
+    return parser
+
+
+async def virtual_user(index, stage, args, recorder, deadline):
+    rng = random.Random(f"{args.seed}-{stage}-{index}")
+    context = Context(
+        args.url, rng, args.prefix, args.accounts, args.password, args.timeout
+    )
+    names, weights = list(args.mix), list(args.mix.values())
+
+    # Пользователи стартуют равномерно в течение ramp-up
+    await asyncio.sleep(args.ramp_up * index / max(stage, 1))
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        # Каждое путешествие - новый посетитель со своими cookies
+        session = context.session()
+        try:
+            await JOURNEYS[name](session, recorder, context)
+            recorder.journeys[name] += 1
+        except Skip as reason:
+            recorder.skipped[f"{name} ({reason})"] += 1
+        except Exception as error:
+            # HTTP-ошибки уже учтены в шаге; тип исключения отличит баг сценария
+            recorder.fail(name, error)
+        finally:
+            await session.close()
+        if args.think:
+            await asyncio.sleep(min(rng.expovariate(1 / args.think), args.think * 5))
+
+
+async def run_stage(users, args):
+    recorder = Recorder(users)
+    deadline = time.monotonic() + args.duration
+    await asyncio.gather(
+        *(
+            virtual_user(index, users, args, recorder, deadline)
+            for index in range(users)
+        )
+    )
+    recorder.stop()
+    return recorder.summary()
+
+
+def degraded(summary, slo_ms):
+    return sorted(
+        name
+        for name, step in summary["steps"].items()
+        if step.get("p95_ms", 0) > slo_ms or step["error_rate"] > 0.01
+    )
+
+
+def format_capacity(summaries, slo_ms):
+    header = f"{'users':>6}{'req/s':>9}{'err%':>7}" + "".join(
+        f"{'p95 ' + name:>20}" for name in KEY_STEPS
+    )
+    lines = [header]
+    for summary in summaries:
+        cells = "".join(
+            f"{summary['steps'].get(name, {}).get('p95_ms', '-'):>20}"
+            for name in KEY_STEPS
+        )
+        bad = degraded(summary, slo_ms)
+        lines.append(
+            f"{summary['users']:>6}{summary['throughput_rps']:>9}"
+            f"{summary['error_rate'] * 100:>7.1f}{cells}"
+            + (f"  degraded: {', '.join(bad)}" if bad else "")
+        )
+    return "\n".join(lines)
+
+
+async def main(args):
+    summaries = []
+    for users in args.users:
+        print(f"Stage: {users} users for {args.duration:.0f} s ...", flush=True)
+        summary = await run_stage(users, args)
+        summaries.append(summary)
+        print(format_summary(summary), end="\n\n", flush=True)
+
+    print(format_capacity(summaries, args.slo_ms))
+    if args.json:
+        report = {
+            "url": args.url,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "duration": args.duration,
+            "think": args.think,
+            "mix": args.mix,
+            "slo_ms": args.slo_ms,
+            "stages": summaries,
+        }
+        args.json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        print(f"Report written to {args.json}")
+    return 1 if any(summary["requests"] == 0 for summary in summaries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(build_parser().parse_args())))
@@ -0,0 +1,182 @@
+"""Minimal HTTP/1.1 client on asyncio streams.
+
+One ``Session`` is one browser: it keeps cookies, reuses its connection
+while the server allows keep-alive and reconnects when it does not
+(gunicorn's sync workers close every connection).
+"""
+import asyncio
+import re
+from urllib.parse import urlencode, urlsplit
+
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+# Запросы, которые можно безопасно повторить на новом соединении
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class HTTPError(Exception):
+    """The server answered with an unexpected status or page."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.kind = f"HTTP {status}" if status else "unexpected page"
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+    @property
+    def location(self):
+        return self.headers.get("location", "")
+
+
+class Session:
+    """Cookie-keeping client of one site."""
+
+    def __init__(self, base_url, timeout=30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError("Only http:// URLs are supported")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cookies = {}
+        self._reader = None
+        self._writer = None
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+
+    async def get(self, path, expect=(200,)):
+        return await self.request("GET", path, expect=expect)
+
+    async def post(self, path, data, expect=(200, 302)):
+        """POST a form, adding the CSRF token from the cookie."""
+        data = {"csrfmiddlewaretoken": self.cookies.get("csrftoken", ""), **data}
+        return await self.request("POST", path, data=data, expect=expect)
+
+    async def request(self, method, path, data=None, expect=(200,)):
+        response = await asyncio.wait_for(
+            self._request(method, path, data), self.timeout
+        )
+        if response.status not in expect:
+            raise HTTPError(f"{method} {path}: HTTP {response.status}", response.status)
+        return response
+
+    async def _request(self, method, path, data):
+        body = urlencode(data).encode() if data is not None else b""
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "User-Agent: tennis-loadtest",
+            "Accept: text/html",
+            "Connection: keep-alive",
+        ]
+        if self.cookies:
+            lines.append(
+                "Cookie: " + "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+            )
+        if data is not None:
+            # Referer нужен проверке CSRF на HTTPS, на HTTP не мешает
+            lines.append(f"Referer: {self.base_url}{path}")
+            lines.append("Content-Type: application/x-www-form-urlencoded")
+            lines.append(f"Content-Length: {len(body)}")
+        raw = ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+        # Сервер мог закрыть простаивающее соединение: одна повторная попытка.
+        # POST не повторяем - сервер мог его уже выполнить (результат матча дважды)
+        for attempt in (1, 2):
+            reused = self._writer is not None
+            if not reused:
+                self._reader, self._writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+            try:
+                self._writer.write(raw)
+                await self._writer.drain()
+                return await self._read_response(method)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if not reused or attempt == 2 or method not in IDEMPOTENT_METHODS:
+                    raise
+
+    async def _read_response(self, method):
+        status_line = await self._reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip()
+            if name == "set-cookie":
+                self._store_cookie(value)
+            headers[name] = value
+
+        if method == "HEAD" or status in (204, 304):
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked()
+        elif "content-length" in headers:
+            body = await self._reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self._reader.read()
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return Response(status, headers, body)
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                # Трейлеры не используем
+                while await self._reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self._reader.readexactly(size))
+            await self._reader.readexactly(2)
+
+    def _store_cookie(self, header):
+        pair, *attributes = header.split(";")
+        name, _, value = pair.strip().partition("=")
+        expired = any(a.strip().lower() == "max-age=0" for a in attributes)
+        if expired or value in ("", '""'):
+            self.cookies.pop(name, None)
+        else:
+            self.cookies[name] = value
+
+    async def login(self, username, password):
+        page = await self.get("/accounts/login/")
+        match = CSRF_INPUT_RE.search(page.text)
+        if match is None:
+            raise HTTPError("No CSRF token on the login page")
+        response = await self.request(
+            "POST",
+            "/accounts/login/",
+            data={
+                "csrfmiddlewaretoken": match.group(1),
+                "username": username,
+                "password": password,
+            },
+            expect=(302,),
+        )
+        if "sessionid" not in self.cookies:
+            raise HTTPError(f"Login of {username} failed")
+        return response
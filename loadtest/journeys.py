@@ -0,0 +1,191 @@
+"""Scripted user journeys.
+
+A journey is a coroutine ``journey(session, recorder, context)`` that
+walks through the site like a visitor, timing every request as a named
+step. Links are taken from the pages themselves, so the journeys work on
+any dataset made by ``generate_load_dataset``. A journey raises
+``Skip`` when the data gives it nothing to do (no open tournament on the
+page, a match of players outside the generated accounts).
+"""
+import re
+from urllib.parse import urlencode
+
+from .client import Session
+
+CATEGORIES = ["MEN", "WOMEN", "MIXED"]
+LEVELS = ["1.5-2.5", "2.5-3.5", "3.5-4.5", "4.5-5.5", "5.5-6.5"]
+TOURNAMENT_STATUSES = ["UPCOMING", "ONGOING", "FINISHED"]
+NTRP_LEVELS = ["2.5", "3.0", "3.5", "4.0", "4.5"]
+
+TOURNAMENT_RE = re.compile(r'href="/tournaments/(\d+)/"')
+REGISTER_RE = re.compile(r'href="/tournaments/(\d+)/register/"')
+MATCH_RE = re.compile(r'href="/matches/(\d+)/"')
+PROFILE_RE = re.compile(r'href="/accounts/profile/([^/"]+)/"')
+LAST_PAGE_RE = re.compile(r'href="\?page=(\d+)')
+
+
+class Skip(Exception):
+    """The journey has nothing to do on this data."""
+
+
+class Context:
+    """Settings and randomness shared by the journeys of one virtual user."""
+
+    def __init__(self, base_url, rng, prefix, accounts, password, timeout):
+        self.base_url = base_url
+        self.rng = rng
+        self.prefix = prefix
+        self.accounts = accounts
+        self.password = password
+        self.timeout = timeout
+
+    def session(self):
+        return Session(self.base_url, timeout=self.timeout)
+
+    def username(self):
+        return f"{self.prefix}_{self.rng.randrange(self.accounts):06d}"
+
+    def owns(self, username):
+        return username.startswith(f"{self.prefix}_")
+
+
+def _query(path, **params):
+    params = {key: value for key, value in params.items() if value}
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+def _last_page(html):
+    pages = [int(page) for page in LAST_PAGE_RE.findall(html)]
+    return max(pages, default=1)
+
+
+async def browse(session, recorder, context):
+    """Home page, its filters, the tournament list and one tournament."""
+    rng = context.rng
+    async with recorder.step("home"):
+        await session.get("/")
+    async with recorder.step("home_filtered"):
+        await session.get(
+            _query("/", category=rng.choice(CATEGORIES), level=rng.choice(LEVELS))
+        )
+    async with recorder.step("tournament_list_filtered"):
+        page = await session.get(
+            _query(
+                "/tournaments/",
+                status=rng.choice(TOURNAMENT_STATUSES),
+                category=rng.choice(CATEGORIES + [None]),
+            )
+        )
+    tournaments = TOURNAMENT_RE.findall(page.text)
+    if not tournaments:
+        raise Skip("no tournaments")
+    async with recorder.step("tournament_detail"):
+        await session.get(f"/tournaments/{rng.choice(tournaments)}/")
+
+
+async def register(session, recorder, context):
+    """Log in and sign up for an upcoming tournament."""
+    rng = context.rng
+    async with recorder.step("login"):
+        await session.login(context.username(), context.password)
+    async with recorder.step("tournament_list_upcoming"):
+        page = await session.get(_query("/tournaments/", status="UPCOMING"))
+    last = _last_page(page.text)
+    if last > 1:
+        async with recorder.step("tournament_list_upcoming"):
+            page = await session.get(
+                _query("/tournaments/", status="UPCOMING", page=rng.randint(1, last))
+            )
+    tournaments = TOURNAMENT_RE.findall(page.text)
+    if not tournaments:
+        raise Skip("no upcoming tournaments")
+    pk = rng.choice(tournaments)
+    async with recorder.step("tournament_detail"):
+        page = await session.get(f"/tournaments/{pk}/")
+    if not REGISTER_RE.search(page.text):
+        raise Skip("registration closed")
+    async with recorder.step("tournament_register"):
+        response = await session.get(f"/tournaments/{pk}/register/", expect=(302,))
+    async with recorder.step("tournament_detail"):
+        await session.get(response.location)
+
+
+async def result(session, recorder, context):
+    """One player submits the score of a scheduled match, the other confirms it."""
+    rng = context.rng
+    async with recorder.step("match_list_scheduled"):
+        page = await session.get(_query("/matches/", status="SCHEDULED"))
+    last = _last_page(page.text)
+    if last > 1:
+        async with recorder.step("match_list_scheduled"):
+            page = await session.get(
+                _query("/matches/", status="SCHEDULED", page=rng.randint(1, last))
+            )
+    matches = MATCH_RE.findall(page.text)
+    if not matches:
+        raise Skip("no scheduled matches")
+    pk = rng.choice(matches)
+    async with recorder.step("match_detail"):
+        page = await session.get(f"/matches/{pk}/")
+    players = list(dict.fromkeys(PROFILE_RE.findall(page.text)))[:2]
+    if len(players) < 2 or not all(context.owns(player) for player in players):
+        raise Skip("players outside the generated accounts")
+
+    # Счёт 6:4 6:3 в пользу случайного игрока
+    won, lost = (6, 6), (4, 3)
+    if rng.random() < 0.5:
+        won, lost = lost, won
+    score = {
+        "player1_set1": won[0],
+        "player1_set2": won[1],
+        "player2_set1": lost[0],
+        "player2_set2": lost[1],
+    }
+    submitter, confirmer = rng.sample(players, 2)
+
+    async with recorder.step("login"):
+        await session.login(submitter, context.password)
+    async with recorder.step("my_games"):
+        await session.get("/my-games/")
+    async with recorder.step("result_form"):
+        await session.get(f"/matches/{pk}/submit-result/")
+    async with recorder.step("result_submit"):
+        await session.post(f"/matches/{pk}/submit-result/", score, expect=(302,))
+
+    opponent = context.session()
+    try:
+        async with recorder.step("login"):
+            await opponent.login(confirmer, context.password)
+        async with recorder.step("my_games"):
+            page = await opponent.get("/my-games/")
+        if f'href="/matches/{pk}/submit-result/"' not in page.text:
+            # Матч мог подтвердить другой виртуальный пользователь
+            raise Skip("result already confirmed")
+        async with recorder.step("result_confirm"):
+            await opponent.post(f"/matches/{pk}/submit-result/", score, expect=(302,))
+    finally:
+        await opponent.close()
+
+
+async def leaderboard(session, recorder, context):
+    """The rating table, a deeper page and a filtered view."""
+    rng = context.rng
+    async with recorder.step("rating"):
+        page = await session.get("/rating/")
+    last = _last_page(page.text)
+    async with recorder.step("rating_page"):
+        await session.get(_query("/rating/", page=rng.randint(1, last)))
+    async with recorder.step("rating_filtered"):
+        await session.get(
+            _query(
+                "/rating/", gender=rng.choice(["M", "F"]), level=rng.choice(NTRP_LEVELS)
+            )
+        )
+
+
+JOURNEYS = {
+    "browse": browse,
+    "register": register,
+    "result": result,
+    "leaderboard": leaderboard,
+}
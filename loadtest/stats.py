@@ -0,0 +1,135 @@
+"""Per-step latency, throughput and error statistics of a load run."""
+import math
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class StepStats:
+    def __init__(self):
+        self.durations = []
+        self.errors = Counter()
+
+    @property
+    def count(self):
+        return len(self.durations) + sum(self.errors.values())
+
+    def summary(self, seconds):
+        errors = sum(self.errors.values())
+        summary = {
+            "requests": self.count,
+            "ok": len(self.durations),
+            "errors": errors,
+            "error_rate": round(errors / self.count, 4) if self.count else 0,
+            "throughput_rps": round(len(self.durations) / seconds, 2) if seconds else 0,
+            "error_kinds": dict(self.errors.most_common()),
+        }
+        if self.durations:
+            ms = [duration * 1000 for duration in self.durations]
+            summary.update(
+                p50_ms=round(percentile(ms, 0.50), 1),
+                p90_ms=round(percentile(ms, 0.90), 1),
+                p95_ms=round(percentile(ms, 0.95), 1),
+                p99_ms=round(percentile(ms, 0.99), 1),
+                max_ms=round(max(ms), 1),
+            )
+        return summary
+
+
+class Recorder:
+    """Collects the timings of the steps of one stage of a run."""
+
+    def __init__(self, users):
+        self.users = users
+        self.steps = defaultdict(StepStats)
+        self.journeys = Counter()
+        self.failed = Counter()
+        self.skipped = Counter()
+        self.started = time.monotonic()
+        self.finished = None
+
+    @asynccontextmanager
+    async def step(self, name):
+        """Time the block as step ``name``; an exception counts as its error."""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as error:
+            self.steps[name].errors[_error_kind(error)] += 1
+            raise
+        self.steps[name].durations.append(time.perf_counter() - started)
+
+    def fail(self, journey, error):
+        """Count a journey that ended with ``error`` (not a ``Skip``)."""
+        self.failed[f"{journey} ({_error_kind(error)})"] += 1
+
+    def stop(self):
+        self.finished = time.monotonic()
+
+    @property
+    def seconds(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def summary(self):
+        seconds = self.seconds
+        steps = {
+            name: stats.summary(seconds) for name, stats in sorted(self.steps.items())
+        }
+        requests = sum(step["requests"] for step in steps.values())
+        errors = sum(step["errors"] for step in steps.values())
+        return {
+            "users": self.users,
+            "seconds": round(seconds, 1),
+            "requests": requests,
+            "throughput_rps": round((requests - errors) / seconds, 2) if seconds else 0,
+            "error_rate": round(errors / requests, 4) if requests else 0,
+            "journeys": dict(self.journeys),
+            "failed_journeys": dict(self.failed),
+            "skipped": dict(self.skipped),
+            "steps": steps,
+        }
+
+
+def _error_kind(error):
+    return getattr(error, "kind", None) or type(error).__name__
+
+
+def format_summary(summary):
+    """Return the stage summary as a text table."""
+    lines = [
+        f"{summary['users']} users, {summary['seconds']} s: "
+        f"{summary['requests']} requests, {summary['throughput_rps']} req/s, "
+        f"errors {summary['error_rate']:.2%}",
+        f"{'step':<24}{'req':>7}{'rps':>8}{'err%':>7}"
+        f"{'p50':>8}{'p90':>8}{'p95':>8}{'p99':>8}{'max':>8}",
+    ]
+    for name, step in summary["steps"].items():
+        timings = "".join(
+            f"{step.get(key, '-'):>8}"
+            for key in ("p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")
+        )
+        lines.append(
+            f"{name:<24}{step['requests']:>7}{step['throughput_rps']:>8}"
+            f"{step['error_rate'] * 100:>7.1f}{timings}"
+        )
+        if step["error_kinds"]:
+            kinds = ", ".join(
+                f"{kind}: {count}" for kind, count in step["error_kinds"].items()
+            )
+            lines.append(f"{'':<24}  {kinds}")
+    if summary["failed_journeys"]:
+        failed = ", ".join(
+            f"{name}: {count}" for name, count in summary["failed_journeys"].items()
+        )
+        lines.append(f"failed journeys: {failed}")
+    if summary["skipped"]:
+        skipped = ", ".join(
+            f"{name}: {count}" for name, count in summary["skipped"].items()
+        )
+        lines.append(f"skipped journeys: {skipped}")
+    return "\n".join(lines)
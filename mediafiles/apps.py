@@ -0,0 +1,13 @@
+"""Media files app configuration."""
+from django.apps import AppConfig
+
+
+class MediaFilesConfig(AppConfig):
+    """Configuration for media files app."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "mediafiles"
+    verbose_name = "Медиафайлы"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,49 @@
+"""Generate responsive variants for already uploaded images."""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from mediafiles.variants import IMAGE_FIELDS, generate_variants
+
+
+class Command(BaseCommand):
+    """Backfill image variants for existing media."""
+
+    help = "Generate resized WebP/JPEG variants for existing uploaded images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate variants even if they already exist",
+        )
+
+    def handle(self, *args, **options):
+        total_images = 0
+        total_files = 0
+
+        for model_label, field_name in IMAGE_FIELDS:
+            model = apps.get_model(model_label)
+            queryset = (
+                model._default_manager.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .only("pk", field_name)
+            )
+            for instance in queryset.iterator(chunk_size=500):
+                try:
+                    written = generate_variants(
+                        getattr(instance, field_name), force=options["force"]
+                    )
+                except (OSError, ValueError) as e:
+                    self.stderr.write(f"✗ {model_label} {instance.pk}: {e}")
+                    continue
+                if written:
+                    total_images += 1
+                    total_files += written
+
+            self.stdout.write(f"✓ {model_label}.{field_name} processed")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {total_files} variants for {total_images} images"
+            )
+        )
@@ -0,0 +1,58 @@
+"""Normalization of uploaded images."""
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+def normalize_image(uploaded_file, max_dimension=None):
+    """Return a re-encoded copy of an uploaded image.
+
+    The image is rotated according to its EXIF orientation, downscaled so
+    that neither side exceeds ``max_dimension`` and saved without EXIF and
+    other metadata. JPEG sources are decoded at reduced scale, so time and
+    memory stay bounded even for very large photos.
+
+    Raises ValidationError if the file is not an image or has too many pixels.
+    """
+    max_dimension = max_dimension or settings.IMAGE_MAX_DIMENSION
+    uploaded_file.seek(0)
+
+    try:
+        image = Image.open(uploaded_file)
+    except (UnidentifiedImageError, OSError):
+        raise ValidationError("Файл не является изображением.")
+
+    # Размеры известны из заголовка до декодирования пикселей
+    if image.width * image.height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError("Слишком большое разрешение изображения.")
+
+    try:
+        image.draft("RGB", (max_dimension, max_dimension))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        raise ValidationError("Не удалось обработать изображение.")
+
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    if has_alpha:
+        image = image.convert("RGBA")
+        pil_format, extension, content_type = "PNG", "png", "image/png"
+        options = {"optimize": True}
+    else:
+        image = image.convert("RGB")
+        pil_format, extension, content_type = "JPEG", "jpg", "image/jpeg"
+        options = {"quality": 85, "optimize": True, "progressive": True}
+
+    buffer = BytesIO()
+    image.save(buffer, pil_format, **options)
+    size = buffer.tell()
+    buffer.seek(0)
+
+    stem, _ = os.path.splitext(os.path.basename(uploaded_file.name))
+    return InMemoryUploadedFile(
+        buffer, None, f"{stem}.{extension}", content_type, size, None
+    )
@@ -0,0 +1,39 @@
+"""Signal handlers for media files app."""
+from django.apps import apps
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .variants import IMAGE_FIELDS, delete_variants, file_in_use, schedule_variants
+
+
+def _connect(model, field_name):
+    # Имя файла при загрузке из БД: варианты нужны только после его смены
+    loaded_attr = f"_{field_name}_loaded_name"
+
+    def on_init(sender, instance, **kwargs):
+        if field_name in instance.__dict__:
+            value = instance.__dict__[field_name]
+            setattr(instance, loaded_attr, getattr(value, "name", value) or "")
+
+    def on_save(
+        sender, instance, created=False, raw=False, update_fields=None, **kwargs
+    ):
+        if raw or (update_fields is not None and field_name not in update_fields):
+            return
+        name = getattr(instance, field_name).name or ""
+        if created or name != getattr(instance, loaded_attr, None):
+            schedule_variants(instance, field_name)
+        setattr(instance, loaded_attr, name)
+
+    def on_delete(sender, instance, **kwargs):
+        field_file = getattr(instance, field_name)
+        # Тот же файл может быть у другой записи - её варианты не трогаем
+        if field_file and not file_in_use(field_file.name):
+            delete_variants(field_file)
+
+    post_init.connect(on_init, sender=model, weak=False)
+    post_save.connect(on_save, sender=model, weak=False)
+    post_delete.connect(on_delete, sender=model, weak=False)
+
+
+for model_label, field_name in IMAGE_FIELDS:
+    _connect(apps.get_model(model_label), field_name)
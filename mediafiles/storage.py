@@ -0,0 +1,45 @@
+"""Storage for uploaded media with content-hashed file names."""
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+
+HASH_LENGTH = 12
+# photo.3f2a9c0b1d4e.jpg, а также варианты photo.3f2a9c0b1d4e__w80-9c41d2.webp
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{%d}(__w\d+-[0-9a-f]+)?\.\w+$" % HASH_LENGTH)
+
+
+def is_hashed_name(name):
+    """Check whether a media file name carries a content hash."""
+    return bool(HASHED_NAME_RE.search(name))
+
+
+class HashedMediaStorage(FileSystemStorage):
+    """File system storage that embeds a content hash into uploaded names.
+
+    ``users/photos/ivan.jpg`` is stored as ``users/photos/ivan.<hash>.jpg``,
+    so a file never changes under its URL and can be cached "forever".
+    Names that already carry a hash (e.g. image variants) are kept as is.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not is_hashed_name(name):
+            name = self.hashed_name(name, content)
+            # Тот же файл уже загружен - содержимое совпадает, сохранять не нужно
+            if self.exists(name):
+                return name
+        return super().save(name, content, max_length)
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        if hasattr(content, "seek"):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, "seek"):
+            content.seek(0)
+        root, ext = os.path.splitext(name)
+        return f"{root}.{digest.hexdigest()[:HASH_LENGTH]}{ext}"
@@ -0,0 +1,56 @@
+"""Template tags for responsive images."""
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from mediafiles.variants import has_variants, variant_srcset, variant_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def image_variant(field_file, width, fmt="jpg"):
+    """URL of the smallest variant at least ``width`` pixels wide."""
+    if not field_file:
+        return ""
+    return variant_url(field_file, int(width), fmt)
+
+
+@register.simple_tag
+def image_srcset(field_file, fmt="jpg"):
+    """``srcset`` value with all variants of the image."""
+    if not has_variants(field_file):
+        return ""
+    return variant_srcset(field_file, fmt)
+
+
+@register.simple_tag
+def picture(field_file, width, **attrs):
+    """Render a ``<picture>`` with WebP and JPEG variants for an image.
+
+    ``width`` is the displayed width in CSS pixels; extra keyword arguments
+    become attributes of the ``<img>`` tag::
+
+        {% picture user.photo 45 class="rounded-circle" alt=user.username %}
+    """
+    if not field_file:
+        return ""
+
+    width = int(width)
+    attrs.setdefault("alt", "")
+    attrs.setdefault("loading", "lazy")
+    img_attrs = format_html_join(" ", '{}="{}"', sorted(attrs.items()))
+
+    if not has_variants(field_file):
+        return format_html('<img src="{}" {}>', field_file.url, img_attrs)
+
+    sizes = f"{width}px"
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" {}></picture>',
+        variant_srcset(field_file, "webp"),
+        sizes,
+        variant_url(field_file, width * 2),
+        variant_srcset(field_file),
+        sizes,
+        img_attrs,
+    )
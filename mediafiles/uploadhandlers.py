@@ -0,0 +1,38 @@
+"""Upload handlers with server-side size enforcement."""
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from loguru import logger
+
+
+class BoundedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Stream uploads to a temporary file and drop files above a size limit.
+
+    The file is written to disk chunk by chunk, so memory use does not depend
+    on the upload size. As soon as a file exceeds ``max_size`` (or announces a
+    larger ``Content-Length``) it is discarded and its field name is added to
+    ``request.rejected_uploads`` so the form can report the error.
+    """
+
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.max_size = max_size or settings.MAX_UPLOAD_SIZE
+        if request is not None and not hasattr(request, "rejected_uploads"):
+            request.rejected_uploads = set()
+
+    def _reject(self):
+        if self.request is not None:
+            self.request.rejected_uploads.add(self.field_name)
+        logger.warning(
+            f"Upload '{self.file_name}' rejected: larger than {self.max_size} bytes"
+        )
+        raise SkipFile()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        if self.content_length and self.content_length > self.max_size:
+            self._reject()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            self._reject()
+        return super().receive_data_chunk(raw_data, start)
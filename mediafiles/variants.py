@@ -0,0 +1,190 @@
+"""Resized WebP/JPEG variants of uploaded images.
+
+Variants are stored next to the original file::
+
+    users/photos/ivan.3f2a9c0b1d4e.jpg
+    users/photos/ivan.3f2a9c0b1d4e__w80-9c41d2.jpg
+    users/photos/ivan.3f2a9c0b1d4e__w80-9c41d2.webp
+    ...
+
+and are generated in a background thread after the upload is committed.
+The suffix after the width is a hash of the variant settings, so changed
+settings produce new URLs instead of new bytes under a cached one.
+"""
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from loguru import logger
+from PIL import Image, ImageOps
+
+from monitoring.metrics import run_job
+
+# Ширины вариантов в пикселях (аватарки 40-120px на retina, карточки, обложки)
+VARIANT_WIDTHS = (80, 160, 320, 640, 1280)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# Модели и поля, для которых создаются варианты
+IMAGE_FIELDS = [
+    ("accounts.User", "photo"),
+    ("tournaments.Tournament", "image"),
+    ("news.Article", "image"),
+]
+
+VARIANT_VERSION = hashlib.sha256(
+    repr((VARIANT_WIDTHS, VARIANT_FORMATS)).encode()
+).hexdigest()[:6]
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-variants")
+
+
+def variant_name(name, width, fmt):
+    """Return the storage name of a variant of the file ``name``."""
+    stem, _ = os.path.splitext(name)
+    return f"{stem}__w{width}-{VARIANT_VERSION}.{fmt}"
+
+
+def has_variants(field_file):
+    """Check whether variants of ``field_file`` have been generated.
+
+    The largest WebP variant is written last, so its presence means the
+    whole set is available.
+    """
+    if not field_file:
+        return False
+    marker = variant_name(field_file.name, VARIANT_WIDTHS[-1], "webp")
+    return field_file.storage.exists(marker)
+
+
+def variant_url(field_file, width, fmt="jpg"):
+    """Return the URL of a variant, or of the original if variants are missing."""
+    if not has_variants(field_file):
+        return field_file.url
+    width = min((w for w in VARIANT_WIDTHS if w >= width), default=VARIANT_WIDTHS[-1])
+    return field_file.storage.url(variant_name(field_file.name, width, fmt))
+
+
+def variant_srcset(field_file, fmt="jpg"):
+    """Return a ``srcset`` attribute value listing every variant of the file."""
+    storage = field_file.storage
+    return ", ".join(
+        f"{storage.url(variant_name(field_file.name, width, fmt))} {width}w"
+        for width in VARIANT_WIDTHS
+    )
+
+
+def _encode(image, fmt):
+    pil_format, options = VARIANT_FORMATS[fmt]
+    if pil_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, pil_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def _replace(storage, name, content):
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, content)
+
+
+def generate_variants(field_file, force=False):
+    """Create all variants of ``field_file``. Returns the number of files written."""
+    if not field_file or (not force and has_variants(field_file)):
+        return 0
+
+    storage = field_file.storage
+    with storage.open(field_file.name, "rb") as source:
+        image = Image.open(source)
+        # Для JPEG декодируем сразу в уменьшенном масштабе
+        image.draft("RGB", (VARIANT_WIDTHS[-1], VARIANT_WIDTHS[-1]))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        marker = variant_name(field_file.name, VARIANT_WIDTHS[-1], "webp")
+        marker_content = None
+        written = 0
+        # От большего к меньшему: каждый вариант уменьшается из предыдущего
+        current = image
+        for width in sorted(VARIANT_WIDTHS, reverse=True):
+            if current.width > width:
+                height = max(1, round(current.height * width / current.width))
+                current = current.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt in VARIANT_FORMATS:
+                name = variant_name(field_file.name, width, fmt)
+                content = _encode(current, fmt)
+                if name == marker:
+                    marker_content = content
+                    continue
+                _replace(storage, name, content)
+                written += 1
+
+    # Маркер полного набора записываем последним
+    _replace(storage, marker, marker_content)
+    return written + 1
+
+
+def file_in_use(name):
+    """Check whether any image field still refers to the file ``name``.
+
+    Identical uploads share one content-hashed file, so several rows can
+    point to the same name.
+    """
+    return any(
+        apps.get_model(model_label)
+        ._default_manager.filter(**{field_name: name})
+        .exists()
+        for model_label, field_name in IMAGE_FIELDS
+    )
+
+
+def delete_variants(field_file):
+    """Remove all variants of ``field_file`` from storage."""
+    if not field_file:
+        return
+    for width in VARIANT_WIDTHS:
+        for fmt in VARIANT_FORMATS:
+            field_file.storage.delete(variant_name(field_file.name, width, fmt))
+
+
+def _generate_in_background(model, pk, field_name):
+    try:
+        instance = model._default_manager.get(pk=pk)
+        generate_variants(getattr(instance, field_name))
+    except model.DoesNotExist:
+        pass
+    except Exception:
+        logger.exception(f"Failed to generate image variants for {model.__name__} {pk}")
+
+
+def schedule_variants(instance, field_name):
+    """Generate variants for ``instance.<field_name>`` off the request thread."""
+    field_file = getattr(instance, field_name)
+    if not field_file or has_variants(field_file):
+        return
+
+    model, pk = type(instance), instance.pk
+    if not getattr(settings, "IMAGE_VARIANTS_ASYNC", True):
+        transaction.on_commit(lambda: _generate_in_background(model, pk, field_name))
+        return
+    transaction.on_commit(
+        lambda: _executor.submit(
+            run_job,
+            "image_variants",
+            time.monotonic(),
+            _generate_in_background,
+            model,
+            pk,
+            field_name,
+        )
+    )
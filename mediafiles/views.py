@@ -0,0 +1,157 @@
+"""Views for serving uploaded media files."""
+import mimetypes
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+from .storage import is_hashed_name
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def _parse_range(header, size):
+    """Parse a single-range ``Range`` header.
+
+    Returns (start, end) inclusive, None to serve the whole file, or
+    False if the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # Несколько диапазонов и прочие формы не поддерживаем - отдаём файл целиком
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _file_chunks(path, start, length):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _sendfile_response(path, name):
+    mode = settings.MEDIA_SENDFILE
+    response = HttpResponse()
+    if mode == "x-accel-redirect":
+        prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/")
+        # Заголовки только ASCII: имена с кириллицей кодируем как в URL
+        response["X-Accel-Redirect"] = quote(f"{prefix}/{name}")
+    else:
+        response["X-Sendfile"] = quote(str(path))
+    # Тип содержимого определит прокси
+    del response["Content-Type"]
+    return response
+
+
+def _file_response(request, full_path, size, etag, last_modified):
+    content_type, encoding = mimetypes.guess_type(full_path.name)
+    content_type = content_type or "application/octet-stream"
+
+    range_header = request.headers.get("Range")
+    byte_range = None
+    if range_header and _if_range_matches(request, etag, last_modified):
+        byte_range = _parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+        if encoding:
+            response["Content-Encoding"] = encoding
+        return response
+
+    start, end = byte_range
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        _file_chunks(full_path, start, length),
+        status=206,
+        content_type=content_type,
+    )
+    response["Content-Length"] = str(length)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Serve a file from MEDIA_ROOT with caching headers and Range support.
+
+    Content-hashed names are cached for a year as immutable. With
+    ``MEDIA_SENDFILE`` set, the body is delegated to the reverse proxy via
+    ``X-Sendfile`` / ``X-Accel-Redirect``.
+    """
+    media_root = Path(settings.MEDIA_ROOT).resolve()
+    try:
+        full_path = Path(safe_join(media_root, path.lstrip("/"))).resolve()
+        # resolve() раскрывает ссылки: файл должен остаться внутри MEDIA_ROOT
+        relative = full_path.relative_to(media_root)
+    except (SuspiciousFileOperation, ValueError):
+        raise Http404("Файл не найден")
+    if not full_path.is_file():
+        raise Http404("Файл не найден")
+    name = relative.as_posix()
+
+    stat = full_path.stat()
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    etag = quote_etag(f"{stat.st_mtime_ns:x}-{size:x}")
+    if is_hashed_name(name):
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if settings.MEDIA_SENDFILE:
+            response = _sendfile_response(full_path, name)
+        else:
+            response = _file_response(request, full_path, size, etag, last_modified)
+        response["Accept-Ranges"] = "bytes"
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = cache_control
+    return response
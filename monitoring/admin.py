@@ -0,0 +1,64 @@
+"""Admin configuration for monitoring app."""
+from django.contrib import admin
+
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Admin interface for SlowQuery model (read-only statistics)."""
+
+    list_display = [
+        "__str__",
+        "view",
+        "calls",
+        "total_duration",
+        "average",
+        "max_duration",
+        "last_seen",
+    ]
+    list_filter = ["view", "last_seen"]
+    search_fields = ["fingerprint", "view", "location"]
+    ordering = ["-total_duration"]
+    readonly_fields = [
+        "fingerprint",
+        "example",
+        "plan",
+        "view",
+        "location",
+        "calls",
+        "total_duration",
+        "average",
+        "max_duration",
+        "first_seen",
+        "last_seen",
+    ]
+
+    fieldsets = [
+        ("Запрос", {"fields": ("fingerprint", "example")}),
+        ("План выполнения", {"fields": ("plan",)}),
+        ("Источник", {"fields": ("view", "location")}),
+        (
+            "Статистика",
+            {
+                "fields": (
+                    "calls",
+                    "total_duration",
+                    "average",
+                    "max_duration",
+                    "first_seen",
+                    "last_seen",
+                )
+            },
+        ),
+    ]
+
+    @admin.display(description="Среднее время, с")
+    def average(self, obj):
+        return round(obj.average_duration, 4)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
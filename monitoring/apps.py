@@ -0,0 +1,13 @@
+"""Monitoring app configuration."""
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    """Configuration for monitoring app."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
+    verbose_name = "Мониторинг"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,356 @@
+"""In-process metrics registry exposed in the Prometheus text format.
+
+Every process keeps its metrics in memory. With several gunicorn workers
+each one also writes a snapshot to ``METRICS_DIR/<pid>.json`` (at most
+every ``METRICS_WRITE_INTERVAL`` seconds and at exit), and ``/metrics``
+merges the snapshots of all workers: counters and histograms are summed,
+gauges are summed over the workers that are still alive. When a worker
+exits the gunicorn master folds its file into ``retired.json``. No agent
+or extra dependency is needed; Prometheus scrapes any worker.
+"""
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from loguru import logger
+
+# Сумма счётчиков завершившихся воркеров
+RETIRED_FILE = "retired.json"
+
+# Границы корзин гистограмм длительности, секунды
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Metric:
+    """Base class: values are kept per tuple of label values."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that goes up and down; summed over live workers."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labels)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # [счётчики корзин..., +Inf, сумма]
+            values = self._values.get(key)
+            if values is None:
+                values = self._values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    values[index] += 1
+                    break
+            else:
+                values[len(self.buckets)] += 1
+            values[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the run time of the ``with`` block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+
+class Registry:
+    """All metrics of the process and the multi-worker snapshot files."""
+
+    def __init__(self):
+        self.metrics = {}
+        self._last_write = 0.0
+        self._write_lock = threading.Lock()
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+
+    @property
+    def directory(self):
+        directory = getattr(settings, "METRICS_DIR", None)
+        return Path(directory) if directory else None
+
+    def snapshot(self):
+        return {
+            name: {
+                "kind": metric.kind,
+                "help": metric.documentation,
+                "labels": metric.labels,
+                "buckets": getattr(metric, "buckets", None),
+                "values": metric.snapshot(),
+            }
+            for name, metric in self.metrics.items()
+        }
+
+    def write(self):
+        """Write this process' snapshot for the other workers to read."""
+        directory = self.directory
+        if directory is None:
+            return
+        with self._write_lock:
+            self._last_write = time.monotonic()
+            snapshot = self.snapshot()
+            # Процесс без значений (например, мастер gunicorn) файл не оставляет
+            if not any(data["values"] for data in snapshot.values()):
+                return
+            try:
+                _write_snapshot(directory / f"{os.getpid()}.json", snapshot)
+            except OSError:
+                logger.exception("Failed to write metrics snapshot")
+
+    def maybe_write(self):
+        interval = getattr(settings, "METRICS_WRITE_INTERVAL", 5)
+        if time.monotonic() - self._last_write >= interval:
+            self.write()
+
+    def collect(self):
+        """Return the merged snapshot of all workers."""
+        own = self.snapshot()
+        directory = self.directory
+        if directory is None or not directory.is_dir():
+            return own
+
+        self.write()
+        merged = {}
+        for path in directory.glob("*.json"):
+            pid = int(path.stem) if path.stem.isdigit() else None
+            metrics = _read_snapshot(path)
+            if metrics is not None:
+                alive = pid is not None and _is_alive(pid)
+                _merge(merged, metrics, gauges=alive)
+        for data in merged.values():
+            data["values"] = [
+                [list(key), value] for key, value in data["values"].items()
+            ]
+        # Метрики, которые объявлены, но ещё ни разу не записаны
+        for name, data in own.items():
+            merged.setdefault(name, data)
+        return merged
+
+    def retire(self, pid):
+        """Fold the snapshot of an exited process into ``retired.json``.
+
+        Counters and histograms keep their totals, gauges are dropped and
+        the per-process file is removed, so restarted workers do not leave
+        files behind. Called by the gunicorn master (see gunicorn.conf.py).
+        """
+        directory = self.directory
+        if directory is None:
+            return
+        path = directory / f"{pid}.json"
+        metrics = _read_snapshot(path)
+        if metrics is None:
+            return
+        retired_path = directory / RETIRED_FILE
+        merged = {}
+        _merge(merged, _read_snapshot(retired_path) or {}, gauges=False)
+        _merge(merged, metrics, gauges=False)
+        for data in merged.values():
+            data["values"] = [
+                [list(key), value] for key, value in data["values"].items()
+            ]
+        try:
+            _write_snapshot(retired_path, merged)
+            path.unlink()
+        except OSError:
+            logger.exception(f"Failed to retire metrics snapshot of process {pid}")
+
+    def retire_dead(self):
+        """Retire the snapshots of all processes that are no longer running."""
+        directory = self.directory
+        if directory is None or not directory.is_dir():
+            return
+        for path in directory.glob("*.json"):
+            if path.stem.isdigit() and not _is_alive(int(path.stem)):
+                self.retire(int(path.stem))
+
+
+def _read_snapshot(path):
+    try:
+        return json.loads(path.read_text())["metrics"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_snapshot(path, metrics):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({"metrics": metrics}))
+    # Замена файла атомарна: читатель не увидит его наполовину записанным
+    os.replace(tmp_path, path)
+
+
+def _merge(merged, metrics, gauges):
+    """Add the values of a snapshot to ``merged`` (keyed by label tuples)."""
+    for name, data in metrics.items():
+        if data["kind"] == "gauge" and not gauges:
+            continue
+        target = merged.setdefault(name, {**data, "values": {}})
+        for key, value in data["values"]:
+            key = tuple(key)
+            if key in target["values"]:
+                target["values"][key] = _add(target["values"][key], value)
+            else:
+                target["values"][key] = value
+
+
+def _is_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _add(left, right):
+    if isinstance(left, list):
+        return [a + b for a, b in zip(left, right)]
+    return left + right
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf"
+        return repr(value)
+    return str(value)
+
+
+def render(metrics):
+    """Render merged metrics in the Prometheus text exposition format."""
+    lines = []
+    for name in sorted(metrics):
+        data = metrics[name]
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['kind']}")
+        for key, value in sorted(data["values"], key=lambda item: item[0]):
+            if data["kind"] != "histogram":
+                lines.append(f"{name}{_labels(data['labels'], key)} {_number(value)}")
+                continue
+            cumulative = 0
+            bounds = list(data["buckets"]) + [float("inf")]
+            for bound, count in zip(bounds, value[:-1]):
+                cumulative += count
+                le = f'le="{_number(float(bound))}"'
+                lines.append(
+                    f"{name}_bucket{_labels(data['labels'], key, le)} {cumulative}"
+                )
+            lines.append(
+                f"{name}_sum{_labels(data['labels'], key)} {_number(value[-1])}"
+            )
+            lines.append(f"{name}_count{_labels(data['labels'], key)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+atexit.register(REGISTRY.write)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by view", ["view", "method", "status"]
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by view", ["view", "method"]
+)
+DB_QUERIES = Counter("db_queries_total", "SQL queries executed by view", ["view"])
+DB_DURATION = Counter(
+    "db_query_duration_seconds_total", "Time spent in SQL queries by view", ["view"]
+)
+DB_REPEATED = Counter(
+    "db_repeated_queries_total",
+    "SQL queries that repeated an earlier query shape within a request "
+    "(recorded with QUERY_INSTRUMENTATION on)",
+    ["view"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and result", ["cache", "result"]
+)
+JOB_LAG = Histogram(
+    "background_job_lag_seconds", "Time a background job waited before it ran", ["job"]
+)
+JOB_DURATION = Histogram(
+    "background_job_duration_seconds", "Background job run time", ["job"]
+)
+ARTICLE_VIEWS_PENDING = Gauge(
+    "article_views_pending", "Article views buffered in memory, not yet in the DB"
+)
+RATING_RECOMPUTE_DURATION = Histogram(
+    "rating_recompute_duration_seconds", "Time to recompute rating positions"
+)
+
+
+def run_job(job, submitted_at, func, *args, **kwargs):
+    """Run a background job recording its queue lag and duration.
+
+    ``submitted_at`` is the ``time.monotonic()`` value when the job was queued.
+    """
+    started = time.monotonic()
+    JOB_LAG.observe(started - submitted_at, job=job)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        JOB_DURATION.observe(time.monotonic() - started, job=job)
@@ -0,0 +1,157 @@
+"""Request instrumentation middleware."""
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import reverse
+from loguru import logger
+
+from . import metrics, profiling, slowlog
+from .queries import collect_queries
+
+
+class QueryInstrumentationMiddleware:
+    """Record query count, DB time and repeated queries of every view.
+
+    Each request emits a structured loguru record (``view``, ``queries``,
+    ``db_ms``, ``duplicates``, ...) and a warning per query shape repeated
+    ``QUERY_N_PLUS_ONE_THRESHOLD`` times or more. Staff users get a
+    ``Server-Timing`` header shown by the browser dev tools. Disabled by
+    ``QUERY_INSTRUMENTATION = False``, the middleware is removed from the
+    chain at startup and costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, "QUERY_N_PLUS_ONE_THRESHOLD", 5)
+        self.server_timing = getattr(settings, "QUERY_SERVER_TIMING", True)
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with collect_queries() as queries:
+            # Внутренние middleware (метрики) используют тот же сборщик
+            request.query_stats = queries
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = queries.duration * 1000
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unresolved"
+        log = logger.bind(
+            view=view,
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            queries=queries.count,
+            duplicates=queries.duplicates,
+            db_ms=round(db_ms, 2),
+            total_ms=round(total_ms, 2),
+        )
+        log.debug(
+            f"{view}: {queries.count} queries ({queries.duplicates} repeated), "
+            f"{db_ms:.1f} ms DB of {total_ms:.1f} ms"
+        )
+        for sql, count, seconds in queries.repeated(self.threshold):
+            log.bind(fingerprint=sql, repeats=count).warning(
+                f"Possible N+1 in {view}: {count} x {seconds * 1000:.1f} ms: {sql[:300]}"
+            )
+
+        if (
+            self.server_timing
+            and getattr(request, "user", None)
+            and request.user.is_staff
+        ):
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{queries.count} queries", '
+                f"total;dur={total_ms:.1f}"
+            )
+        return response
+
+
+class MetricsMiddleware:
+    """Record latency and query metrics of every request (see metrics.py).
+
+    Repeated queries are only counted when ``QueryInstrumentationMiddleware``
+    is active; on its own this middleware just counts queries and DB time.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        queries = getattr(request, "query_stats", None)
+        if queries is None:
+            # Без инструментирования - только число и время, без fingerprint()
+            with collect_queries(fingerprints=False) as queries:
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        # Имя URL, а не путь: иначе у каждой статьи был бы свой ряд метрик
+        view = (match.view_name if match else None) or "unresolved"
+        metrics.REQUESTS.inc(
+            view=view, method=request.method, status=response.status_code
+        )
+        metrics.REQUEST_DURATION.observe(elapsed, view=view, method=request.method)
+        metrics.DB_QUERIES.inc(queries.count, view=view)
+        metrics.DB_DURATION.inc(queries.duration, view=view)
+        if queries.duplicates:
+            metrics.DB_REPEATED.inc(queries.duplicates, view=view)
+        metrics.REGISTRY.maybe_write()
+        return response
+
+
+class ProfilingMiddleware:
+    """Profile a staff request on demand (see profiling.py).
+
+    Add ``?_profile=1`` (cProfile) or ``?_profile=sample`` to the URL, or
+    send the ``X-Profile`` header with the same value. The response gets an
+    ``X-Profile`` header with the URL of the stored report. Requests of
+    other users ignore the flag.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = profiling.requested_mode(request)
+        if mode is None or not request.user.is_staff:
+            return self.get_response(request)
+
+        response, name = profiling.profile_request(request, self.get_response, mode)
+        if name is not None:
+            response["X-Profile"] = reverse("profile_detail", args=[name])
+        return response
+
+
+class SlowQueryMiddleware:
+    """Tell the slow query log which view is running (see slowlog.py)."""
+
+    def __init__(self, get_response):
+        if slowlog.threshold() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = slowlog.current_view.set("")
+        try:
+            # Журнал пишется после ответа, вне транзакций view
+            with slowlog.deferred():
+                return self.get_response(request)
+        finally:
+            slowlog.current_view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        slowlog.current_view.set(
+            (match.view_name if match else None) or view_func.__qualname__
+        )
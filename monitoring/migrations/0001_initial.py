@@ -0,0 +1,72 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "fingerprint_hash",
+                    models.CharField(
+                        max_length=40, unique=True, verbose_name="Хеш формы"
+                    ),
+                ),
+                ("fingerprint", models.TextField(verbose_name="Форма запроса")),
+                ("example", models.TextField(verbose_name="Пример запроса")),
+                ("plan", models.TextField(blank=True, verbose_name="План выполнения")),
+                (
+                    "view",
+                    models.CharField(blank=True, max_length=200, verbose_name="View"),
+                ),
+                (
+                    "location",
+                    models.CharField(
+                        blank=True, max_length=300, verbose_name="Место в коде"
+                    ),
+                ),
+                (
+                    "calls",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Медленных выполнений"
+                    ),
+                ),
+                (
+                    "total_duration",
+                    models.FloatField(default=0, verbose_name="Суммарное время, с"),
+                ),
+                (
+                    "max_duration",
+                    models.FloatField(default=0, verbose_name="Максимальное время, с"),
+                ),
+                (
+                    "first_seen",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Впервые"),
+                ),
+                (
+                    "last_seen",
+                    models.DateTimeField(auto_now=True, verbose_name="Последний раз"),
+                ),
+            ],
+            options={
+                "verbose_name": "Медленный запрос",
+                "verbose_name_plural": "Медленные запросы",
+                "ordering": ["-total_duration"],
+            },
+        ),
+    ]
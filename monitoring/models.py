@@ -0,0 +1,30 @@
+"""Models for monitoring app."""
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """Aggregated statistics of one slow query shape (see slowlog.py)."""
+
+    fingerprint_hash = models.CharField("Хеш формы", max_length=40, unique=True)
+    fingerprint = models.TextField("Форма запроса")
+    example = models.TextField("Пример запроса")
+    plan = models.TextField("План выполнения", blank=True)
+    view = models.CharField("View", max_length=200, blank=True)
+    location = models.CharField("Место в коде", max_length=300, blank=True)
+    calls = models.PositiveIntegerField("Медленных выполнений", default=0)
+    total_duration = models.FloatField("Суммарное время, с", default=0)
+    max_duration = models.FloatField("Максимальное время, с", default=0)
+    first_seen = models.DateTimeField("Впервые", auto_now_add=True)
+    last_seen = models.DateTimeField("Последний раз", auto_now=True)
+
+    class Meta:
+        verbose_name = "Медленный запрос"
+        verbose_name_plural = "Медленные запросы"
+        ordering = ["-total_duration"]
+
+    def __str__(self):
+        return self.fingerprint[:100]
+
+    @property
+    def average_duration(self):
+        return self.total_duration / self.calls if self.calls else 0
@@ -0,0 +1,261 @@
+"""On-demand profiling of single requests.
+
+A staff request with ``?_profile=1`` (or the ``X-Profile: 1`` header) runs
+under cProfile; ``?_profile=sample`` uses a sampling profiler instead,
+which records whole call stacks every few milliseconds and costs less on
+deep call chains. Every run stores two files in ``PROFILING_DIR``: the
+artifact (``.prof`` for cProfile, ``.folded`` collapsed stacks for the
+sampler) and a ``.json`` report with the request, the hottest functions
+and the SQL timeline. ``.prof`` files open in snakeviz or
+``python -m pstats``; ``.folded`` files in speedscope or flamegraph.pl.
+"""
+import cProfile
+import io
+import json
+import pstats
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from loguru import logger
+
+from .queries import collect_queries
+
+MODES = {"1": "cprofile", "cprofile": "cprofile", "sample": "sample"}
+ARTIFACT_SUFFIXES = {"cprofile": ".prof", "sample": ".folded"}
+# Имя профиля: время, view и случайный хвост - угадать чужой нельзя
+NAME_RE = re.compile(r"^[\w-]+$")
+_LIBRARY_RE = re.compile(r"(?:site-packages|lib/python\d+\.\d+)/(.+)$")
+TOP_FUNCTIONS = 40
+MAX_TIMELINE = 500
+
+# cProfile нельзя запускать в двух потоках сразу, профилируем по одному запросу
+_lock = threading.Lock()
+
+
+def requested_mode(request):
+    """Return the profiler requested by ``request``, or None."""
+    flag = request.GET.get("_profile") or request.headers.get("X-Profile")
+    return MODES.get(flag)
+
+
+def profiles_dir():
+    return Path(
+        getattr(settings, "PROFILING_DIR", Path(settings.BASE_DIR) / "profiles")
+    )
+
+
+class Sampler:
+    """Sampling profiler: collapsed call stacks of one thread."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self):
+        """Return the stacks in the collapsed format of flamegraph.pl."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def top(self, limit):
+        """Return the functions seen on top of the stack most often."""
+        own = Counter()
+        for stack, count in self.stacks.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        total = self.samples or 1
+        return [
+            {
+                "function": function,
+                "samples": count,
+                "percent": round(count * 100 / total, 1),
+            }
+            for function, count in own.most_common(limit)
+        ]
+
+
+def _short_path(filename):
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base):
+        return filename[len(base) + 1 :]
+    # Для библиотек достаточно пути от site-packages или каталога stdlib
+    match = _LIBRARY_RE.search(filename)
+    return match.group(1) if match else filename
+
+
+def _cprofile_top(profiler, limit):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{name} ({_short_path(filename)}:{line})",
+                "calls": calls,
+                "own_ms": round(own * 1000, 2),
+                "cumulative_ms": round(cumulative * 1000, 2),
+            }
+        )
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:limit]
+
+
+def profile_request(request, get_response, mode):
+    """Run ``get_response(request)`` under the profiler and store the result.
+
+    Returns (response, profile name). When another request is being
+    profiled the request runs as usual and the name is None.
+    """
+    if not _lock.acquire(blocking=False):
+        logger.warning(
+            f"Profiling of {request.path} skipped: another profile is running"
+        )
+        return get_response(request), None
+
+    try:
+        if mode == "sample":
+            profiler = Sampler(
+                threading.get_ident(),
+                getattr(settings, "PROFILING_SAMPLE_INTERVAL", 0.005),
+            )
+        else:
+            profiler = cProfile.Profile()
+
+        started = time.perf_counter()
+        with collect_queries(timeline=True) as queries:
+            if mode == "sample":
+                profiler.start()
+                try:
+                    response = get_response(request)
+                finally:
+                    profiler.stop()
+            else:
+                profiler.enable()
+                try:
+                    response = get_response(request)
+                finally:
+                    profiler.disable()
+        total = time.perf_counter() - started
+    finally:
+        _lock.release()
+
+    match = getattr(request, "resolver_match", None)
+    view = (match.view_name if match else None) or "unresolved"
+    report = {
+        "mode": mode,
+        "view": view,
+        "method": request.method,
+        "path": request.get_full_path(),
+        "user": request.user.get_username(),
+        "status": response.status_code,
+        "created_at": timezone.now().isoformat(),
+        "total_ms": round(total * 1000, 2),
+        "queries": queries.count,
+        "db_ms": round(queries.duration * 1000, 2),
+        "duplicates": queries.duplicates,
+        "timeline": [
+            {
+                "start_ms": round(start * 1000, 2),
+                "duration_ms": round(duration * 1000, 2),
+                "sql": sql,
+            }
+            for start, duration, sql in queries.timeline[:MAX_TIMELINE]
+        ],
+    }
+    if mode == "sample":
+        report["samples"] = profiler.samples
+        report["functions"] = profiler.top(TOP_FUNCTIONS)
+    else:
+        report["functions"] = _cprofile_top(profiler, TOP_FUNCTIONS)
+
+    name = _save(view, mode, profiler, report)
+    logger.info(
+        f"Profiled {request.path} ({view}): {report['total_ms']:.0f} ms, saved as {name}"
+    )
+    return response, name
+
+
+def _save(view, mode, profiler, report):
+    directory = profiles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+    slug = re.sub(r"[^\w-]", "-", view)[:40]
+    name = f"{stamp}-{slug}-{secrets.token_hex(4)}"
+    artifact = directory / f"{name}{ARTIFACT_SUFFIXES[mode]}"
+    if mode == "sample":
+        artifact.write_text(profiler.folded(), encoding="utf-8")
+    else:
+        profiler.dump_stats(artifact)
+    report["artifact"] = artifact.name
+    (directory / f"{name}.json").write_text(
+        json.dumps(report, ensure_ascii=False), encoding="utf-8"
+    )
+    _prune(directory)
+    return name
+
+
+def _prune(directory):
+    keep = getattr(settings, "PROFILING_KEEP", 50)
+    reports = sorted(directory.glob("*.json"), reverse=True)
+    for path in reports[keep:]:
+        for suffix in (".json", *ARTIFACT_SUFFIXES.values()):
+            path.with_suffix(suffix).unlink(missing_ok=True)
+
+
+def load_report(name):
+    """Return the stored report called ``name``, or None."""
+    if not NAME_RE.match(name):
+        return None
+    path = profiles_dir() / f"{name}.json"
+    try:
+        report = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    report["name"] = name
+    return report
+
+
+def recent_profiles(limit=10):
+    """Return the newest stored reports, without their timelines."""
+    directory = profiles_dir()
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in sorted(directory.glob("*.json"), reverse=True)[:limit]:
+        report = load_report(path.stem)
+        if report is not None:
+            report.pop("timeline", None)
+            report.pop("functions", None)
+            profiles.append(report)
+    return profiles
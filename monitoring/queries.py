@@ -0,0 +1,89 @@
+"""Collecting the SQL queries of one request.
+
+``QueryCollector`` is installed with ``connection.execute_wrapper()`` and
+records how many queries ran, how long they took and how often each
+query shape (fingerprint) repeated. A shape repeated many times within a
+request is the usual sign of an N+1 pattern: a query inside a loop over
+the rows of another query.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+# Литералы и списки параметров IN (...) не влияют на форму запроса
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Return ``sql`` with literals and parameter lists collapsed."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+class QueryCollector:
+    """Execute wrapper that accumulates per-request query statistics.
+
+    With ``fingerprints=False`` only the count and the total duration are
+    kept, which skips the regular expressions of ``fingerprint()``.
+    """
+
+    def __init__(self, timeline=False, fingerprints=True):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.durations = Counter()
+        # [(начало от старта сборщика, длительность, SQL)] - только по запросу
+        self.timeline = [] if timeline else None
+        self.track_fingerprints = fingerprints
+        self.started = time.perf_counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if self.track_fingerprints:
+                key = fingerprint(sql)
+                self.fingerprints[key] += 1
+                self.durations[key] += elapsed
+            if self.timeline is not None:
+                self.timeline.append((started - self.started, elapsed, sql))
+
+    def repeated(self, threshold):
+        """Return [(fingerprint, count, seconds)] repeated ``threshold``+ times."""
+        return [
+            (key, count, self.durations[key])
+            for key, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+    @property
+    def duplicates(self):
+        """Number of queries that repeated an earlier query shape."""
+        return sum(count - 1 for count in self.fingerprints.values())
+
+
+@contextmanager
+def collect_queries(timeline=False, fingerprints=True):
+    """Record queries on every database connection of this thread.
+
+    With ``timeline=True`` the collector also keeps every query with its
+    start offset and duration; ``fingerprints=False`` counts queries
+    without grouping them by shape.
+    """
+    collector = QueryCollector(timeline=timeline, fingerprints=fingerprints)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(collector))
+        yield collector
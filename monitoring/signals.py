@@ -0,0 +1,11 @@
+"""Signal handlers for monitoring app."""
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from . import slowlog
+
+
+@receiver(connection_created)
+def install_slow_query_log(sender, connection, **kwargs):
+    """Time the queries of every new database connection."""
+    slowlog.install(connection)
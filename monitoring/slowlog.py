@@ -0,0 +1,183 @@
+"""Log of slow SQL queries with their execution plans.
+
+Every database connection gets an execute wrapper (installed from
+``signals.py``) that times each query. A query slower than
+``SLOW_QUERY_THRESHOLD_MS`` is added to the ``SlowQuery`` row of its
+fingerprint together with the view and the line of project code that ran
+it. The first time a fingerprint is seen, its plan is captured with
+``EXPLAIN`` (``EXPLAIN QUERY PLAN`` on SQLite) using the same parameters.
+
+During an HTTP request the slow queries are kept in memory and written
+when ``SlowQueryMiddleware`` exits, after the view's transactions have
+ended, so a rolled back transaction does not take the log rows with it.
+"""
+import contextvars
+import hashlib
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from loguru import logger
+
+from .queries import fingerprint
+
+# Имя view текущего запроса, выставляется SlowQueryMiddleware
+current_view = contextvars.ContextVar("slow_query_view", default="")
+# Медленные запросы текущего HTTP-запроса, см. deferred()
+_pending = contextvars.ContextVar("slow_query_pending", default=None)
+# Запросы самого журнала не измеряются
+_state = threading.local()
+# Кадры этих каталогов не считаются местом вызова
+_SKIP_DIRS = ("/monitoring/", "/site-packages/", "/lib/python")
+
+
+def threshold():
+    """Return the slow query threshold in seconds, or None when disabled."""
+    value = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", None)
+    return value / 1000 if value else None
+
+
+def call_location():
+    """Return "file:line in function" of the innermost project frame."""
+    base = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename.startswith(base) and not any(
+            part in filename for part in _SKIP_DIRS
+        ):
+            return f"{filename[len(base) + 1:]}:{frame.lineno} in {frame.name}"
+    return ""
+
+
+def explain(connection, sql, params):
+    """Return the execution plan of a query as text ("" if not possible)."""
+    if sql.lstrip()[:6].upper() not in ("SELECT", "WITH"):
+        return ""
+    prefix = connection.ops.explain_query_prefix()
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                rows = cursor.fetchall()
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+    if connection.vendor == "sqlite":
+        # (id, parent, notused, detail): отступ по глубине узла дерева
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node_id] + detail)
+        return "\n".join(lines)
+    return "\n".join(str(row[0]) for row in rows)
+
+
+def record(connection, sql, params, many, duration, view, location):
+    """Add one slow execution to the statistics of its fingerprint."""
+    from .models import SlowQuery
+
+    shape = fingerprint(sql)
+    digest = hashlib.sha1(shape.encode()).hexdigest()
+    updates = {
+        "calls": F("calls") + 1,
+        "total_duration": F("total_duration") + duration,
+        "max_duration": Greatest("max_duration", duration),
+        "view": view[:200],
+        "location": location[:300],
+        "last_seen": timezone.now(),
+    }
+    # Точка сохранения: ошибка записи не ломает транзакцию самого запроса
+    with transaction.atomic(using=connection.alias):
+        manager = SlowQuery.objects.using(connection.alias)
+        if manager.filter(fingerprint_hash=digest).update(**updates):
+            return
+        plan = "" if many else explain(connection, sql, params)
+        manager.create(
+            fingerprint_hash=digest,
+            fingerprint=shape,
+            example=sql,
+            plan=plan,
+            view=view[:200],
+            location=location[:300],
+            calls=1,
+            total_duration=duration,
+            max_duration=duration,
+        )
+    logger.warning(
+        f"New slow query ({duration * 1000:.0f} ms) in {view or location}: {shape[:300]}"
+    )
+
+
+def _record_safely(connection, sql, params, many, duration, view, location):
+    _state.recording = True
+    try:
+        record(connection, sql, params, many, duration, view, location)
+    except DatabaseError:
+        # Таблицы ещё нет (до migrate) или запись не удалась - запрос важнее
+        logger.exception("Failed to record slow query")
+    finally:
+        _state.recording = False
+
+
+@contextmanager
+def deferred():
+    """Hold the slow queries of the block and record them when it exits."""
+    token = _pending.set([])
+    try:
+        yield
+    finally:
+        pending = _pending.get()
+        _pending.reset(token)
+        for entry in pending:
+            _record_safely(*entry)
+
+
+class SlowQueryWrapper:
+    """Execute wrapper timing every query of one connection."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_state, "recording", False):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+        # Порог читается при каждом вызове: его можно поменять в тестах
+        limit = threshold()
+        if limit is not None and duration >= limit:
+            entry = (
+                self.connection,
+                sql,
+                params,
+                many,
+                duration,
+                current_view.get(),
+                call_location(),
+            )
+            pending = _pending.get()
+            if pending is not None:
+                pending.append(entry)
+            else:
+                _record_safely(*entry)
+        return result
+
+
+def install(connection):
+    """Start timing the queries of ``connection``."""
+    if threshold() is None:
+        return
+    if any(
+        isinstance(wrapper, SlowQueryWrapper) for wrapper in connection.execute_wrappers
+    ):
+        return
+    # В начало списка: connection.execute_wrapper() снимает последнюю обёртку,
+    # а соединение может открыться внутри такого блока (collect_queries)
+    connection.execute_wrappers.insert(0, SlowQueryWrapper(connection))
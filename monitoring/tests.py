@@ -0,0 +1,71 @@
+"""Tests for monitoring app."""
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import path
+
+from .models import SlowQuery
+from .slowlog import SlowQueryWrapper
+
+
+def reconnect_view(request):
+    # Так выглядит первое подключение к БД внутри инструментированного запроса
+    connection_created.send(sender=type(connection), connection=connection)
+    get_user_model().objects.count()
+    return HttpResponse()
+
+
+def rollback_view(request):
+    try:
+        with transaction.atomic():
+            get_user_model().objects.count()
+            raise IntegrityError("rollback")
+    except IntegrityError:
+        pass
+    return HttpResponse()
+
+
+urlpatterns = [
+    path("reconnect/", reconnect_view, name="reconnect"),
+    path("rollback/", rollback_view, name="rollback"),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__, QUERY_INSTRUMENTATION=True)
+class SlowQueryLogTests(TestCase):
+    """Slow query log under the request instrumentation middleware."""
+
+    def setUp(self):
+        # Медленным считается любой запрос
+        override = self.settings(SLOW_QUERY_THRESHOLD_MS=0.001)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(
+            setattr, connection, "execute_wrappers", list(connection.execute_wrappers)
+        )
+
+    def logged(self, view):
+        return SlowQuery.objects.filter(
+            view=view, fingerprint__contains=get_user_model()._meta.db_table
+        ).exists()
+
+    def test_connection_opened_inside_request(self):
+        connection.execute_wrappers[:] = []
+
+        self.client.get("/reconnect/")
+
+        # Сборщик запросов снят, обёртка журнала осталась
+        wrappers = [type(wrapper) for wrapper in connection.execute_wrappers]
+        self.assertEqual(wrappers, [SlowQueryWrapper])
+        self.assertTrue(self.logged("reconnect"))
+
+        SlowQuery.objects.all().delete()
+        self.client.get("/reconnect/")
+        self.assertTrue(self.logged("reconnect"))
+
+    def test_rolled_back_transaction_keeps_log(self):
+        self.client.get("/rollback/")
+
+        self.assertTrue(self.logged("rollback"))
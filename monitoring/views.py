@@ -0,0 +1,47 @@
+"""Views for monitoring app."""
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden
+from django.shortcuts import render
+from django.utils.crypto import constant_time_compare
+
+from . import metrics, profiling
+
+
+def metrics_view(request):
+    """Expose the merged metrics of all workers for Prometheus.
+
+    Available with ``Authorization: Bearer <METRICS_TOKEN>`` and to staff
+    users. Without ``METRICS_TOKEN`` only staff users can read it.
+    """
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    # Адрес клиента за прокси ничего не говорит, поэтому доступ только по токену
+    authorized = bool(token) and constant_time_compare(authorization, f"Bearer {token}")
+    if not (authorized or request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        metrics.render(metrics.REGISTRY.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@staff_member_required
+def profile_detail(request, name):
+    """Show a stored request profile: hottest functions and SQL timeline."""
+    report = profiling.load_report(name)
+    if report is None:
+        raise Http404("Профиль не найден")
+    return render(request, "monitoring/profile_detail.html", {"profile": report})
+
+
+@staff_member_required
+def profile_download(request, name):
+    """Download the profiler artifact (``.prof`` or ``.folded``)."""
+    report = profiling.load_report(name)
+    if report is None:
+        raise Http404("Профиль не найден")
+    path = profiling.profiles_dir() / report["artifact"]
+    if not path.is_file():
+        raise Http404("Профиль не найден")
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=path.name)
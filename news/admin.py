@@ -1,6 +1,16 @@
 """Admin configuration for news app."""
 from django.contrib import admin
-from .models import Article, Comment
+from .models import Article, Comment, Tag
+from .fulltext import search_articles
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    """Admin interface for Tag model."""
+
+    list_display = ["name", "slug"]
+    search_fields = ["name"]
+    prepopulated_fields = {"slug": ("name",)}
 
 
 @admin.register(Article)
@@ -8,8 +18,9 @@ class ArticleAdmin(admin.ModelAdmin):
     """Admin interface for Article model."""
 
     list_display = ["title", "author", "published", "created_at", "views"]
-    list_filter = ["published", "created_at", "author"]
+    list_filter = ["published", "created_at", "tags", "author"]
     search_fields = ["title", "content"]
+    filter_horizontal = ["tags"]
     prepopulated_fields = {"slug": ("title",)}
     date_hierarchy = "created_at"
     ordering = ["-created_at"]
@@ -19,9 +30,16 @@ class ArticleAdmin(admin.ModelAdmin):
             "Основная информация",
             {"fields": ("title", "slug", "author", "content", "image")},
         ),
+        ("Теги", {"fields": ("tags",)}),
         ("Публикация", {"fields": ("published",)}),
     ]
 
+    def get_search_results(self, request, queryset, search_term):
+        # Полнотекстовый индекс вместо icontains по всему содержимому
+        if not search_term.strip():
+            return queryset, False
+        return search_articles(queryset, search_term), False
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
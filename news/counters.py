@@ -0,0 +1,119 @@
+"""Buffered view counter for news articles.
+
+Views are accumulated in a per-process buffer and written to the database
+periodically with one ``F()``-based ``UPDATE`` per article, instead of a
+read-modify-write on every page view.
+"""
+import atexit
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from loguru import logger
+
+from monitoring.metrics import ARTICLE_VIEWS_PENDING, JOB_DURATION, JOB_LAG
+
+VIEWED_SESSION_KEY = "viewed_articles"
+VIEWED_SESSION_LIMIT = 200
+
+_lock = threading.Lock()
+_pending = Counter()
+_last_flush = time.monotonic()
+
+
+def _flush_interval():
+    return getattr(settings, "ARTICLE_VIEWS_FLUSH_INTERVAL", 30)
+
+
+def _max_pending():
+    return getattr(settings, "ARTICLE_VIEWS_MAX_PENDING", 500)
+
+
+def _is_duplicate(request, article_id):
+    """Check (and remember) whether this session has already seen the article.
+
+    Only sessions that already exist are used, so anonymous visitors do not
+    get a new session row just for de-duplication.
+    """
+    if not getattr(settings, "ARTICLE_VIEWS_SESSION_DEDUP", False):
+        return False
+    session = getattr(request, "session", None)
+    if session is None or session.session_key is None:
+        return False
+
+    viewed = session.get(VIEWED_SESSION_KEY, [])
+    if article_id in viewed:
+        return True
+    viewed.append(article_id)
+    session[VIEWED_SESSION_KEY] = viewed[-VIEWED_SESSION_LIMIT:]
+    return False
+
+
+def record_view(request, article):
+    """Add one view of ``article`` to the buffer.
+
+    Returns True if the view was counted.
+    """
+    if _is_duplicate(request, article.pk):
+        return False
+
+    with _lock:
+        _pending[article.pk] += 1
+        pending = sum(_pending.values())
+        flush_due = (
+            time.monotonic() - _last_flush >= _flush_interval()
+            or len(_pending) >= _max_pending()
+        )
+    ARTICLE_VIEWS_PENDING.set(pending)
+
+    if flush_due:
+        flush_views()
+    return True
+
+
+def pending_views(article_id):
+    """Return the number of buffered, not yet flushed views for an article."""
+    with _lock:
+        return _pending.get(article_id, 0)
+
+
+def flush_views():
+    """Write buffered views to the database. Returns the number of views written."""
+    global _last_flush
+
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        # Просмотры ждали записи не дольше, чем с прошлого сброса
+        started = time.monotonic()
+        lag = started - _last_flush
+        _last_flush = started
+    ARTICLE_VIEWS_PENDING.set(0)
+
+    if not batch:
+        return 0
+    JOB_LAG.observe(lag, job="article_views")
+
+    from .models import Article
+
+    try:
+        with transaction.atomic():
+            for article_id, count in batch.items():
+                Article.objects.filter(pk=article_id).update(views=F("views") + count)
+    except Exception:
+        # Вернуть просмотры в буфер, чтобы не потерять их при сбое БД
+        with _lock:
+            _pending.update(batch)
+        logger.exception("Failed to flush article views")
+        return 0
+
+    JOB_DURATION.observe(time.monotonic() - started, job="article_views")
+    total = sum(batch.values())
+    logger.debug(f"Flushed {total} article views for {len(batch)} articles")
+    return total
+
+
+atexit.register(flush_views)
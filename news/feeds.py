@@ -0,0 +1,36 @@
+"""Syndication feeds for news app."""
+from django.utils.text import Truncator
+
+from tennis_league.feeds import CachedFeed
+from .models import Article
+
+
+class ArticleFeed(CachedFeed):
+    """Published articles, newest first."""
+
+    name = "articles"
+    title = "Новости - Теннисная Лига"
+    description = "Новости теннисной лиги"
+    link_name = "article_list"
+    models = [Article]
+
+    def items(self):
+        return (
+            Article.objects.filter(published=True)
+            .select_related("author")
+            .prefetch_related("tags")
+            .defer("content")
+            .order_by("-created_at")
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.plain_text).words(60)
+
+    def item_author(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_categories(self, item):
+        return [tag.name for tag in item.tags.all()]
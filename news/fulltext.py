@@ -0,0 +1,162 @@
+"""Full-text search over news articles.
+
+SQLite keeps an FTS5 table next to ``news_article`` that is maintained by
+triggers; PostgreSQL keeps a stored generated ``tsvector`` column with a
+GIN index. In both cases the database refreshes the index itself whenever
+the title or text of an article changes, so a search reads only the index
+instead of scanning every article's content.
+"""
+from django.db import connection, connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from loguru import logger
+
+from search.text import stem, words
+
+FTS_TABLE = "news_article_fts"
+MAX_QUERY_WORDS = 8
+# Вес заголовка относительно текста при ранжировании
+TITLE_WEIGHT = 5.0
+
+SQLITE_TRIGGERS = {
+    "news_article_fts_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS news_article_fts_insert
+        AFTER INSERT ON news_article BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, plain_text)
+            VALUES (new.id, new.title, new.plain_text);
+        END
+    """,
+    "news_article_fts_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS news_article_fts_delete
+        AFTER DELETE ON news_article BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, plain_text)
+            VALUES ('delete', old.id, old.title, old.plain_text);
+        END
+    """,
+    "news_article_fts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS news_article_fts_update
+        AFTER UPDATE OF title, plain_text ON news_article BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, plain_text)
+            VALUES ('delete', old.id, old.title, old.plain_text);
+            INSERT INTO {FTS_TABLE}(rowid, title, plain_text)
+            VALUES (new.id, new.title, new.plain_text);
+        END
+    """,
+}
+
+POSTGRES_SQL = [
+    """
+    ALTER TABLE news_article ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(plain_text, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS news_article_search_vector_idx
+    ON news_article USING gin (search_vector)
+    """,
+]
+
+
+def install(using=None):
+    """Create the full-text index if it is missing.
+
+    Safe to call repeatedly: it runs after every ``migrate`` because SQLite
+    drops the triggers whenever Django rebuilds the ``news_article`` table.
+    """
+    conn = connections[using] if using else connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'news_article'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if set(SQLITE_TRIGGERS) <= existing:
+                return
+            cursor.execute(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                    title, plain_text,
+                    content='news_article', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """
+            )
+            for sql in SQLITE_TRIGGERS.values():
+                cursor.execute(sql)
+            # Статьи, изменённые без триггеров, попадают в индекс здесь
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            logger.info("Article full-text index (FTS5) installed")
+        elif conn.vendor == "postgresql":
+            for sql in POSTGRES_SQL:
+                cursor.execute(sql)
+
+
+def uninstall(using=None):
+    """Drop the full-text index (used when the migration is reversed)."""
+    conn = connections[using] if using else connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        elif conn.vendor == "postgresql":
+            cursor.execute("DROP INDEX IF EXISTS news_article_search_vector_idx")
+            cursor.execute(
+                "ALTER TABLE news_article DROP COLUMN IF EXISTS search_vector"
+            )
+
+
+def query_stems(query):
+    """Return stemmed words of a user query; each is matched as a prefix."""
+    return list(dict.fromkeys(stem(word) for word in words(query)))[:MAX_QUERY_WORDS]
+
+
+def search_articles(queryset, query):
+    """Filter ``queryset`` to articles matching every word of ``query``.
+
+    Words are matched by stem prefix, so "турниры" finds "турнир" and a
+    half-typed word still matches. The result has a ``rank`` annotation
+    (higher is better) and is ordered by it.
+    """
+    stems = query_stems(query)
+    if not stems:
+        return queryset.none()
+
+    if connection.vendor == "sqlite":
+        # Стемы состоят только из букв и цифр, кавычки - защита от операторов FTS5
+        match = " ".join(f'"{term}"*' for term in stems)
+        # Соединение с FTS-таблицей: индекс читается один раз, а bm25
+        # (отрицателен и тем меньше, чем лучше совпадение) считается по ходу
+        return queryset.extra(
+            select={"rank": f"-bm25({FTS_TABLE}, %s, 1.0)"},
+            select_params=[TITLE_WEIGHT],
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = news_article.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+        ).order_by("-rank", "-created_at")
+
+    if connection.vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in stems)
+        matched = RawSQL(
+            "news_article.search_vector @@ to_tsquery('russian', %s)",
+            [tsquery],
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            "ts_rank(news_article.search_vector, to_tsquery('russian', %s))",
+            [tsquery],
+            output_field=FloatField(),
+        )
+        return (
+            queryset.filter(matched)
+            .annotate(rank=rank)
+            .order_by("-rank", "-created_at")
+        )
+
+    # Прочие СУБД: без индекса, но с тем же поведением
+    conditions = Q()
+    for term in stems:
+        conditions &= Q(title__icontains=term) | Q(plain_text__icontains=term)
+    return queryset.filter(conditions).annotate(rank=Value(0.0)).order_by("-created_at")
@@ -0,0 +1,158 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:37
+
+import html
+import re
+
+from django.db import migrations, models
+
+# Копия news.fulltext и search.text.strip_html на момент миграции:
+# миграция не должна зависеть от того, как код приложения изменится позже
+TAG_RE = re.compile(r"<[^>]+>")
+FTS_TABLE = "news_article_fts"
+
+SQLITE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, plain_text,
+        content='news_article', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS news_article_fts_insert
+    AFTER INSERT ON news_article BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, plain_text)
+        VALUES (new.id, new.title, new.plain_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS news_article_fts_delete
+    AFTER DELETE ON news_article BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, plain_text)
+        VALUES ('delete', old.id, old.title, old.plain_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS news_article_fts_update
+    AFTER UPDATE OF title, plain_text ON news_article BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, plain_text)
+        VALUES ('delete', old.id, old.title, old.plain_text);
+        INSERT INTO {FTS_TABLE}(rowid, title, plain_text)
+        VALUES (new.id, new.title, new.plain_text);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS news_article_fts_insert",
+    "DROP TRIGGER IF EXISTS news_article_fts_delete",
+    "DROP TRIGGER IF EXISTS news_article_fts_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_SQL = [
+    """
+    ALTER TABLE news_article ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(plain_text, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS news_article_search_vector_idx
+    ON news_article USING gin (search_vector)
+    """,
+]
+
+POSTGRES_REVERSE_SQL = [
+    "DROP INDEX IF EXISTS news_article_search_vector_idx",
+    "ALTER TABLE news_article DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def strip_html(text):
+    return html.unescape(TAG_RE.sub(" ", text or ""))
+
+
+def fill_plain_text(apps, schema_editor):
+    Article = apps.get_model("news", "Article")
+    articles = list(Article.objects.only("id", "content"))
+    for article in articles:
+        article.plain_text = " ".join(strip_html(article.content).split())
+    Article.objects.bulk_update(articles, ["plain_text"], batch_size=500)
+
+
+def _run(schema_editor, statements):
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql, params=None)
+
+
+def install_fulltext(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_SQL, "postgresql": POSTGRES_SQL})
+
+
+def uninstall_fulltext(apps, schema_editor):
+    _run(
+        schema_editor,
+        {"sqlite": SQLITE_REVERSE_SQL, "postgresql": POSTGRES_REVERSE_SQL},
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0002_comment"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50, unique=True, verbose_name="Название"
+                    ),
+                ),
+                (
+                    "slug",
+                    models.SlugField(
+                        allow_unicode=True,
+                        max_length=60,
+                        unique=True,
+                        verbose_name="URL",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Тег",
+                "verbose_name_plural": "Теги",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="plain_text",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Текст без разметки"
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="tags",
+            field=models.ManyToManyField(
+                blank=True, related_name="articles", to="news.tag", verbose_name="Теги"
+            ),
+        ),
+        migrations.RunPython(fill_plain_text, migrations.RunPython.noop),
+        migrations.RunPython(install_fulltext, uninstall_fulltext),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:53
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def fill_comment_counters(apps, schema_editor):
+    Article = apps.get_model("news", "Article")
+    articles = list(
+        Article.objects.annotate(
+            approved=Count("comments", filter=Q(comments__is_approved=True)),
+            pending=Count("comments", filter=Q(comments__is_approved=False)),
+            last_comment=Max("comments__updated_at"),
+        ).only("id")
+    )
+    for article in articles:
+        article.approved_comments_count = article.approved
+        article.pending_comments_count = article.pending
+        article.comments_updated_at = article.last_comment
+    Article.objects.bulk_update(
+        articles,
+        ["approved_comments_count", "pending_comments_count", "comments_updated_at"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0003_article_fulltext_tags"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="approved_comments_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Одобренных комментариев"
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="comments_updated_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Последнее изменение комментариев",
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="pending_comments_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Комментариев на модерации"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["article", "is_approved", "-id"],
+                name="comment_article_thread_idx",
+            ),
+        ),
+        migrations.RunPython(fill_comment_counters, migrations.RunPython.noop),
+    ]
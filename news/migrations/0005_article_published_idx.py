@@ -0,0 +1,22 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0004_article_comment_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("published", True)),
+                fields=["-created_at"],
+                name="article_published_idx",
+            ),
+        ),
+    ]
@@ -2,14 +2,49 @@
 from django.db import models
 from django.conf import settings
 from django.urls import reverse
+from django.utils.text import slugify
+
+from search.text import strip_html
+
+COMMENTS_PAGE_SIZE = 20
+
+
+class Tag(models.Model):
+    """Article tag."""
+
+    name = models.CharField("Название", max_length=50, unique=True)
+    slug = models.SlugField("URL", max_length=60, unique=True, allow_unicode=True)
+
+    class Meta:
+        verbose_name = "Тег"
+        verbose_name_plural = "Теги"
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.name, allow_unicode=True)
+        super().save(*args, **kwargs)
 
 
 class Article(models.Model):
     """News article model."""
 
+    # Поля, которые меняются только сигналами комментариев
+    COUNTER_FIELDS = (
+        "approved_comments_count",
+        "pending_comments_count",
+        "comments_updated_at",
+    )
+
     title = models.CharField("Заголовок", max_length=200)
     slug = models.SlugField("URL", max_length=200, unique=True)
     content = models.TextField("Содержание")
+    # Текст без HTML: из него строится полнотекстовый индекс (см. fulltext.py)
+    plain_text = models.TextField("Текст без разметки", blank=True, editable=False)
+    tags = models.ManyToManyField(Tag, related_name="articles", blank=True, verbose_name="Теги")
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -23,30 +58,80 @@ class Article(models.Model):
     created_at = models.DateTimeField("Дата создания", auto_now_add=True)
     updated_at = models.DateTimeField("Дата обновления", auto_now=True)
     views = models.IntegerField("Просмотры", default=0)
+    # Счётчики комментариев поддерживаются сигналами (news/signals.py)
+    approved_comments_count = models.PositiveIntegerField(
+        "Одобренных комментариев", default=0, editable=False
+    )
+    pending_comments_count = models.PositiveIntegerField(
+        "Комментариев на модерации", default=0, editable=False
+    )
+    comments_updated_at = models.DateTimeField(
+        "Последнее изменение комментариев", null=True, blank=True, editable=False
+    )
 
     class Meta:
         verbose_name = "Статья"
         verbose_name_plural = "Статьи"
         ordering = ["-created_at"]
+        indexes = [
+            # Лента и список новостей: последние опубликованные без сортировки
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(published=True),
+                name="article_published_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.plain_text = " ".join(strip_html(self.content).split())
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None and not self._state.adding:
+            # Полное сохранение не перезаписывает счётчики устаревшими значениями
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        elif update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "plain_text"}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         return reverse("article_detail", kwargs={"slug": self.slug})
 
     def get_approved_comments(self):
         """Get all approved comments."""
-        return self.comments.filter(is_approved=True).order_by("-created_at")
+        return self.comments.filter(is_approved=True).select_related("author").order_by("-id")
 
     def get_pending_comments(self):
         """Get all pending comments for moderation."""
-        return self.comments.filter(is_approved=False).order_by("-created_at")
+        return self.comments.filter(is_approved=False).select_related("author").order_by("-id")
+
+    def get_comments_page(self, before=None, size=None):
+        """Return (comments, next_cursor) for one page of approved comments.
+
+        Keyset pagination: newest first, ``before`` is the id of the last
+        comment already shown. ``next_cursor`` is None on the last page.
+        """
+        size = size or COMMENTS_PAGE_SIZE
+        comments = self.get_approved_comments()
+        if before:
+            comments = comments.filter(id__lt=before)
+        page = list(comments[: size + 1])
+        if len(page) > size:
+            return page[:size], page[size - 1].pk
+        return page, None
 
 
 class Comment(models.Model):
     """Comment model for articles."""
 
+    # is_approved при загрузке из БД: сигналы переносят комментарий между счётчиками
+    _loaded_is_approved = None
+
     article = models.ForeignKey(
         Article,
         on_delete=models.CASCADE,
@@ -68,6 +153,19 @@ class Comment(models.Model):
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ["created_at"]
+        indexes = [
+            # Страница комментариев статьи: WHERE article, is_approved, id < курсор
+            models.Index(
+                fields=["article", "is_approved", "-id"], name="comment_article_thread_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Комментарий от {self.author.username} на {self.article.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "is_approved" in field_names:
+            instance._loaded_is_approved = instance.is_approved
+        return instance
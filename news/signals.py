@@ -0,0 +1,67 @@
+"""Signals for news app."""
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import fulltext
+from .models import Article, Comment
+
+FULLTEXT_MIGRATION = ("news", "0003_article_fulltext_tags")
+
+
+@receiver(post_migrate)
+def restore_fulltext_index(sender, using, **kwargs):
+    """Recreate the full-text triggers after migrations rebuilt the table."""
+    if sender.name != "news":
+        return
+    applied = MigrationRecorder(connections[using]).applied_migrations()
+    if FULLTEXT_MIGRATION in applied:
+        fulltext.install(using)
+
+
+def _counter_field(is_approved):
+    return "approved_comments_count" if is_approved else "pending_comments_count"
+
+
+def _update_comment_counters(article_id, increment=None, decrement=None):
+    """Move the article's comment counters with one F()-based UPDATE."""
+    changes = {"comments_updated_at": timezone.now()}
+    if increment:
+        changes[increment] = F(increment) + 1
+    if decrement:
+        changes[decrement] = Greatest(F(decrement) - 1, Value(0))
+    Article.objects.filter(pk=article_id).update(**changes)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    """Keep approved/pending counters of the article up to date."""
+    if raw:
+        return
+    if created:
+        _update_comment_counters(
+            instance.article_id, increment=_counter_field(instance.is_approved)
+        )
+    elif (
+        instance._loaded_is_approved is not None
+        and instance._loaded_is_approved != instance.is_approved
+    ):
+        _update_comment_counters(
+            instance.article_id,
+            increment=_counter_field(instance.is_approved),
+            decrement=_counter_field(instance._loaded_is_approved),
+        )
+    else:
+        _update_comment_counters(instance.article_id)
+    instance._loaded_is_approved = instance.is_approved
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    _update_comment_counters(
+        instance.article_id, decrement=_counter_field(instance.is_approved)
+    )
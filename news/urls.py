@@ -1,16 +1,20 @@
 """URL patterns for news app."""
-from django.urls import path
+from django.urls import path, re_path
+from .feeds import ArticleFeed
 from .views import (
     ArticleListView,
     ArticleDetailView,
     AddCommentView,
     DeleteCommentView,
     ApproveCommentView,
+    article_comments,
 )
 
 urlpatterns = [
     path("", ArticleListView.as_view(), name="article_list"),
+    re_path(r"^feed/(?P<fmt>rss|atom|json)/$", ArticleFeed.as_view(), name="article_feed"),
     path("<slug:slug>/", ArticleDetailView.as_view(), name="article_detail"),
+    path("<slug:slug>/comments/", article_comments, name="article_comments"),
     path("<slug:slug>/comment/add/", AddCommentView.as_view(), name="add_comment"),
     path("comment/<int:pk>/delete/", DeleteCommentView.as_view(), name="delete_comment"),
     path("comment/<int:pk>/approve/", ApproveCommentView.as_view(), name="approve_comment"),
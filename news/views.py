@@ -3,11 +3,16 @@ from django.views.generic import ListView, DetailView, View
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.http import JsonResponse
 from django.utils.decorators import method_decorator
-from .models import Article, Comment
+from django.db.models import Count
+from tennis_league.mixins import ConditionalGetMixin
+from .models import Article, Comment, Tag
 from .forms import CommentForm
+from .counters import pending_views, record_view
+from .fulltext import search_articles
 
 
 class ArticleListView(ListView):
@@ -19,10 +24,36 @@ class ArticleListView(ListView):
     paginate_by = 10
 
     def get_queryset(self):
-        return Article.objects.filter(published=True).select_related("author")
+        queryset = (
+            Article.objects.filter(published=True)
+            .select_related("author")
+            .prefetch_related("tags")
+        )
+        self.active_tag = None
+        tag_slug = self.request.GET.get("tag", "").strip()
+        if tag_slug:
+            self.active_tag = Tag.objects.filter(slug=tag_slug).first()
+            queryset = queryset.filter(tags=self.active_tag) if self.active_tag else queryset.none()
+
+        self.query = self.request.GET.get("q", "").strip()
+        if self.query:
+            # Ранжирование по релевантности вместо сортировки по дате
+            queryset = search_articles(queryset, self.query)
+        return queryset
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.query
+        context["active_tag"] = self.active_tag
+        context["tags"] = (
+            Tag.objects.filter(articles__published=True)
+            .annotate(articles_count=Count("articles"))
+            .order_by("-articles_count", "name")[:20]
+        )
+        return context
 
-class ArticleDetailView(DetailView):
+
+class ArticleDetailView(ConditionalGetMixin, DetailView):
     """View for article details."""
 
     model = Article
@@ -30,21 +61,52 @@ class ArticleDetailView(DetailView):
     context_object_name = "article"
 
     def get_queryset(self):
-        return Article.objects.filter(published=True).select_related("author")
+        return (
+            Article.objects.filter(published=True)
+            .select_related("author")
+            .prefetch_related("tags")
+        )
 
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        obj.views += 1
-        obj.save(update_fields=["views"])
+        record_view(self.request, obj)
+        # Показываем просмотры с учётом ещё не записанных в БД
+        obj.views += pending_views(obj.pk)
         return obj
 
+    def get_conditional_timestamps(self):
+        # Счётчики и время изменения комментариев хранятся в самой статье
+        return [self.object.updated_at, self.object.comments_updated_at]
+
+    def get_conditional_extra(self):
+        return [self.object.approved_comments_count, self.object.pending_comments_count]
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["comments"] = self.object.get_approved_comments()
+        context["comments"], context["next_cursor"] = self.object.get_comments_page()
         context["form"] = CommentForm()
         return context
 
 
+def article_comments(request, slug):
+    """Return the next page of approved comments as a rendered fragment.
+
+    ``before`` is the cursor from the previous page (id of its last
+    comment); the response contains ``html`` and the ``next`` cursor.
+    """
+    article = get_object_or_404(Article.objects.only("id", "slug"), slug=slug, published=True)
+    try:
+        before = int(request.GET["before"]) if request.GET.get("before") else None
+    except ValueError:
+        return JsonResponse({"error": "invalid cursor"}, status=400)
+
+    comments, next_cursor = article.get_comments_page(before=before)
+    html = render_to_string(
+        "news/comment_items.html", {"comments": comments}, request=request
+    )
+    return JsonResponse({"html": html, "next": next_cursor})
+
+
 @method_decorator(login_required, name="dispatch")
 class AddCommentView(View):
     """View for adding comments to articles."""
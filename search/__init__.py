@@ -0,0 +1 @@
+"""Site-wide search over tournaments, players, courts and articles."""
@@ -0,0 +1,13 @@
+"""Search app configuration."""
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    """Configuration for search app."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "search"
+    verbose_name = "Поиск"
+
+    def ready(self):
+        from . import signals  # noqa: F401
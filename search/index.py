@@ -0,0 +1,186 @@
+"""Building and querying the inverted index."""
+import operator
+import time
+from collections import Counter
+from functools import reduce
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from loguru import logger
+
+from .models import SearchDocument, SearchPosting
+from .registry import SOURCES, SOURCES_BY_KIND, source_for_model
+from .text import terms
+
+MAX_TERM_WEIGHT = 100
+MAX_QUERY_TERMS = 6
+# Сколько документов самого редкого термина запроса ранжируется
+MAX_CANDIDATES = 5000
+# Запросы медленнее этого порога пишутся в лог
+SLOW_SEARCH_MS = 50
+
+
+def document_terms(source, instance):
+    """Return {term: weight} for an object of ``source``."""
+    weights = Counter()
+    for getter, weight in source.fields:
+        for term in terms(getter(instance)):
+            weights[term] += weight
+    return {term: min(weight, MAX_TERM_WEIGHT) for term, weight in weights.items()}
+
+
+def _document_fields(source, instance):
+    return {
+        "title": str(source.title(instance) or "")[:255],
+        "subtitle": str(source.subtitle(instance) or "")[:255],
+        "url": source.url(instance)[:300],
+    }
+
+
+def index_object(instance, source=None):
+    """Add, update or remove one object in the index."""
+    source = source or source_for_model(type(instance))
+    if source is None:
+        return
+    if not source.is_searchable(instance):
+        remove_object(source, instance.pk)
+        return
+
+    with transaction.atomic():
+        document, _ = SearchDocument.objects.update_or_create(
+            kind=source.kind,
+            object_id=instance.pk,
+            defaults=_document_fields(source, instance),
+        )
+        document.postings.all().delete()
+        SearchPosting.objects.bulk_create(
+            SearchPosting(term=term, document=document, weight=weight)
+            for term, weight in document_terms(source, instance).items()
+        )
+
+
+def remove_object(source, object_id):
+    """Remove one object from the index."""
+    SearchDocument.objects.filter(kind=source.kind, object_id=object_id).delete()
+
+
+def rebuild(kinds=None, batch_size=500):
+    """Rebuild the index for the given kinds (all by default).
+
+    Returns {kind: number of indexed documents}.
+    """
+    counts = {}
+    for source in SOURCES:
+        if kinds and source.kind not in kinds:
+            continue
+        with transaction.atomic():
+            # Сначала вхождения одним DELETE, иначе каскад читал бы их в память
+            SearchPosting.objects.filter(document__kind=source.kind).delete()
+            SearchDocument.objects.filter(kind=source.kind).delete()
+
+            total = 0
+            batch = []
+            for instance in source.queryset().iterator(chunk_size=batch_size):
+                batch.append(instance)
+                if len(batch) >= batch_size:
+                    total += _index_batch(source, batch)
+                    batch = []
+            if batch:
+                total += _index_batch(source, batch)
+        counts[source.kind] = total
+    return counts
+
+
+def _index_batch(source, instances):
+    documents = SearchDocument.objects.bulk_create(
+        SearchDocument(
+            kind=source.kind,
+            object_id=instance.pk,
+            **_document_fields(source, instance),
+        )
+        for instance in instances
+    )
+    SearchPosting.objects.bulk_create(
+        (
+            SearchPosting(term=term, document=document, weight=weight)
+            for document, instance in zip(documents, instances)
+            for term, weight in document_terms(source, instance).items()
+        ),
+        batch_size=2000,
+    )
+    return len(documents)
+
+
+def _rarest(conditions):
+    """Return the condition with the fewest postings (counted up to a cap)."""
+    return min(
+        conditions,
+        key=lambda condition: SearchPosting.objects.filter(condition)[
+            : MAX_CANDIDATES + 1
+        ].count(),
+    )
+
+
+def search(query, kinds=None, limit=20):
+    """Return SearchDocument objects matching every word of ``query``.
+
+    The last word is matched as a prefix so results appear while typing.
+    Documents are ranked by the summed weight of matched terms; each one
+    gets a ``score`` attribute.
+
+    Only documents containing the rarest query term are ranked, at most
+    ``MAX_CANDIDATES`` of them (the newest for a whole word), so the cost
+    of a query does not grow with the size of the index even for very
+    common words.
+    """
+    started = time.perf_counter()
+    query_terms = list(dict.fromkeys(terms(query)))[:MAX_QUERY_TERMS]
+    if not query_terms:
+        return []
+
+    *exact, prefix = query_terms
+    conditions = [Q(term=term) for term in exact]
+    # Диапазон вместо LIKE: так префикс читается из индекса в любой СУБД
+    prefix_condition = Q(term__gte=prefix, term__lt=prefix + "\uffff")
+    conditions.append(prefix_condition)
+
+    rarest = _rarest(conditions)
+    candidates = SearchPosting.objects.filter(rarest)
+    if kinds:
+        candidates = candidates.filter(document__kind__in=kinds)
+    if rarest is not prefix_condition:
+        # Для одного термина индекс уже упорядочен по документу - сортировки нет,
+        # а диапазон префикса пришлось бы сортировать целиком
+        candidates = candidates.order_by("-document")
+    else:
+        candidates = candidates.order_by()
+    candidates = candidates.values("document")[:MAX_CANDIDATES]
+
+    postings = SearchPosting.objects.filter(
+        reduce(operator.or_, conditions), document__in=candidates
+    )
+    matched = {
+        f"matched_{index}": Count("id", filter=condition)
+        for index, condition in enumerate(conditions)
+    }
+    ranked = list(
+        postings.values("document")
+        .annotate(score=Sum("weight"), **matched)
+        .filter(**{f"{name}__gt": 0 for name in matched})
+        .order_by("-score", "-document")
+        .values_list("document", "score")[:limit]
+    )
+
+    documents = SearchDocument.objects.in_bulk([pk for pk, _ in ranked])
+    results = []
+    for pk, score in ranked:
+        document = documents.get(pk)
+        if document is not None:
+            document.score = score
+            document.label = SOURCES_BY_KIND[document.kind].label
+            results.append(document)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms > SLOW_SEARCH_MS:
+        logger.warning(f"Slow search {query!r}: {elapsed_ms:.0f} ms")
+    return results
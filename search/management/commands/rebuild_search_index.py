@@ -0,0 +1,38 @@
+"""Rebuild the site search index."""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.index import rebuild
+from search.registry import SOURCES_BY_KIND
+
+
+class Command(BaseCommand):
+    """Reindex tournaments, players, courts and articles."""
+
+    help = "Rebuild the site-wide search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "kinds",
+            nargs="*",
+            help=f"Kinds to rebuild: {', '.join(SOURCES_BY_KIND)} (all by default)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Objects indexed per batch"
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["kinds"]) - set(SOURCES_BY_KIND)
+        if unknown:
+            raise CommandError(f"Unknown kinds: {', '.join(sorted(unknown))}")
+
+        started = time.perf_counter()
+        counts = rebuild(options["kinds"] or None, batch_size=options["batch_size"])
+        for kind, total in counts.items():
+            self.stdout.write(f"✓ {kind}: {total} documents")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Search index rebuilt in {time.perf_counter() - started:.1f} s"
+            )
+        )
@@ -0,0 +1,96 @@
+# Generated by Django 5.0.14 on 2026-10-19 07:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kind", models.CharField(max_length=20, verbose_name="Тип")),
+                ("object_id", models.BigIntegerField(verbose_name="ID объекта")),
+                ("title", models.CharField(max_length=255, verbose_name="Заголовок")),
+                (
+                    "subtitle",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="Подзаголовок"
+                    ),
+                ),
+                ("url", models.CharField(max_length=300, verbose_name="Ссылка")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Дата индексации"),
+                ),
+            ],
+            options={
+                "verbose_name": "Документ поиска",
+                "verbose_name_plural": "Документы поиска",
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchPosting",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=40, verbose_name="Термин")),
+                (
+                    "weight",
+                    models.PositiveSmallIntegerField(default=1, verbose_name="Вес"),
+                ),
+            ],
+            options={
+                "verbose_name": "Вхождение термина",
+                "verbose_name_plural": "Вхождения терминов",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="searchdocument",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id"), name="searchdocument_object_unique"
+            ),
+        ),
+        migrations.AddField(
+            model_name="searchposting",
+            name="document",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="postings",
+                to="search.searchdocument",
+                verbose_name="Документ",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="searchposting",
+            index=models.Index(
+                fields=["term", "document", "weight"], name="searchposting_term_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="searchposting",
+            constraint=models.UniqueConstraint(
+                fields=("document", "term"), name="searchposting_document_term_unique"
+            ),
+        ),
+    ]
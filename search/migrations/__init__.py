@@ -0,0 +1 @@
+# Generated migrations directory
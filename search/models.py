@@ -0,0 +1,56 @@
+"""Models for search app."""
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """One indexed object together with what the results page shows."""
+
+    kind = models.CharField("Тип", max_length=20)
+    object_id = models.BigIntegerField("ID объекта")
+    title = models.CharField("Заголовок", max_length=255)
+    subtitle = models.CharField("Подзаголовок", max_length=255, blank=True)
+    url = models.CharField("Ссылка", max_length=300)
+    updated_at = models.DateTimeField("Дата индексации", auto_now=True)
+
+    class Meta:
+        verbose_name = "Документ поиска"
+        verbose_name_plural = "Документы поиска"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="searchdocument_object_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+
+class SearchPosting(models.Model):
+    """Entry of the inverted index: a term occurring in a document."""
+
+    term = models.CharField("Термин", max_length=40)
+    document = models.ForeignKey(
+        SearchDocument,
+        on_delete=models.CASCADE,
+        related_name="postings",
+        verbose_name="Документ",
+    )
+    weight = models.PositiveSmallIntegerField("Вес", default=1)
+
+    class Meta:
+        verbose_name = "Вхождение термина"
+        verbose_name_plural = "Вхождения терминов"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["document", "term"], name="searchposting_document_term_unique"
+            ),
+        ]
+        indexes = [
+            # Покрывающий индекс: поиск читает только его, не обращаясь к таблице
+            models.Index(
+                fields=["term", "document", "weight"], name="searchposting_term_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.term} -> {self.document_id}"
@@ -0,0 +1,103 @@
+"""Models that are indexed by the site search.
+
+Each ``SearchSource`` says which rows are searchable, which fields are
+indexed with which weight, and how a row is shown in the results.
+"""
+from django.apps import apps
+from django.urls import reverse
+
+
+class SearchSource:
+    """Description of one indexed model."""
+
+    def __init__(self, kind, label, model, fields, title, subtitle, url, filters=None):
+        self.kind = kind
+        self.label = label
+        self.model_label = model
+        # [(функция, вес), ...] - тексты, из которых строятся термины
+        self.fields = fields
+        self.title = title
+        self.subtitle = subtitle
+        self.url = url
+        self.filters = filters or {}
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def queryset(self):
+        return self.model._default_manager.filter(**self.filters)
+
+    def is_searchable(self, instance):
+        return all(
+            getattr(instance, field) == value for field, value in self.filters.items()
+        )
+
+
+SOURCES = [
+    SearchSource(
+        kind="tournament",
+        label="Турниры",
+        model="tournaments.Tournament",
+        fields=[
+            (lambda t: t.name, 3),
+            (lambda t: t.location, 2),
+            (lambda t: t.get_category_display(), 1),
+            (lambda t: t.description, 1),
+        ],
+        title=lambda t: t.name,
+        subtitle=lambda t: f"{t.start_date:%d.%m.%Y} · {t.get_status_display()}",
+        url=lambda t: reverse("tournament_detail", args=[t.pk]),
+    ),
+    SearchSource(
+        kind="player",
+        label="Игроки",
+        model="accounts.User",
+        fields=[
+            (lambda u: f"{u.first_name} {u.last_name} {u.username}", 3),
+            (lambda u: u.city, 1),
+        ],
+        title=lambda u: u.get_full_name() or u.username,
+        subtitle=lambda u: u.city,
+        url=lambda u: reverse("profile", args=[u.username]),
+        filters={"is_active": True},
+    ),
+    SearchSource(
+        kind="court",
+        label="Корты",
+        model="tournaments.CourtLocation",
+        fields=[
+            (lambda c: c.name, 3),
+            (lambda c: f"{c.address} {c.city}", 2),
+            (lambda c: c.facilities, 1),
+        ],
+        title=lambda c: c.name,
+        subtitle=lambda c: f"{c.address}, {c.city}",
+        url=lambda c: reverse("court_detail", args=[c.pk]),
+        filters={"is_active": True},
+    ),
+    SearchSource(
+        kind="article",
+        label="Новости",
+        model="news.Article",
+        fields=[
+            (lambda a: a.title, 3),
+            (lambda a: a.plain_text, 1),
+        ],
+        title=lambda a: a.title,
+        subtitle=lambda a: f"{a.created_at:%d.%m.%Y}",
+        url=lambda a: a.get_absolute_url(),
+        filters={"published": True},
+    ),
+]
+
+SOURCES_BY_KIND = {source.kind: source for source in SOURCES}
+
+
+def source_for_model(model):
+    """Return the SearchSource of a model class, or None."""
+    label = model._meta.label
+    for source in SOURCES:
+        if source.model_label == label:
+            return source
+    return None
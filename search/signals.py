@@ -0,0 +1,37 @@
+"""Keep the search index in sync with indexed models."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from loguru import logger
+
+from .index import index_object, remove_object
+from .registry import SOURCES
+
+# Сохранения, которые не меняют индексируемые поля (вход пользователя)
+IGNORED_UPDATE_FIELDS = {"last_login", "updated_at", "views"}
+
+
+def _index_on_commit(source, instance):
+    def index():
+        try:
+            index_object(instance, source)
+        except Exception:
+            logger.exception(f"Failed to index {source.kind} {instance.pk}")
+
+    transaction.on_commit(index)
+
+
+def _connect(source):
+    def saved(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw or (update_fields and set(update_fields) <= IGNORED_UPDATE_FIELDS):
+            return
+        _index_on_commit(source, instance)
+
+    def deleted(sender, instance, **kwargs):
+        remove_object(source, instance.pk)
+
+    post_save.connect(saved, sender=source.model, weak=False)
+    post_delete.connect(deleted, sender=source.model, weak=False)
+
+
+for _source in SOURCES:
+    _connect(_source)
@@ -0,0 +1,131 @@
+"""Text normalization for the search index.
+
+Words are lowercased, ``ё`` is folded into ``е`` and common Russian
+inflectional endings are cut off, so "турниры", "турнира" and "турнир"
+(or "Петрова" and "Петров") produce the same term.
+"""
+import html
+import re
+
+WORD_RE = re.compile(r"[0-9a-zа-я]+")
+TAG_RE = re.compile(r"<[^>]+>")
+
+MIN_STEM_LENGTH = 3
+MAX_TERM_LENGTH = 40
+
+# Окончания от длинных к коротким: отрезается первое подходящее
+ENDINGS = sorted(
+    [
+        "иями",
+        "ями",
+        "ами",
+        "ией",
+        "ием",
+        "иям",
+        "иях",
+        "ого",
+        "его",
+        "ому",
+        "ему",
+        "ыми",
+        "ими",
+        "ова",
+        "ева",
+        "ина",
+        "ость",
+        "ости",
+        "ов",
+        "ев",
+        "ей",
+        "ий",
+        "ый",
+        "ой",
+        "ая",
+        "яя",
+        "ое",
+        "ее",
+        "ые",
+        "ие",
+        "ую",
+        "юю",
+        "ам",
+        "ям",
+        "ах",
+        "ях",
+        "ом",
+        "ем",
+        "ию",
+        "ия",
+        "ии",
+        "ых",
+        "их",
+        "а",
+        "я",
+        "о",
+        "е",
+        "ы",
+        "и",
+        "у",
+        "ю",
+        "ь",
+        "й",
+    ],
+    key=len,
+    reverse=True,
+)
+
+# Слова, которые встречаются почти везде и только раздувают индекс
+STOP_WORDS = {
+    "и",
+    "в",
+    "во",
+    "на",
+    "с",
+    "со",
+    "по",
+    "к",
+    "ко",
+    "о",
+    "об",
+    "от",
+    "до",
+    "для",
+    "из",
+    "за",
+    "не",
+    "но",
+    "а",
+    "или",
+    "что",
+    "это",
+    "как",
+    "the",
+    "and",
+    "of",
+}
+
+
+def strip_html(text):
+    """Remove tags and entities from HTML content."""
+    return html.unescape(TAG_RE.sub(" ", text or ""))
+
+
+def stem(word):
+    """Cut one inflectional ending off a Russian word."""
+    if not ("а" <= word[0] <= "я"):
+        return word
+    for ending in ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[: -len(ending)]
+    return word
+
+
+def words(text):
+    """Return the normalized words of ``text`` without stemming."""
+    text = (text or "").lower().replace("ё", "е")
+    return [word for word in WORD_RE.findall(text) if word not in STOP_WORDS]
+
+
+def terms(text):
+    """Return the index terms of ``text`` in order of appearance."""
+    return [stem(word)[:MAX_TERM_LENGTH] for word in words(text)]
@@ -0,0 +1,8 @@
+"""URL patterns for search app."""
+from django.urls import path
+
+from .views import search_view
+
+urlpatterns = [
+    path("", search_view, name="search"),
+]
@@ -0,0 +1,48 @@
+"""Views for search app."""
+from django.http import JsonResponse
+from django.shortcuts import render
+
+from .index import search
+from .registry import SOURCES, SOURCES_BY_KIND
+
+MAX_LIMIT = 50
+
+
+def search_view(request):
+    """Site-wide search page; ``?format=json`` returns the results as JSON."""
+    query = request.GET.get("q", "").strip()[:200]
+    kinds = [kind for kind in request.GET.getlist("kind") if kind in SOURCES_BY_KIND]
+    try:
+        limit = min(int(request.GET.get("limit", 20)), MAX_LIMIT)
+    except ValueError:
+        limit = 20
+
+    results = search(query, kinds=kinds, limit=limit) if query else []
+
+    if request.GET.get("format") == "json":
+        return JsonResponse(
+            {
+                "query": query,
+                "results": [
+                    {
+                        "kind": document.kind,
+                        "title": document.title,
+                        "subtitle": document.subtitle,
+                        "url": document.url,
+                        "score": document.score,
+                    }
+                    for document in results
+                ],
+            }
+        )
+
+    return render(
+        request,
+        "search/results.html",
+        {
+            "query": query,
+            "results": results,
+            "kinds": kinds,
+            "sources": SOURCES,
+        },
+    )
@@ -0,0 +1,234 @@
+"""Syndication feeds (RSS, Atom, JSON Feed) rendered once per content change.
+
+Every feed has a version computed from its models in the database with
+one aggregate query per model. A feed is rendered and gzipped once per
+version and host and kept in the cache, so a polling client costs that
+query and a cache lookup: ``304`` when its ETag is current, otherwise the
+stored bytes.
+"""
+import gzip
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils import feedgenerator
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views import View
+from loguru import logger
+
+from monitoring.metrics import CACHE_REQUESTS
+
+FORMATS = {
+    "rss": "application/rss+xml; charset=utf-8",
+    "atom": "application/atom+xml; charset=utf-8",
+    "json": "application/feed+json; charset=utf-8",
+}
+GENERATORS = {
+    "rss": feedgenerator.Rss201rev2Feed,
+    "atom": feedgenerator.Atom1Feed,
+}
+JSON_FEED_VERSION = "https://jsonfeed.org/version/1.1"
+
+
+def _timeout():
+    return getattr(settings, "FEEDS_CACHE_TIMEOUT", 15 * 60)
+
+
+def accepts_gzip(accept_encoding):
+    """Check whether an ``Accept-Encoding`` value allows a gzip response."""
+    qvalues = {}
+    for part in accept_encoding.split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        if not coding:
+            continue
+        qvalue = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        qvalues[coding.lower()] = qvalue
+    # "gzip;q=0" запрещает gzip, даже если "*" разрешает остальное
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+
+class CachedFeed(View):
+    """Base view of a feed; subclasses describe the items.
+
+    URL patterns pass ``fmt`` ("rss", "atom" or "json"). Saving or
+    deleting a row of any of ``models`` changes ``version()``, so the feed
+    is rendered anew on the next request.
+    """
+
+    name = None
+    title = ""
+    description = ""
+    # Имя URL HTML-страницы с тем же содержимым
+    link_name = None
+    models = ()
+    limit = 50
+
+    def items(self):
+        raise NotImplementedError
+
+    def item_title(self, item):
+        return str(item)
+
+    def item_description(self, item):
+        return ""
+
+    def item_link(self, item):
+        return item.get_absolute_url()
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return getattr(item, "updated_at", None)
+
+    def item_author(self, item):
+        return None
+
+    def item_categories(self, item):
+        return []
+
+    @classmethod
+    def version(cls):
+        """Return the current content version of the feed.
+
+        It is derived from the database - the newest ``updated_at`` and the
+        row count of every model in ``models`` - so all processes agree on
+        it and a deleted row changes it too.
+        """
+        state = []
+        for model in cls.models:
+            row = model._default_manager.aggregate(
+                last=Max("updated_at"), total=Count("pk")
+            )
+            last = row["last"].isoformat() if row["last"] else ""
+            state.append(f"{model._meta.label}:{row['total']}:{last}")
+        return hashlib.md5("|".join(state).encode()).hexdigest()[:16]
+
+    def get(self, request, fmt):
+        if fmt not in FORMATS:
+            raise Http404("Unknown feed format")
+
+        version = self.version()
+        compress = accepts_gzip(request.headers.get("Accept-Encoding", ""))
+        # Сжатое и несжатое представления - разные байты, у них разные ETag
+        coding = "-gz" if compress else ""
+        etag = quote_etag(f"{self.name}-{fmt}-{version}{coding}")
+        response = get_conditional_response(request, etag=etag)
+        CACHE_REQUESTS.inc(
+            cache="feeds_etag", result="miss" if response is None else "hit"
+        )
+        if response is None:
+            entry = self._get_entry(request, fmt, version)
+            if compress:
+                response = HttpResponse(entry["body"], content_type=FORMATS[fmt])
+                response["Content-Encoding"] = "gzip"
+            else:
+                response = HttpResponse(
+                    gzip.decompress(entry["body"]), content_type=FORMATS[fmt]
+                )
+            response["Last-Modified"] = http_date(entry["generated_at"])
+
+        response["ETag"] = etag
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+    def _get_entry(self, request, fmt, version):
+        # Абсолютные ссылки в теле зависят от хоста запроса
+        key = f"feeds:{self.name}:{fmt}:{request.get_host()}:{version}"
+        entry = cache.get(key)
+        CACHE_REQUESTS.inc(cache="feeds", result="miss" if entry is None else "hit")
+        if entry is None:
+            started = time.perf_counter()
+            body = self.render(request, fmt)
+            entry = {
+                "body": gzip.compress(body, mtime=0),
+                "generated_at": int(time.time()),
+            }
+            cache.set(key, entry, _timeout())
+            logger.info(
+                f"Feed {self.name}.{fmt} rendered: {len(body)} bytes, "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+        return entry
+
+    def render(self, request, fmt):
+        """Return the feed document as bytes."""
+        home_url = request.build_absolute_uri(reverse(self.link_name))
+        feed_url = request.build_absolute_uri(request.path)
+        entries = [
+            {
+                "title": self.item_title(item),
+                "link": request.build_absolute_uri(self.item_link(item)),
+                "description": self.item_description(item),
+                "pubdate": self.item_pubdate(item),
+                "updateddate": self.item_updateddate(item),
+                "author": self.item_author(item),
+                "categories": self.item_categories(item),
+            }
+            for item in self.items()[: self.limit]
+        ]
+
+        if fmt == "json":
+            return self._render_json(home_url, feed_url, entries)
+
+        feed = GENERATORS[fmt](
+            title=self.title,
+            link=home_url,
+            description=self.description,
+            feed_url=feed_url,
+            language="ru",
+        )
+        for entry in entries:
+            feed.add_item(
+                title=entry["title"],
+                link=entry["link"],
+                description=entry["description"],
+                unique_id=entry["link"],
+                pubdate=entry["pubdate"],
+                updateddate=entry["updateddate"],
+                author_name=entry["author"],
+                categories=entry["categories"],
+            )
+        return feed.writeString("utf-8").encode()
+
+    def _render_json(self, home_url, feed_url, entries):
+        items = []
+        for entry in entries:
+            item = {
+                "id": entry["link"],
+                "url": entry["link"],
+                "title": entry["title"],
+                "content_text": entry["description"],
+                "date_published": entry["pubdate"].isoformat(),
+            }
+            if entry["updateddate"]:
+                item["date_modified"] = entry["updateddate"].isoformat()
+            if entry["author"]:
+                item["authors"] = [{"name": entry["author"]}]
+            if entry["categories"]:
+                item["tags"] = entry["categories"]
+            items.append(item)
+
+        document = {
+            "version": JSON_FEED_VERSION,
+            "title": self.title,
+            "home_page_url": home_url,
+            "feed_url": feed_url,
+            "description": self.description,
+            "language": "ru",
+            "items": items,
+        }
+        return json.dumps(document, ensure_ascii=False).encode()
@@ -0,0 +1,107 @@
+"""Reusable view mixins shared by the project apps."""
+import hashlib
+import threading
+from collections import Counter
+
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from loguru import logger
+
+from monitoring.metrics import CACHE_REQUESTS
+
+# Как часто (в запросах на view) писать в лог долю ответов 304
+CONDITIONAL_GET_REPORT_EVERY = 100
+
+_stats_lock = threading.Lock()
+_stats = Counter()
+
+
+def _record_conditional_get(view_name, hit):
+    """Count a conditional GET and periodically log the 304 hit rate."""
+    CACHE_REQUESTS.inc(cache="conditional_get", result="hit" if hit else "miss")
+    with _stats_lock:
+        _stats[(view_name, "total")] += 1
+        if hit:
+            _stats[(view_name, "hits")] += 1
+        total = _stats[(view_name, "total")]
+        hits = _stats[(view_name, "hits")]
+
+    if hit:
+        logger.debug(f"{view_name}: 304 Not Modified")
+    if total % CONDITIONAL_GET_REPORT_EVERY == 0:
+        logger.info(
+            f"{view_name}: {hits}/{total} conditional GETs answered with 304 "
+            f"({hits / total:.1%})"
+        )
+
+
+def conditional_get_stats():
+    """Return {view_name: (hits, total)} for the current process."""
+    with _stats_lock:
+        views = {name for name, _ in _stats}
+        return {
+            name: (_stats[(name, "hits")], _stats[(name, "total")]) for name in views
+        }
+
+
+class ConditionalGetMixin:
+    """Answer ``304 Not Modified`` for detail pages that have not changed.
+
+    The validator is built from the newest timestamp of the rows the page
+    renders (``get_conditional_timestamps``) plus any extra values such as
+    row counts (``get_conditional_extra``). The current user is part of the
+    ETag because pages differ for guests, players and staff.
+    """
+
+    def get_conditional_timestamps(self):
+        obj = self.object
+        return [getattr(obj, "updated_at", None) or getattr(obj, "created_at", None)]
+
+    def get_conditional_extra(self):
+        return []
+
+    def get_last_modified(self):
+        timestamps = [ts for ts in self.get_conditional_timestamps() if ts]
+        return max(timestamps) if timestamps else None
+
+    def get_etag(self, last_modified):
+        user = self.request.user
+        parts = [
+            self.object._meta.label_lower,
+            self.object.pk,
+            last_modified.isoformat(),
+            user.pk if user.is_authenticated else 0,
+            *self.get_conditional_extra(),
+        ]
+        digest = hashlib.md5(
+            "|".join(str(part) for part in parts).encode(), usedforsecurity=False
+        )
+        return quote_etag(digest.hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        view_name = type(self).__name__
+        last_modified = self.get_last_modified()
+
+        # Страница с flash-сообщениями всегда отрисовывается заново
+        if last_modified is None or len(get_messages(request)):
+            context = self.get_context_data(object=self.object)
+            return self.render_to_response(context)
+
+        etag = self.get_etag(last_modified)
+        last_modified_ts = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified_ts
+        )
+        hit = response is not None
+        _record_conditional_get(view_name, hit)
+
+        if not hit:
+            context = self.get_context_data(object=self.object)
+            response = self.render_to_response(context)
+
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(last_modified_ts))
+        patch_vary_headers(response, ["Cookie"])
+        return response
@@ -1,5 +1,6 @@
 """Django settings for tennis_league project."""
 import os
+import tempfile
 from pathlib import Path
 import dj_database_url
 
@@ -28,17 +29,24 @@ INSTALLED_APPS = [
     "tournaments",
     "news",
     "info",
+    "mediafiles",
+    "search",
+    "monitoring",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "monitoring.middleware.QueryInstrumentationMiddleware",
+    "monitoring.middleware.MetricsMiddleware",
+    "monitoring.middleware.SlowQueryMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "monitoring.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "tennis_league.urls"
@@ -95,12 +103,36 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+
+STORAGES = {
+    # Загруженные файлы получают хеш содержимого в имени
+    "default": {"BACKEND": "mediafiles.storage.HashedMediaStorage"},
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"
+    },
+}
 
 
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Раздача медиафайлов: файлы без хеша в имени кэшируются на MEDIA_CACHE_MAX_AGE.
+# MEDIA_SENDFILE = "x-accel-redirect" (nginx) или "x-sendfile" (Apache/lighttpd)
+# передаёт отдачу файла обратному прокси
+MEDIA_CACHE_MAX_AGE = 60 * 60
+MEDIA_SENDFILE = os.environ.get("MEDIA_SENDFILE") or None
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get(
+    "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/"
+)
+
+# Загрузка изображений: лимит размера файла и нормализация фото
+MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+IMAGE_MAX_DIMENSION = 1600
+IMAGE_MAX_PIXELS = 50_000_000
+
+# Уменьшенные копии загруженных изображений создаются в фоновом потоке
+IMAGE_VARIANTS_ASYNC = os.environ.get("IMAGE_VARIANTS_ASYNC", "True") == "True"
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Настройки аутентификации
@@ -108,3 +140,64 @@ AUTH_USER_MODEL = "accounts.User"
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "home"
 LOGOUT_REDIRECT_URL = "home"
+
+# Срок жизни заявок на поиск партнера (команда expire_partner_searches):
+# без обновлений дольше TTL заявка деактивируется, а через
+# ARCHIVE_AFTER дней после этого переносится в архив
+PARTNER_SEARCH_TTL_DAYS = int(os.environ.get("PARTNER_SEARCH_TTL_DAYS", 30))
+PARTNER_SEARCH_ARCHIVE_AFTER_DAYS = int(
+    os.environ.get("PARTNER_SEARCH_ARCHIVE_AFTER_DAYS", 90)
+)
+
+# Радиус поиска кортов рядом с пользователем (фильтр near=lat,lon), км
+COURTS_NEAR_RADIUS_KM = 25
+
+# Бронирование кортов: длительность брони под матч и максимальная длина брони
+MATCH_BOOKING_DURATION_MINUTES = 90
+COURT_BOOKING_MAX_HOURS = 4
+
+# Статистика кортов (refresh_court_stats): пересчитывается по расписанию
+# (cron раз в час) и командой boot, если она старше этого срока
+COURT_STATS_MAX_AGE_MINUTES = int(os.environ.get("COURT_STATS_MAX_AGE_MINUTES", 60))
+
+# Учёт SQL-запросов каждого view (monitoring.middleware): число запросов,
+# время в БД и повторяющиеся запросы (N+1). Заголовок Server-Timing - для staff
+QUERY_INSTRUMENTATION = os.environ.get("QUERY_INSTRUMENTATION", str(DEBUG)) == "True"
+QUERY_N_PLUS_ONE_THRESHOLD = int(os.environ.get("QUERY_N_PLUS_ONE_THRESHOLD", 5))
+QUERY_SERVER_TIMING = True
+
+# Метрики для Prometheus (/metrics, monitoring.metrics). Каждый воркер gunicorn
+# пишет снимок своих метрик в METRICS_DIR, /metrics объединяет снимки всех
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "True") == "True"
+METRICS_DIR = os.environ.get(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "tennis_league_metrics")
+)
+METRICS_WRITE_INTERVAL = 5
+# Prometheus передаёт его в заголовке "Authorization: Bearer <токен>";
+# без токена /metrics доступен только персоналу
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Журнал медленных запросов (monitoring.slowlog, раздел "Медленные запросы" в
+# админке): запросы дольше порога собираются по формам вместе с планом EXPLAIN.
+# 0 отключает журнал
+SLOW_QUERY_THRESHOLD_MS = int(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 200))
+
+# Профилирование запроса по требованию (monitoring.profiling): ?_profile=1 или
+# ?_profile=sample у запроса сотрудника. Отчёты доступны только сотрудникам
+# и хранятся вне MEDIA_ROOT, чтобы публичная раздача медиа их не видела
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "True") == "True"
+PROFILING_DIR = Path(os.environ.get("PROFILING_DIR", BASE_DIR / "profiles"))
+PROFILING_SAMPLE_INTERVAL = 0.005
+PROFILING_KEEP = 50
+
+# Ленты RSS/Atom/JSON: срок хранения собранной ленты в кэше. Версия ленты
+# считается по БД, поэтому изменения видны сразу во всех процессах
+FEEDS_CACHE_TIMEOUT = int(os.environ.get("FEEDS_CACHE_TIMEOUT", 15 * 60))
+
+# Счётчик просмотров статей: просмотры копятся в памяти процесса
+# и записываются в БД пачкой раз в ARTICLE_VIEWS_FLUSH_INTERVAL секунд
+ARTICLE_VIEWS_FLUSH_INTERVAL = int(os.environ.get("ARTICLE_VIEWS_FLUSH_INTERVAL", 30))
+ARTICLE_VIEWS_MAX_PENDING = 500
+ARTICLE_VIEWS_SESSION_DEDUP = (
+    os.environ.get("ARTICLE_VIEWS_SESSION_DEDUP", "False") == "True"
+)
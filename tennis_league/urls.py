@@ -1,17 +1,32 @@
 """URL configuration for tennis_league project."""
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from mediafiles.views import serve_media
+from monitoring.views import metrics_view, profile_detail, profile_download
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("tournaments.urls")),
     path("accounts/", include("accounts.urls")),
     path("news/", include("news.urls")),
     path("info/", include("info.urls")),
+    path("search/", include("search.urls")),
+    path("metrics", metrics_view, name="metrics"),
+    path("monitoring/profiles/<str:name>/", profile_detail, name="profile_detail"),
+    path(
+        "monitoring/profiles/<str:name>/download/",
+        profile_download,
+        name="profile_download",
+    ),
+    re_path(
+        rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.+)$",
+        serve_media,
+        name="media",
+    ),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -6,7 +6,9 @@ from .models import (
     Participant,
     Match,
     CourtLocation,
+    CourtBooking,
     PartnerSearch,
+    PartnerSearchArchive,
     Rating,
     Referral,
     RatingHistory,
@@ -195,6 +197,7 @@ class CourtLocationAdmin(admin.ModelAdmin):
             "Основная информация",
             {"fields": ("name", "address", "city", "region", "phone")},
         ),
+        ("Координаты", {"fields": ("latitude", "longitude")}),
         (
             "Параметры",
             {"fields": ("cost_per_hour", "working_hours", "has_indoor", "has_outdoor")},
@@ -215,6 +218,18 @@ class CourtLocationAdmin(admin.ModelAdmin):
     court_types.short_description = "Тип корта"
 
 
+@admin.register(CourtBooking)
+class CourtBookingAdmin(admin.ModelAdmin):
+    """Admin interface for CourtBooking model."""
+
+    list_display = ["court", "start", "end", "status", "match", "booked_by"]
+    list_filter = ["status", "court", "start"]
+    search_fields = ["court__name", "note", "booked_by__username"]
+    ordering = ["-start"]
+    date_hierarchy = "start"
+    raw_id_fields = ["match", "booked_by"]
+
+
 @admin.register(PartnerSearch)
 class PartnerSearchAdmin(admin.ModelAdmin):
     """Admin interface for PartnerSearch model."""
@@ -254,6 +269,23 @@ class PartnerSearchAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(PartnerSearchArchive)
+class PartnerSearchArchiveAdmin(admin.ModelAdmin):
+    """Admin interface for archived partner searches."""
+
+    list_display = ["user", "sport_type", "skill_level", "created_at", "archived_at"]
+    list_filter = ["sport_type", "skill_level", "archived_at"]
+    search_fields = ["user__username", "user__first_name", "user__last_name"]
+    ordering = ["-archived_at"]
+    date_hierarchy = "archived_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Rating)
 class RatingAdmin(admin.ModelAdmin):
     """Admin interface for Rating model."""
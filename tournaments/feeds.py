@@ -0,0 +1,81 @@
+"""Syndication feeds for tournaments app."""
+from django.urls import reverse
+
+from tennis_league.feeds import CachedFeed
+from .models import Match, Tournament
+
+
+class TournamentFeed(CachedFeed):
+    """Announced tournaments, newest announcements first."""
+
+    name = "tournaments"
+    title = "Турниры - Теннисная Лига"
+    description = "Новые турниры теннисной лиги"
+    link_name = "tournament_list"
+    models = [Tournament]
+
+    def items(self):
+        return Tournament.objects.order_by("-created_at")
+
+    def item_title(self, item):
+        return item.name
+
+    def item_description(self, item):
+        details = [
+            item.get_category_display(),
+            item.get_level_display(),
+            f"{item.start_date:%d.%m.%Y} - {item.end_date:%d.%m.%Y}",
+            item.location,
+        ]
+        summary = " · ".join(part for part in details if part)
+        return (
+            f"{summary}\n\n{item.description}".strip() if item.description else summary
+        )
+
+    def item_link(self, item):
+        return reverse("tournament_detail", args=[item.pk])
+
+    def item_categories(self, item):
+        return [item.get_category_display()]
+
+
+class MatchResultFeed(CachedFeed):
+    """Results of finished matches confirmed by both players."""
+
+    name = "results"
+    title = "Результаты матчей - Теннисная Лига"
+    description = "Подтверждённые результаты матчей теннисной лиги"
+    link_name = "match_list"
+    models = [Match]
+
+    def items(self):
+        return (
+            Match.objects.filter(
+                status="FINISHED",
+                score_confirmed_by_player1=True,
+                score_confirmed_by_player2=True,
+            )
+            .select_related("tournament", "player1", "player2", "winner")
+            .order_by("-updated_at")
+        )
+
+    def item_title(self, item):
+        player1 = item.player1.get_full_name() or item.player1.username
+        player2 = item.player2.get_full_name() or item.player2.username
+        return f"{player1} - {player2}: {item.get_score()}"
+
+    def item_description(self, item):
+        description = f"{item.tournament.name}, {item.round}"
+        if item.winner:
+            winner = item.winner.get_full_name() or item.winner.username
+            description += f". Победитель: {winner}"
+        return description
+
+    def item_link(self, item):
+        return reverse("match_detail", args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.actual_date or item.updated_at
+
+    def item_categories(self, item):
+        return [item.tournament.name]
@@ -0,0 +1,165 @@
+"""Spatial index for court coordinates.
+
+Each court stores ``geo_cell``: its latitude and longitude quantized to
+26 bits each and interleaved into a 52-bit integer (the binary form of a
+geohash). All points inside one grid cell share a bit prefix, so a cell
+is a contiguous ``geo_cell`` range and can be selected with a plain
+B-tree index on SQLite and PostgreSQL alike.
+
+A radius query looks at the 3x3 block of cells around the point whose
+cell size is at least the radius, narrows it with a bounding box, and
+computes exact distances only for the remaining rows.
+"""
+import math
+
+from django.db.models import Q
+
+AXIS_BITS = 26
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Предел расширения радиуса при поиске ближайших кортов
+MAX_SEARCH_RADIUS_KM = 2000.0
+# Шаги радиуса: каждый шаг - отдельный запрос, их мало, чтобы не было N+1
+NEAREST_STEPS_KM = (2.0, 20.0, 200.0)
+
+
+def _quantize(value, low, high, bits=AXIS_BITS):
+    cells = 1 << bits
+    index = int((value - low) / (high - low) * cells)
+    return min(max(index, 0), cells - 1)
+
+
+def _interleave(lon_index, lat_index):
+    cell = 0
+    for bit in range(AXIS_BITS - 1, -1, -1):
+        cell = (cell << 2) | (((lon_index >> bit) & 1) << 1) | ((lat_index >> bit) & 1)
+    return cell
+
+
+def encode(latitude, longitude):
+    """Return the ``geo_cell`` value for a point."""
+    return _interleave(
+        _quantize(float(longitude), -180.0, 180.0),
+        _quantize(float(latitude), -90.0, 90.0),
+    )
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Great-circle (haversine) distance between two points in kilometres."""
+    lat1, lon1, lat2, lon2 = map(math.radians, map(float, (lat1, lon1, lat2, lon2)))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def parse_point(value):
+    """Parse ``"lat,lon"`` into a (lat, lon) tuple, or return None."""
+    try:
+        lat, lon = (float(part) for part in (value or "").split(","))
+    except ValueError:
+        return None
+    if not (math.isfinite(lat) and math.isfinite(lon)):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+def _cell_depth(latitude, radius_km):
+    """Deepest grid level whose cells are still at least ``radius_km`` wide."""
+    # Ширина ячейки берётся на самой удалённой от экватора точке круга
+    far_latitude = min(abs(latitude) + radius_km / KM_PER_DEGREE, 89.9)
+    min_width = KM_PER_DEGREE * max(math.cos(math.radians(far_latitude)), 0.01)
+    for depth in range(AXIS_BITS, 0, -1):
+        height = 180.0 / (1 << depth) * KM_PER_DEGREE
+        width = 360.0 / (1 << depth) * min_width
+        if height >= radius_km and width >= radius_km:
+            return depth
+    return 0
+
+
+def cell_ranges(latitude, longitude, radius_km):
+    """Return ``geo_cell`` [start, end) ranges covering a circle."""
+    depth = _cell_depth(latitude, radius_km)
+    if depth == 0:
+        return [(0, 1 << (2 * AXIS_BITS))]
+
+    cells = 1 << depth
+    lat_index = _quantize(latitude, -90.0, 90.0, depth)
+    lon_index = _quantize(longitude, -180.0, 180.0, depth)
+    shift = 2 * (AXIS_BITS - depth)
+    starts = set()
+    for d_lat in (-1, 0, 1):
+        row = lat_index + d_lat
+        if not 0 <= row < cells:
+            continue
+        for d_lon in (-1, 0, 1):
+            # По долготе сетка замкнута (180° = -180°)
+            column = (lon_index + d_lon) % cells
+            starts.add(
+                _interleave(column << (AXIS_BITS - depth), row << (AXIS_BITS - depth))
+            )
+
+    # Соседние ячейки сливаются в один диапазон
+    ranges = []
+    for start in sorted(starts):
+        end = start + (1 << shift)
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """Return objects of ``queryset`` within ``radius_km``, nearest first.
+
+    Each object gets a ``distance_km`` attribute.
+    """
+    cells = Q()
+    for start, end in cell_ranges(latitude, longitude, radius_km):
+        cells |= Q(geo_cell__gte=start, geo_cell__lt=end)
+
+    lat_delta = radius_km / KM_PER_DEGREE
+    queryset = queryset.filter(
+        cells,
+        latitude__gte=latitude - lat_delta,
+        latitude__lte=latitude + lat_delta,
+    )
+    cos_lat = math.cos(math.radians(min(abs(latitude) + lat_delta, 90.0)))
+    if cos_lat > 0.01:
+        lon_delta = lat_delta / cos_lat
+        # Прямоугольник не применяем, если он пересекает 180-й меридиан
+        if -180 <= longitude - lon_delta and longitude + lon_delta <= 180:
+            queryset = queryset.filter(
+                longitude__gte=longitude - lon_delta,
+                longitude__lte=longitude + lon_delta,
+            )
+
+    result = []
+    # Порядок задаётся расстоянием, сортировка в БД не нужна
+    for obj in queryset.order_by():
+        obj.distance_km = distance_km(latitude, longitude, obj.latitude, obj.longitude)
+        if obj.distance_km <= radius_km:
+            result.append(obj)
+    result.sort(key=lambda obj: obj.distance_km)
+    return result
+
+
+def nearest(queryset, latitude, longitude, k=10, max_radius_km=MAX_SEARCH_RADIUS_KM):
+    """Return up to ``k`` objects nearest to the point, nearest first.
+
+    The search radius starts small and grows tenfold until enough objects
+    are found; only objects inside the searched circle are guaranteed to
+    be in the right order, so the result is always cut to that circle.
+    At most four queries are made.
+    """
+    radii = [radius for radius in NEAREST_STEPS_KM if radius < max_radius_km]
+    for radius in [*radii, max_radius_km]:
+        found = within_radius(queryset, latitude, longitude, radius)
+        if len(found) >= k:
+            break
+    return found[:k]
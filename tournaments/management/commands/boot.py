@@ -0,0 +1,151 @@
+"""Prepare the container before gunicorn starts, skipping finished work.
+
+Runs ``migrate``, ``collectstatic``, ``create_superuser_auto``,
+``populate_sample_data`` and ``refresh_court_stats`` only when their
+inputs changed:
+
+* migrations - the migration graph is compared with the migrations
+  recorded as applied in the database;
+* static files - a hash of every file the staticfiles finders would
+  collect is kept next to the collected files;
+* seed data - a superuser and all sample courts already exist;
+* court statistics - every court has statistics newer than
+  ``COURT_STATS_MAX_AGE_MINUTES``.
+
+A restart with nothing to do costs a few queries and a hash of the
+static sources instead of tens of seconds.
+"""
+import hashlib
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Min
+from django.utils import timezone
+
+from tournaments.models import CourtLocation, CourtStats
+
+from .populate_sample_data import sample_data_present
+
+FINGERPRINT_FILE = ".boot-fingerprint"
+
+
+def static_fingerprint():
+    """Return a hash of the static sources and the storage that collects them."""
+    digest = hashlib.sha256(settings.STORAGES["staticfiles"]["BACKEND"].encode())
+    ignore_patterns = apps.get_app_config("staticfiles").ignore_patterns
+    files = {}
+    for finder in finders.get_finders():
+        for path, storage in finder.list(ignore_patterns):
+            prefix = getattr(storage, "prefix", None)
+            name = f"{prefix}/{path}" if prefix else path
+            # Как и collectstatic, берём файл первого нашедшего его finder
+            files.setdefault(name, storage.path(path))
+    for name in sorted(files):
+        with open(files[name], "rb") as file:
+            content = hashlib.file_digest(file, "sha256").hexdigest()
+        digest.update(f"{name}\0{content}\n".encode())
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = "Migrate, collect static files and seed data, skipping steps that are up to date"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Run every step")
+        parser.add_argument(
+            "--skip-seed",
+            action="store_true",
+            help="Do not create the superuser and the sample data",
+        )
+
+    def handle(self, *args, **options):
+        self.force = options["force"]
+        self.verbosity = options["verbosity"]
+        started = time.perf_counter()
+
+        self._step("Migrations", self.migrate)
+        self._step("Static files", self.collect_static)
+        if not options["skip_seed"]:
+            self._step("Seed data", self.seed)
+        self._step("Court statistics", self.court_stats)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Boot finished in {time.perf_counter() - started:.1f} s"
+            )
+        )
+
+    def _step(self, name, func):
+        started = time.perf_counter()
+        summary = func()
+        self.stdout.write(
+            f"✓ {name}: {summary} ({time.perf_counter() - started:.1f} s)"
+        )
+
+    def migrate(self):
+        executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+        graph = executor.loader.graph
+        fingerprint = hashlib.sha256(
+            "\n".join(f"{app}.{name}" for app, name in sorted(graph.nodes)).encode()
+        ).hexdigest()[:12]
+        plan = executor.migration_plan(graph.leaf_nodes())
+        if not plan and not self.force:
+            return f"up to date (graph {fingerprint})"
+
+        call_command("migrate", interactive=False, verbosity=self.verbosity)
+        return f"{len(plan)} applied (graph {fingerprint})"
+
+    def collect_static(self):
+        root = Path(settings.STATIC_ROOT)
+        stamp = root / FINGERPRINT_FILE
+        fingerprint = static_fingerprint()
+        manifest = getattr(staticfiles_storage, "manifest_name", None)
+        collected = not manifest or (root / manifest).is_file()
+        if (
+            not self.force
+            and collected
+            and stamp.is_file()
+            and stamp.read_text(encoding="utf-8") == fingerprint
+        ):
+            return f"up to date ({fingerprint[:12]})"
+
+        call_command("collectstatic", interactive=False, verbosity=self.verbosity)
+        # Отметка пишется последней: прерванный сбор повторится при следующем старте
+        stamp.write_text(fingerprint, encoding="utf-8")
+        return f"collected ({fingerprint[:12]})"
+
+    def seed(self):
+        User = get_user_model()
+        if (
+            not self.force
+            and User.objects.filter(is_superuser=True).exists()
+            and sample_data_present()
+        ):
+            return "up to date"
+
+        call_command("create_superuser_auto")
+        call_command("populate_sample_data")
+        return "created"
+
+    def court_stats(self):
+        state = CourtStats.objects.aggregate(oldest=Min("refreshed_at"))
+        max_age = timedelta(minutes=settings.COURT_STATS_MAX_AGE_MINUTES)
+        # Без кортов статистика пуста и пересчитывать нечего
+        fresh = (
+            state["oldest"] is None or timezone.now() - state["oldest"] < max_age
+        ) and not CourtLocation.objects.filter(stats__isnull=True).exists()
+        if fresh and not self.force:
+            return "up to date"
+
+        call_command("refresh_court_stats", verbosity=self.verbosity)
+        return "refreshed"
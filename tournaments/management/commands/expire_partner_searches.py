@@ -0,0 +1,97 @@
+"""Deactivate stale partner searches and archive old inactive ones."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from tournaments.models import PartnerSearch, PartnerSearchArchive
+
+
+class Command(BaseCommand):
+    """Apply the partner search TTL policy in batches."""
+
+    help = (
+        "Deactivate partner searches older than the TTL and archive old inactive ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ttl-days",
+            type=int,
+            default=settings.PARTNER_SEARCH_TTL_DAYS,
+            help="Deactivate active searches not updated for this many days",
+        )
+        parser.add_argument(
+            "--archive-days",
+            type=int,
+            default=settings.PARTNER_SEARCH_ARCHIVE_AFTER_DAYS,
+            help="Archive inactive searches not updated for this many days",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows updated or archived per statement",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many searches would be affected",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        batch_size = options["batch_size"]
+
+        stale = PartnerSearch.objects.filter(
+            is_active=True, updated_at__lt=now - timedelta(days=options["ttl_days"])
+        )
+        old = PartnerSearch.objects.filter(
+            is_active=False,
+            updated_at__lt=now - timedelta(days=options["archive_days"]),
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"Would expire {stale.count()} and archive {old.count()} searches"
+            )
+            return
+
+        expired = self.expire(stale, now, batch_size)
+        archived = self.archive(old, batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Expired {expired} partner searches, archived {archived}"
+            )
+        )
+
+    def expire(self, queryset, now, batch_size):
+        """Deactivate matching searches with one UPDATE per batch."""
+        total = 0
+        while True:
+            ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return total
+            # updated_at меняется, чтобы индекс подбора партнеров увидел изменение
+            total += PartnerSearch.objects.filter(pk__in=ids).update(
+                is_active=False, updated_at=now
+            )
+
+    def archive(self, queryset, batch_size):
+        """Copy matching searches to the archive table and delete them."""
+        total = 0
+        while True:
+            searches = list(queryset.order_by("pk")[:batch_size])
+            if not searches:
+                return total
+            with transaction.atomic():
+                PartnerSearchArchive.objects.bulk_create(
+                    [PartnerSearchArchive.from_search(search) for search in searches],
+                    ignore_conflicts=True,
+                )
+                PartnerSearch.objects.filter(
+                    pk__in=[search.pk for search in searches]
+                ).delete()
+            total += len(searches)
@@ -0,0 +1,715 @@
+"""Generate a large synthetic league for benchmarking and capacity planning."""
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from itertools import combinations
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, reset_queries, transaction
+from django.db.models import DateTimeField, Max
+from django.utils import timezone
+from django.utils.text import slugify
+
+from news.models import Article, Tag
+from tournaments import geo, schedule
+from tournaments.models import (
+    CourtBooking,
+    CourtLocation,
+    Match,
+    Participant,
+    PartnerSearch,
+    Rating,
+    RatingHistory,
+    Tournament,
+)
+from tournaments.timeslots import parse_time_slots
+
+User = get_user_model()
+
+# Пароль всех сгенерированных игроков (для нагрузочных сценариев со входом)
+PASSWORD = "loadtest"
+
+MALE_FIRST_NAMES = [
+    "Алексей",
+    "Дмитрий",
+    "Иван",
+    "Сергей",
+    "Андрей",
+    "Максим",
+    "Павел",
+    "Никита",
+]
+FEMALE_FIRST_NAMES = [
+    "Анна",
+    "Мария",
+    "Елена",
+    "Ольга",
+    "Наталья",
+    "Дарья",
+    "Ирина",
+    "Светлана",
+]
+LAST_NAMES = [
+    "Иванов",
+    "Смирнов",
+    "Кузнецов",
+    "Попов",
+    "Соколов",
+    "Лебедев",
+    "Козлов",
+    "Новиков",
+]
+TOURNAMENT_NAMES = [
+    "Кубок",
+    "Открытый турнир",
+    "Челлендж",
+    "Гран-при",
+    "Лига",
+    "Мастерс",
+]
+SEASONS = ["весны", "лета", "осени", "зимы"]
+PREFERRED_TIMES = [
+    "будни вечером",
+    "выходные днем",
+    "выходные утром",
+    "будни утром, выходные вечером",
+    "ежедневно после 18",
+    "пн, ср, пт вечером",
+]
+PREFERRED_LOCATIONS = [
+    "Север",
+    "Юг",
+    "Центр",
+    "Запад",
+    "Восток",
+    "Любой корт рядом с метро",
+]
+TAG_NAMES = [
+    "Турниры",
+    "Рейтинг",
+    "Результаты",
+    "Корты",
+    "Тренировки",
+    "Интервью",
+    "Анонсы",
+    "Правила",
+    "Юниоры",
+    "Ветераны",
+    "Парные игры",
+    "Экипировка",
+]
+ARTICLE_WORDS = (
+    "турнир матч корт подача сет гейм победа финал полуфинал рейтинг игрок "
+    "тренировка ракетка мяч удар сезон лига кубок соперник счет тай-брейк"
+).split()
+# Число геймов проигравшего в сете
+LOSER_GAMES = [0, 1, 2, 3, 4]
+TOURNAMENT_SIZES = [16, 24, 32, 48]
+MATCH_FIELDS = [
+    "id",
+    "tournament",
+    "round",
+    "player1",
+    "player2",
+    "court_location",
+    "scheduled_date",
+    "deadline",
+    "actual_date",
+    "location",
+    "status",
+    "court_cost",
+    "balls_confirmed",
+    "player1_set1",
+    "player1_set2",
+    "player1_set3",
+    "player2_set1",
+    "player2_set2",
+    "player2_set3",
+    "score_confirmed_by_player1",
+    "score_confirmed_by_player2",
+    "winner",
+    "created_at",
+    "updated_at",
+]
+
+
+@contextmanager
+def historical_timestamps(*models):
+    """Let ``bulk_create`` keep explicit values of auto_now(_add) fields."""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class Command(BaseCommand):
+    """Fill the database with a league of realistic size.
+
+    Rows are generated in chunks. Users, tournaments, courts and the other
+    small tables are written with ``bulk_create``; matches, their court
+    bookings and rating history go through ``_insert_rows`` (plain
+    ``executemany``). Only ids and per-player counters stay in memory, so
+    the footprint does not grow with the number of matches. A given
+    ``--seed`` and ``--anchor`` always produce the same data. Model signals
+    are not sent: run ``rebuild_search_index`` and ``refresh_court_stats``
+    afterwards.
+    """
+
+    help = (
+        "Generate a large synthetic dataset (users, tournaments, matches, ratings, ...)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--tournaments", type=int, default=5_000)
+        parser.add_argument("--matches", type=int, default=1_000_000)
+        parser.add_argument("--courts", type=int, default=300)
+        parser.add_argument("--partner-searches", type=int, default=20_000)
+        parser.add_argument("--articles", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--anchor",
+            type=date.fromisoformat,
+            default=None,
+            help="Date treated as today, YYYY-MM-DD (default: today)",
+        )
+        parser.add_argument(
+            "--prefix", default="load", help="Prefix of generated usernames and slugs"
+        )
+        parser.add_argument("--batch-size", type=int, default=2_000)
+
+    def handle(self, *args, **options):
+        self.prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{self.prefix}_").exists():
+            raise CommandError(
+                f"Users '{self.prefix}_*' already exist: flush the database "
+                f"or choose another --prefix"
+            )
+        if options["users"] < max(TOURNAMENT_SIZES) * 2:
+            raise CommandError(f"--users must be at least {max(TOURNAMENT_SIZES) * 2}")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        anchor = options["anchor"] or timezone.localdate()
+        self.today = timezone.make_aware(datetime.combine(anchor, datetime.min.time()))
+        self._adapt_datetime = lru_cache(maxsize=None)(
+            connection.ops.adapt_datetimefield_value
+        )
+        # Id матчей задаём сами: executemany не возвращает созданные ключи
+        self.next_match_id = (Match.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+
+        started = time.perf_counter()
+        with historical_timestamps(
+            User, CourtLocation, Tournament, Participant, Rating, PartnerSearch, Article
+        ):
+            self._stage(self.create_courts, options["courts"])
+            self._stage(self.create_users, options["users"])
+            self._stage(
+                self.create_tournaments, options["tournaments"], options["matches"]
+            )
+            self._stage(self.create_ratings)
+            self._stage(self.create_partner_searches, options["partner_searches"])
+            self._stage(self.create_articles, options["articles"])
+
+        # Последовательность id матчей продолжается после вставленных вручную
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Match]):
+                cursor.execute(sql)
+        self._stage(self.analyze)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Load dataset generated in {time.perf_counter() - started:.0f} s. "
+                "Run rebuild_search_index and refresh_court_stats "
+                "to update derived data."
+            )
+        )
+
+    def analyze(self):
+        """Refresh the planner statistics after the bulk load."""
+        # Без статистики SQLite выбирает индекс по эвристике и часто ошибается
+        if connection.vendor not in ("sqlite", "postgresql"):
+            return "planner statistics skipped"
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        return "planner statistics updated"
+
+    def _stage(self, func, *args):
+        started = time.perf_counter()
+        summary = func(*args)
+        self.stdout.write(f"✓ {summary} ({time.perf_counter() - started:.1f} s)")
+
+    def _write(self, model, objects):
+        """Insert a chunk of rows and drop the logged SQL (DEBUG keeps it)."""
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        reset_queries()
+        return created
+
+    def _moment(self, day):
+        """Return an aware datetime on ``day`` (a date) at a random hour."""
+        return self.today + timedelta(
+            days=(day - self.today.date()).days, hours=self.rng.randint(8, 21)
+        )
+
+    def create_courts(self, count):
+        working_hours = [
+            "07:00 - 00:00",
+            "08:00 - 23:00",
+            "пн-пт 07:00-23:00, сб, вс 09:00-22:00",
+        ]
+        regions = [code for code, _ in CourtLocation.REGION_CHOICES]
+        courts = []
+        for index in range(count):
+            latitude = Decimal(f"{self.rng.uniform(55.55, 55.95):.6f}")
+            longitude = Decimal(f"{self.rng.uniform(37.35, 37.85):.6f}")
+            hours = self.rng.choice(working_hours)
+            created_at = self.today - timedelta(days=self.rng.randint(400, 2000))
+            courts.append(
+                CourtLocation(
+                    name=f"Корт {index + 1}",
+                    address=f"ул. Нагрузочная, д. {index + 1}",
+                    region=self.rng.choice(regions),
+                    cost_per_hour=self.rng.randrange(800, 4000, 100),
+                    working_hours=hours,
+                    opening_hours=schedule.parse_working_hours(hours),
+                    latitude=latitude,
+                    longitude=longitude,
+                    geo_cell=geo.encode(latitude, longitude),
+                    has_indoor=self.rng.random() < 0.4,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+            )
+        self.courts = [
+            (court.pk, court.cost_per_hour)
+            for court in self._write(CourtLocation, courts)
+        ]
+        return f"{count} courts"
+
+    def create_users(self, count):
+        # Один хеш на всех: PBKDF2 для каждого занял бы часы
+        password = make_password(PASSWORD)
+        self.men, self.women = [], []
+        self.user_ids = []
+        for offset in range(0, count, self.batch_size):
+            chunk = []
+            for index in range(offset, min(offset + self.batch_size, count)):
+                gender = "M" if self.rng.random() < 0.6 else "F"
+                first_names = MALE_FIRST_NAMES if gender == "M" else FEMALE_FIRST_NAMES
+                last_name = self.rng.choice(LAST_NAMES) + ("" if gender == "M" else "а")
+                joined = self.today - timedelta(
+                    days=self.rng.randint(30, 2500), minutes=self.rng.randint(0, 1439)
+                )
+                chunk.append(
+                    User(
+                        username=f"{self.prefix}_{index:06d}",
+                        email=f"{self.prefix}_{index:06d}@example.com",
+                        password=password,
+                        first_name=self.rng.choice(first_names),
+                        last_name=last_name,
+                        gender=gender,
+                        city="Москва",
+                        date_joined=joined,
+                        created_at=joined,
+                        updated_at=joined,
+                    )
+                )
+            for user in self._write(User, chunk):
+                self.user_ids.append(user.pk)
+                (self.men if user.gender == "M" else self.women).append(user.pk)
+
+        # Счётчики игроков по позиции в user_ids: списки чисел, не объекты
+        self.position = {pk: index for index, pk in enumerate(self.user_ids)}
+        self.points = [1000] * count
+        self.played = [0] * count
+        self.won = [0] * count
+        self.tournament_wins = [0] * count
+        return f"{count} users (password '{PASSWORD}')"
+
+    def create_tournaments(self, count, match_count):
+        levels = [code for code, _ in Tournament.LEVEL_CHOICES]
+        regions = [code for code, _ in Tournament.REGION_CHOICES]
+        first_day = self.today.date() - timedelta(days=5 * 365)
+        span_days = 5 * 365 + 90
+
+        tournaments = []
+        for index in range(count):
+            start = first_day + timedelta(days=int(index * span_days / count))
+            end = start + timedelta(days=self.rng.choice([2, 14, 28, 42]))
+            if end < self.today.date():
+                status, detail = "FINISHED", "COMPLETED"
+            elif start <= self.today.date():
+                status, detail = "ONGOING", "IN_PROGRESS"
+            else:
+                status, detail = "UPCOMING", "ACCEPTING"
+            created_at = self._moment(start - timedelta(days=30))
+            name = self.rng.choice(TOURNAMENT_NAMES)
+            season = self.rng.choice(SEASONS)
+            tournaments.append(
+                Tournament(
+                    name=f"{name} {season} #{index + 1}",
+                    category=self.rng.choice(["MEN", "MEN", "WOMEN", "MIXED"]),
+                    level=self.rng.choice(levels),
+                    start_date=start,
+                    end_date=end,
+                    status=status,
+                    status_detail=detail,
+                    region=self.rng.choice(regions),
+                    max_participants=self.rng.choice(TOURNAMENT_SIZES),
+                    tournament_type="WEEKEND"
+                    if (end - start).days <= 2
+                    else "MULTI_DAY",
+                    scoring_system=self.rng.choice(["OLYMPIC", "ROUND_ROBIN"]),
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+            )
+        tournaments = self._write(Tournament, tournaments)
+
+        # Матчи распределяются поровну между ещё не заполненными турнирами
+        playing_left = sum(1 for t in tournaments if t.status != "UPCOMING")
+        remaining = match_count
+        participants, matches = [], []
+        participant_total = created_matches = 0
+        for tournament in tournaments:
+            pool = {"MEN": self.men, "WOMEN": self.women}.get(
+                tournament.category, self.user_ids
+            )
+            size = tournament.max_participants
+            if tournament.status == "UPCOMING":
+                size = self.rng.randint(0, size)
+            players = self.rng.sample(pool, min(size, len(pool)))
+            for seed, user_id in enumerate(players, start=1):
+                registered = self._moment(
+                    tournament.start_date - timedelta(days=self.rng.randint(1, 30))
+                )
+                participants.append(
+                    Participant(
+                        tournament=tournament,
+                        user_id=user_id,
+                        seed=seed,
+                        registered_at=registered,
+                    )
+                )
+
+            if tournament.status != "UPCOMING":
+                new_matches = self._tournament_matches(
+                    tournament, players, remaining // playing_left
+                )
+                playing_left -= 1
+                remaining -= len(new_matches)
+                matches.extend(new_matches)
+
+            if len(participants) >= self.batch_size:
+                participant_total += len(self._write(Participant, participants))
+                participants = []
+            if len(matches) >= self.batch_size:
+                created_matches += self._write_matches(matches)
+                matches = []
+
+        participant_total += len(self._write(Participant, participants))
+        created_matches += self._write_matches(matches)
+        return (
+            f"{count} tournaments, {participant_total} participants, "
+            f"{created_matches} matches"
+        )
+
+    def _tournament_matches(self, tournament, players, quota):
+        """Build the match rows of a tournament and update player counters."""
+        pairs = list(combinations(players, 2))
+        self.rng.shuffle(pairs)
+        pairs = pairs[:quota]
+        days = max(1, (tournament.end_date - tournament.start_date).days)
+        wins = Counter()
+        matches = []
+        for number, (player1, player2) in enumerate(pairs):
+            day = tournament.start_date + timedelta(days=number * days // len(pairs))
+            scheduled = self._moment(day)
+            court_id, cost = self.rng.choice(self.courts)
+            match = {
+                "id": self.next_match_id,
+                "tournament": tournament.pk,
+                "round": f"Тур {number * tournament.max_rounds // len(pairs) + 1}",
+                "player1": player1,
+                "player2": player2,
+                "court_location": court_id,
+                "scheduled_date": scheduled,
+                "deadline": scheduled + timedelta(days=7),
+                "actual_date": None,
+                "location": "",
+                "status": "SCHEDULED",
+                "court_cost": cost,
+                "balls_confirmed": True,
+                "score_confirmed_by_player1": False,
+                "score_confirmed_by_player2": False,
+                "winner": None,
+                "created_at": scheduled - timedelta(days=self.rng.randint(1, 7)),
+                "updated_at": scheduled,
+                "history": [],
+            }
+            for number_of_set in (1, 2, 3):
+                match[f"player1_set{number_of_set}"] = None
+                match[f"player2_set{number_of_set}"] = None
+            self.next_match_id += 1
+            if scheduled < self.today:
+                self._finish(match, wins)
+            matches.append(match)
+
+        if tournament.status == "FINISHED" and wins:
+            champion = wins.most_common(1)[0][0]
+            self.tournament_wins[self.position[champion]] += 1
+        return matches
+
+    def _finish(self, match, wins):
+        """Give a played match a confirmed score and a rating change."""
+        first, second = self.position[match["player1"]], self.position[match["player2"]]
+        # Фаворит - игрок с большим рейтингом, но сюрпризы случаются
+        expected = 1 / (1 + 10 ** ((self.points[second] - self.points[first]) / 400))
+        player1_wins = self.rng.random() < expected
+        sets = [(6, self.rng.choice(LOSER_GAMES)), (7, self.rng.choice([5, 6]))]
+        if self.rng.random() < 0.3:
+            sets.insert(1, (self.rng.choice(LOSER_GAMES), 6))
+        for number, (winner_games, loser_games) in enumerate(sets, start=1):
+            if not player1_wins:
+                winner_games, loser_games = loser_games, winner_games
+            match[f"player1_set{number}"] = winner_games
+            match[f"player2_set{number}"] = loser_games
+
+        winner, loser = (first, second) if player1_wins else (second, first)
+        change = max(4, round(32 * (1 - (expected if player1_wins else 1 - expected))))
+        self.points[winner] += change
+        self.points[loser] = max(100, self.points[loser] - change)
+        self.played[first] += 1
+        self.played[second] += 1
+        self.won[winner] += 1
+        wins[self.user_ids[winner]] += 1
+
+        finished = match["scheduled_date"] + timedelta(hours=self.rng.randint(2, 48))
+        match.update(
+            status="FINISHED",
+            actual_date=match["scheduled_date"],
+            updated_at=finished,
+            score_confirmed_by_player1=True,
+            score_confirmed_by_player2=True,
+            winner=self.user_ids[winner],
+            history=[
+                (self.user_ids[winner], self.points[winner], change),
+                (self.user_ids[loser], self.points[loser], -change),
+            ],
+        )
+
+    def _insert_rows(self, model, fields, rows):
+        """INSERT plain tuples with executemany.
+
+        ``bulk_create`` spends most of its time compiling each value, which
+        for the millions of match rows takes far longer than the inserts.
+        Datetimes repeat a lot, so their adapted values are cached.
+        """
+        meta = model._meta
+        model_fields = [meta.get_field(name) for name in fields]
+        datetimes = [
+            index
+            for index, field in enumerate(model_fields)
+            if isinstance(field, DateTimeField)
+        ]
+        adapt = self._adapt_datetime
+        prepared = []
+        for row in rows:
+            row = list(row)
+            for index in datetimes:
+                if row[index] is not None:
+                    row[index] = adapt(row[index])
+            prepared.append(row)
+
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(field.column) for field in model_fields)
+        placeholders = ", ".join(["%s"] * len(fields))
+        sql = f"INSERT INTO {quote(meta.db_table)} ({columns}) VALUES ({placeholders})"
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, prepared)
+        reset_queries()
+        return len(prepared)
+
+    @transaction.atomic
+    def _write_matches(self, matches):
+        booking_end = timedelta(minutes=settings.MATCH_BOOKING_DURATION_MINUTES)
+        self._insert_rows(
+            Match,
+            MATCH_FIELDS,
+            ([match[name] for name in MATCH_FIELDS] for match in matches),
+        )
+        self._insert_rows(
+            CourtBooking,
+            [
+                "court",
+                "match",
+                "start",
+                "end",
+                "status",
+                "note",
+                "created_at",
+                "updated_at",
+            ],
+            (
+                (
+                    match["court_location"],
+                    match["id"],
+                    match["scheduled_date"],
+                    match["scheduled_date"] + booking_end,
+                    CourtBooking.STATUS_CONFIRMED,
+                    f"Матч: {match['round']}",
+                    match["created_at"],
+                    match["created_at"],
+                )
+                for match in matches
+            ),
+        )
+        self._insert_rows(
+            RatingHistory,
+            ["user", "points", "match", "tournament", "change", "reason", "created_at"],
+            (
+                (
+                    user_id,
+                    points,
+                    match["id"],
+                    match["tournament"],
+                    change,
+                    "Победа в матче" if change > 0 else "Поражение в матче",
+                    match["updated_at"],
+                )
+                for match in matches
+                for user_id, points, change in match["history"]
+            ),
+        )
+        return len(matches)
+
+    def create_ratings(self):
+        order = sorted(range(len(self.user_ids)), key=lambda index: -self.points[index])
+        rank = [0] * len(order)
+        for position, index in enumerate(order, start=1):
+            rank[index] = position
+
+        total = 0
+        for offset in range(0, len(self.user_ids), self.batch_size):
+            chunk = []
+            for index in range(
+                offset, min(offset + self.batch_size, len(self.user_ids))
+            ):
+                points = self.points[index]
+                ntrp = min(6.5, max(1.0, round((2.0 + (points - 700) / 250) * 2) / 2))
+                chunk.append(
+                    Rating(
+                        user_id=self.user_ids[index],
+                        ntrp_level=f"{ntrp:.1f}",
+                        matches_played=self.played[index],
+                        matches_won=self.won[index],
+                        tournament_wins=self.tournament_wins[index],
+                        points=points,
+                        rank_position=rank[index],
+                        updated_at=self.today,
+                    )
+                )
+            total += len(self._write(Rating, chunk))
+        return f"{total} ratings"
+
+    def create_partner_searches(self, count):
+        sports = [code for code, _ in PartnerSearch.SPORT_CHOICES]
+        levels = [code for code, _ in PartnerSearch.LEVEL_CHOICES]
+        slots = {text: parse_time_slots(text) for text in PREFERRED_TIMES}
+        total = 0
+        for offset in range(0, count, self.batch_size):
+            chunk = []
+            for _ in range(offset, min(offset + self.batch_size, count)):
+                preferred_time = self.rng.choice(PREFERRED_TIMES)
+                created_at = self.today - timedelta(
+                    minutes=self.rng.randint(0, 90 * 24 * 60)
+                )
+                chunk.append(
+                    PartnerSearch(
+                        user_id=self.rng.choice(self.user_ids),
+                        sport_type=self.rng.choices(
+                            sports, weights=[10, 2, 2, 1, 2, 1, 1]
+                        )[0],
+                        skill_level=self.rng.choice(levels),
+                        preferred_time=preferred_time,
+                        time_slots=slots[preferred_time],
+                        preferred_location=self.rng.choice(PREFERRED_LOCATIONS),
+                        is_active=self.rng.random() < 0.7,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                )
+            total += len(self._write(PartnerSearch, chunk))
+        return f"{total} partner searches"
+
+    def create_articles(self, count):
+        tags = []
+        for name in TAG_NAMES:
+            tag, _ = Tag.objects.get_or_create(
+                name=name, defaults={"slug": slugify(name, allow_unicode=True)}
+            )
+            tags.append(tag.pk)
+        authors = self.user_ids[:20]
+        through = Article.tags.through
+
+        total = 0
+        for offset in range(0, count, self.batch_size):
+            chunk = []
+            for index in range(offset, min(offset + self.batch_size, count)):
+                paragraphs = [
+                    " ".join(
+                        self.rng.choices(ARTICLE_WORDS, k=self.rng.randint(30, 80))
+                    ).capitalize()
+                    + "."
+                    for _ in range(self.rng.randint(2, 6))
+                ]
+                created_at = self.today - timedelta(
+                    days=int((count - index) * 5 * 365 / count),
+                    hours=self.rng.randint(0, 23),
+                )
+                chunk.append(
+                    Article(
+                        title=" ".join(
+                            self.rng.choices(ARTICLE_WORDS, k=5)
+                        ).capitalize(),
+                        slug=f"{self.prefix}-article-{index + 1}",
+                        content="".join(f"<p>{text}</p>" for text in paragraphs),
+                        # save() не вызывается - текст без разметки задаём сами
+                        plain_text=" ".join(paragraphs),
+                        author_id=self.rng.choice(authors),
+                        published=self.rng.random() < 0.9,
+                        views=self.rng.randint(0, 5000),
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                )
+            articles = self._write(Article, chunk)
+            self._write(
+                through,
+                [
+                    through(article_id=article.pk, tag_id=tag_id)
+                    for article in articles
+                    for tag_id in self.rng.sample(tags, self.rng.randint(1, 3))
+                ],
+            )
+            total += len(articles)
+        return f"{total} articles"
@@ -0,0 +1,131 @@
+"""Import court coordinates from a local CSV file."""
+import csv
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tournaments import geo
+from tournaments.models import CourtLocation
+
+MICRODEGREE = Decimal("0.000001")
+
+
+def _normalize(text):
+    text = (text or "").lower().replace("ё", "е")
+    return re.sub(r"[\W_]+", " ", text).strip()
+
+
+class Command(BaseCommand):
+    """Fill CourtLocation.latitude/longitude without an online geocoder.
+
+    The CSV must have ``latitude`` and ``longitude`` columns and either an
+    ``id`` column or ``address`` (optionally with ``city`` and ``name``)
+    columns to find the court.
+    """
+
+    help = (
+        "Import court coordinates from a CSV file (id or address, latitude, longitude)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the CSV file")
+        parser.add_argument("--delimiter", default=",", help="CSV delimiter")
+        parser.add_argument(
+            "--overwrite",
+            action="store_true",
+            help="Replace coordinates that are already set",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be updated",
+        )
+
+    def handle(self, *args, **options):
+        courts = list(CourtLocation.objects.all())
+        by_id = {court.pk: court for court in courts}
+        by_address = {}
+        by_name = {}
+        for court in courts:
+            # Ключ с пустым городом - для CSV без колонки city
+            for city in (_normalize(court.city), ""):
+                by_address.setdefault((city, _normalize(court.address)), court)
+                by_name.setdefault((city, _normalize(court.name)), court)
+
+        now = timezone.now()
+        updated = {}
+        skipped = 0
+        try:
+            with open(options["path"], newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f, delimiter=options["delimiter"])
+                missing = {"latitude", "longitude"} - set(reader.fieldnames or [])
+                if missing:
+                    raise CommandError(
+                        f"CSV has no columns: {', '.join(sorted(missing))}"
+                    )
+
+                for line, row in enumerate(reader, start=2):
+                    court = self._find_court(row, by_id, by_address, by_name)
+                    if court is None:
+                        self.stderr.write(f"✗ line {line}: court not found")
+                        skipped += 1
+                        continue
+                    try:
+                        latitude = Decimal(row["latitude"].strip()).quantize(
+                            MICRODEGREE
+                        )
+                        longitude = Decimal(row["longitude"].strip()).quantize(
+                            MICRODEGREE
+                        )
+                    except (AttributeError, InvalidOperation):
+                        self.stderr.write(f"✗ line {line}: invalid coordinates")
+                        skipped += 1
+                        continue
+                    # Decimal("NaN") не сравнивается с числами - отсекаем до проверки
+                    if not (latitude.is_finite() and longitude.is_finite()):
+                        self.stderr.write(f"✗ line {line}: invalid coordinates")
+                        skipped += 1
+                        continue
+                    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                        self.stderr.write(f"✗ line {line}: coordinates out of range")
+                        skipped += 1
+                        continue
+                    if court.has_coordinates and not options["overwrite"]:
+                        skipped += 1
+                        continue
+
+                    court.latitude = latitude
+                    court.longitude = longitude
+                    court.geo_cell = geo.encode(latitude, longitude)
+                    # bulk_update не обновляет auto_now поля
+                    court.updated_at = now
+                    updated[court.pk] = court
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+
+        if not options["dry_run"]:
+            CourtLocation.objects.bulk_update(
+                updated.values(),
+                ["latitude", "longitude", "geo_cell", "updated_at"],
+                batch_size=500,
+            )
+
+        verb = "Would update" if options["dry_run"] else "Updated"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {len(updated)} courts, skipped {skipped} rows")
+        )
+
+    def _find_court(self, row, by_id, by_address, by_name):
+        court_id = (row.get("id") or "").strip()
+        if court_id.isdigit():
+            return by_id.get(int(court_id))
+        city = _normalize(row.get("city"))
+        if row.get("address"):
+            court = by_address.get((city, _normalize(row["address"])))
+            if court is not None:
+                return court
+        if row.get("name"):
+            return by_name.get((city, _normalize(row["name"])))
+        return None
@@ -11,42 +11,53 @@ from tournaments.models import (
 
 User = get_user_model()
 
+SAMPLE_COURTS = [
+    "Tennis Club Elite", "Moscow Tennis Palace", "Metro Center",
+    "Sokolniki Club", "Rublevo-Arkhyz", "Bitsa Park", "Luzhniki",
+    "VTB Arena", "Olympic Complex", "City Courts"
+]
+
+
+def sample_data_present():
+    """Return True when every sample court already exists."""
+    return CourtLocation.objects.filter(name__in=SAMPLE_COURTS).count() >= len(SAMPLE_COURTS)
+
 
 class Command(BaseCommand):
-    help = "Populate database with sample tennis data"
+    help = "Populate database with sample tennis data (safe to run repeatedly)"
 
     def handle(self, *args, **options):
         self.stdout.write("Creating sample data...")
+        # Один и тот же выбор при каждом запуске: повторный запуск ничего не дублирует
+        rng = random.Random(42)
 
         # Создание кортов
         courts = []
         regions = ["NORTH", "SOUTH", "CENTER", "WEST", "EAST"]
-        court_names = [
-            "Tennis Club Elite", "Moscow Tennis Palace", "Metro Center",
-            "Sokolniki Club", "Rublevo-Arkhyz", "Bitsa Park", "Luzhniki",
-            "VTB Arena", "Olympic Complex", "City Courts"
-        ]
         
-        for i, name in enumerate(court_names):
-            court = CourtLocation.objects.create(
+        for i, name in enumerate(SAMPLE_COURTS):
+            court, created = CourtLocation.objects.get_or_create(
                 name=name,
-                address=f"ул. Тестовая, д. {i+1}",
-                city="Москва",
-                region=random.choice(regions),
-                cost_per_hour=random.randint(800, 2500),
-                phone=f"+7-999-{random.randint(1000000, 9999999)}",
-                working_hours="07:00 - 00:00",
-                facilities="Раздевалки, Душ, Парковка, Кафе",
-                has_indoor=random.choice([True, False]),
-                has_outdoor=True,
-                is_active=True
+                defaults={
+                    'address': f"ул. Тестовая, д. {i+1}",
+                    'city': "Москва",
+                    'region': rng.choice(regions),
+                    'cost_per_hour': rng.randint(800, 2500),
+                    'phone': f"+7-999-{rng.randint(1000000, 9999999)}",
+                    'working_hours': "07:00 - 00:00",
+                    'facilities': "Раздевалки, Душ, Парковка, Кафе",
+                    'has_indoor': rng.choice([True, False]),
+                    'has_outdoor': True,
+                    'is_active': True,
+                }
             )
-            courts.append(court)
+            if created:
+                courts.append(court)
         
         self.stdout.write(f"✓ Created {len(courts)} courts")
 
         # Получение существующих пользователей
-        users = list(User.objects.all())
+        users = list(User.objects.order_by('pk'))
         
         if len(users) < 5:
             self.stdout.write("⚠ Need at least 5 users. Skipping some sample data...")
@@ -58,21 +69,22 @@ class Command(BaseCommand):
             rating, created = Rating.objects.get_or_create(
                 user=user,
                 defaults={
-                    'ntrp_level': random.choice(['1.5', '2.0', '2.5', '3.0', '3.5', '4.0']),
-                    'matches_played': random.randint(5, 50),
-                    'matches_won': random.randint(0, 30),
-                    'tournament_wins': random.randint(0, 3),
-                    'points': random.randint(1000, 3000),
+                    'ntrp_level': rng.choice(['1.5', '2.0', '2.5', '3.0', '3.5', '4.0']),
+                    'matches_played': rng.randint(5, 50),
+                    'matches_won': rng.randint(0, 30),
+                    'tournament_wins': rng.randint(0, 3),
+                    'points': rng.randint(1000, 3000),
                 }
             )
             if created:
                 ratings.append(rating)
 
-        # Обновление рейтинговых позиций
-        sorted_ratings = sorted(Rating.objects.all(), key=lambda r: r.points, reverse=True)
-        for idx, rating in enumerate(sorted_ratings, start=1):
-            rating.rank_position = idx
-            rating.save(update_fields=['rank_position'])
+        # Обновление рейтинговых позиций, только если появились новые рейтинги
+        if ratings:
+            sorted_ratings = sorted(Rating.objects.all(), key=lambda r: r.points, reverse=True)
+            for idx, rating in enumerate(sorted_ratings, start=1):
+                rating.rank_position = idx
+                rating.save(update_fields=['rank_position'])
 
         self.stdout.write(f"✓ Created ratings for {len(ratings)} players")
 
@@ -83,41 +95,43 @@ class Command(BaseCommand):
         times = ['Будни вечером', 'Выходные днем', 'Выходные вечером', 'Любое время']
         
         for user in users[:8]:
-            if random.random() > 0.4:  # 60% пользователей имеют заявки
-                ps = PartnerSearch.objects.create(
-                    user=user,
-                    sport_type=random.choice(sports),
-                    skill_level=random.choice(levels),
-                    preferred_time=random.choice(times),
-                    preferred_location=random.choice(regions),
-                    contact_info=user.phone or f"+7-999-{random.randint(1000000, 9999999)}",
-                    is_active=True
-                )
+            if rng.random() > 0.4:  # 60% пользователей имеют заявки
+                fields = {
+                    'sport_type': rng.choice(sports),
+                    'skill_level': rng.choice(levels),
+                    'preferred_time': rng.choice(times),
+                    'preferred_location': rng.choice(regions),
+                    'contact_info': user.phone or f"+7-999-{rng.randint(1000000, 9999999)}",
+                }
+                # Заявка у пользователя уже есть - с прошлого запуска или его собственная
+                if PartnerSearch.objects.filter(user=user, is_active=True).exists():
+                    continue
+                ps = PartnerSearch.objects.create(user=user, is_active=True, **fields)
                 partner_searches.append(ps)
         
         self.stdout.write(f"✓ Created {len(partner_searches)} partner searches")
 
         # Создание реферальных ссылок (для существующих турниров)
         referrals = []
-        tournaments = list(Tournament.objects.all()[:3])
+        tournaments = list(Tournament.objects.order_by('pk')[:3])
         
         if tournaments and len(users) >= 2:
             for tournament in tournaments:
                 for _ in range(2):
-                    try:
-                        referrer = random.choice(users[:5])
-                        referred = random.choice([u for u in users if u != referrer])
-                        
-                        referral = Referral.objects.create(
-                            referrer=referrer,
-                            referred=referred,
-                            tournament=tournament,
-                            bonus_amount=500,
-                            status=random.choice(['PENDING', 'PAID'])
-                        )
+                    referrer = rng.choice(users[:5])
+                    referred = rng.choice([u for u in users if u != referrer])
+
+                    referral, created = Referral.objects.get_or_create(
+                        referrer=referrer,
+                        referred=referred,
+                        tournament=tournament,
+                        defaults={
+                            'bonus_amount': 500,
+                            'status': rng.choice(['PENDING', 'PAID']),
+                        }
+                    )
+                    if created:
                         referrals.append(referral)
-                    except:
-                        pass
         
         self.stdout.write(f"✓ Created {len(referrals)} referrals")
 
@@ -0,0 +1,81 @@
+"""Recompute the court usage statistics rollup."""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import ExtractHour
+from django.utils import timezone
+
+from tournaments.models import CourtLocation, CourtStats, Match
+
+# Сколько самых загруженных часов хранить
+BUSIEST_HOURS_LIMIT = 3
+
+
+class Command(BaseCommand):
+    """Fill CourtStats for every court with a few grouped queries."""
+
+    help = "Recompute per-court usage statistics (matches, average cost, busiest hours)"
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        matches = Match.objects.filter(court_location__isnull=False).exclude(
+            status="CANCELLED"
+        )
+
+        totals = {
+            row["court_location"]: row
+            for row in matches.values("court_location").annotate(
+                total=Count("id"),
+                recent=Count(
+                    "id",
+                    filter=Q(
+                        scheduled_date__gte=now - timedelta(days=30),
+                        scheduled_date__lte=now,
+                    ),
+                ),
+                average_cost=Avg("court_cost"),
+            )
+        }
+
+        hours = defaultdict(list)
+        for row in (
+            matches.filter(scheduled_date__isnull=False)
+            .annotate(hour=ExtractHour("scheduled_date"))
+            .values("court_location", "hour")
+            .annotate(count=Count("id"))
+        ):
+            hours[row["court_location"]].append([row["hour"], row["count"]])
+
+        stats = []
+        for court_id in CourtLocation.objects.values_list("pk", flat=True):
+            row = totals.get(court_id, {})
+            busiest = sorted(hours[court_id], key=lambda item: (-item[1], item[0]))
+            stats.append(
+                CourtStats(
+                    court_id=court_id,
+                    matches_total=row.get("total", 0),
+                    matches_last_30_days=row.get("recent", 0),
+                    average_court_cost=row.get("average_cost"),
+                    busiest_hours=busiest[:BUSIEST_HOURS_LIMIT],
+                    refreshed_at=now,
+                )
+            )
+
+        CourtStats.objects.bulk_create(
+            stats,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["court"],
+            update_fields=[
+                "matches_total",
+                "matches_last_30_days",
+                "average_court_cost",
+                "busiest_hours",
+                "refreshed_at",
+            ],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Court statistics refreshed for {len(stats)} courts")
+        )
@@ -0,0 +1,334 @@
+"""Partner matching engine.
+
+Active partner searches are kept in memory as compact feature vectors
+(NTRP level, rating points, location tokens packed into an integer
+bitmask and the weekly ``time_slots`` mask from ``timeslots``).
+Candidates are grouped by sport and NTRP level, and the top-K search
+visits NTRP buckets from the nearest outward, stopping as soon as a
+bucket cannot beat the current K-th best score.
+
+Each process keeps its own index. Changes made in this process are
+applied through signals; changes made by other gunicorn workers are
+picked up by an incremental refresh based on ``updated_at``.
+"""
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from loguru import logger
+
+from .models import PartnerSearch, Rating
+
+# Веса составляющих оценки совместимости (в сумме 1.0)
+WEIGHT_NTRP = 0.4
+WEIGHT_LOCATION = 0.25
+WEIGHT_TIME = 0.2
+WEIGHT_RATING = 0.15
+
+NTRP_MAX_DISTANCE = 2.0  # разница уровней, при которой совпадение по NTRP = 0
+RATING_MAX_DISTANCE = 500  # разница очков, при которой совпадение по рейтингу = 0
+DEFAULT_POINTS = 1000
+
+TOKEN_RE = re.compile(r"[\wё]+", re.IGNORECASE)
+
+
+class _TokenVocabulary:
+    """Map words to bit positions so that token sets become integers."""
+
+    def __init__(self):
+        self._bits = {}
+
+    def mask(self, *texts):
+        mask = 0
+        for text in texts:
+            for token in TOKEN_RE.findall((text or "").lower().replace("ё", "е")):
+                if len(token) < 3:
+                    continue
+                bit = self._bits.get(token)
+                if bit is None:
+                    bit = self._bits[token] = len(self._bits)
+                mask |= 1 << bit
+        return mask
+
+
+def _overlap(a, b):
+    """Jaccard similarity of two bitmasks."""
+    union = a | b
+    if not union:
+        return 0.0
+    return (a & b).bit_count() / union.bit_count()
+
+
+def _time_overlap(a, b):
+    """Share of the narrower availability covered by the other one."""
+    narrower = min(a.bit_count(), b.bit_count())
+    if not narrower:
+        return 0.0
+    return (a & b).bit_count() / narrower
+
+
+class Candidate:
+    """Feature vector of one active partner search."""
+
+    __slots__ = ("search_id", "user_id", "sport", "ntrp", "points", "location", "time")
+
+    def __init__(self, search_id, user_id, sport, ntrp, points, location, time):
+        self.search_id = search_id
+        self.user_id = user_id
+        self.sport = sport
+        self.ntrp = ntrp
+        self.points = points
+        self.location = location
+        self.time = time
+
+
+def score(a, b):
+    """Compatibility score of two candidates in [0, 1]."""
+    ntrp = max(0.0, 1 - abs(a.ntrp - b.ntrp) / NTRP_MAX_DISTANCE)
+    rating = max(0.0, 1 - abs(a.points - b.points) / RATING_MAX_DISTANCE)
+    return (
+        WEIGHT_NTRP * ntrp
+        + WEIGHT_LOCATION * _overlap(a.location, b.location)
+        + WEIGHT_TIME * _time_overlap(a.time, b.time)
+        + WEIGHT_RATING * rating
+    )
+
+
+class PartnerIndex:
+    """In-memory index of active partner searches."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._vocabulary = _TokenVocabulary()
+        self._candidates = {}
+        # sport -> ntrp -> {search_id: Candidate}
+        self._buckets = defaultdict(lambda: defaultdict(dict))
+        self._by_user = defaultdict(set)
+        self._loaded_at = None
+        self._synced_at = None
+        self._checked_at = 0.0
+
+    # Построение векторов
+
+    def _candidate_from_row(self, row):
+        try:
+            ntrp = float(row["skill_level"])
+        except (TypeError, ValueError):
+            ntrp = 3.0
+        return Candidate(
+            search_id=row["id"],
+            user_id=row["user_id"],
+            sport=row["sport_type"],
+            ntrp=ntrp,
+            points=row["user__player_rating__points"] or DEFAULT_POINTS,
+            location=self._vocabulary.mask(
+                row["preferred_location"], row["user__city"]
+            ),
+            time=row["time_slots"],
+        )
+
+    def _rows(self, queryset):
+        return queryset.values(
+            "id",
+            "user_id",
+            "sport_type",
+            "skill_level",
+            "time_slots",
+            "preferred_location",
+            "is_active",
+            "user__city",
+            "user__player_rating__points",
+        )
+
+    def _add(self, candidate):
+        self._discard(candidate.search_id)
+        self._candidates[candidate.search_id] = candidate
+        self._buckets[candidate.sport][candidate.ntrp][candidate.search_id] = candidate
+        self._by_user[candidate.user_id].add(candidate.search_id)
+
+    def _discard(self, search_id):
+        candidate = self._candidates.pop(search_id, None)
+        if candidate is None:
+            return
+        bucket = self._buckets[candidate.sport][candidate.ntrp]
+        bucket.pop(search_id, None)
+        if not bucket:
+            del self._buckets[candidate.sport][candidate.ntrp]
+        self._by_user[candidate.user_id].discard(search_id)
+
+    def _apply_rows(self, rows):
+        for row in rows:
+            if row["is_active"]:
+                self._add(self._candidate_from_row(row))
+            else:
+                self._discard(row["id"])
+
+    # Загрузка и синхронизация
+
+    def load(self):
+        """Rebuild the index from the database."""
+        started = time.perf_counter()
+        now = timezone.now()
+        with self._lock:
+            self._reset()
+            self._apply_rows(
+                self._rows(PartnerSearch.objects.filter(is_active=True)).iterator(
+                    chunk_size=2000
+                )
+            )
+            self._loaded_at = self._synced_at = now
+            self._checked_at = time.monotonic()
+        logger.info(
+            f"Partner index loaded: {len(self._candidates)} active searches "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+    def sync(self):
+        """Load searches, ratings and users changed since the last sync."""
+        now = timezone.now()
+        with self._lock:
+            since = self._synced_at
+            changed = PartnerSearch.objects.filter(updated_at__gte=since)
+            changed_users = set(
+                Rating.objects.filter(updated_at__gte=since).values_list(
+                    "user_id", flat=True
+                )
+            )
+            changed_users.update(
+                get_user_model()
+                .objects.filter(updated_at__gte=since)
+                .values_list("pk", flat=True)
+            )
+            self._apply_rows(self._rows(changed))
+            if changed_users:
+                self._apply_rows(
+                    self._rows(
+                        PartnerSearch.objects.filter(
+                            user_id__in=changed_users, is_active=True
+                        )
+                    )
+                )
+            self._synced_at = now
+            self._checked_at = time.monotonic()
+
+    def ensure_fresh(self):
+        """Reload or sync the index if it is older than the configured intervals."""
+        refresh_interval = getattr(settings, "PARTNER_MATCHING_REFRESH_INTERVAL", 5)
+        reload_interval = getattr(settings, "PARTNER_MATCHING_RELOAD_INTERVAL", 600)
+        with self._lock:
+            if self._loaded_at is None or (
+                (timezone.now() - self._loaded_at).total_seconds() > reload_interval
+            ):
+                self.load()
+            elif time.monotonic() - self._checked_at > refresh_interval:
+                self.sync()
+
+    def refresh_search(self, search):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._apply_rows(self._rows(PartnerSearch.objects.filter(pk=search.pk)))
+
+    def refresh_user(self, user_id):
+        with self._lock:
+            if self._loaded_at is None or not self._by_user.get(user_id):
+                return
+            self._apply_rows(
+                self._rows(
+                    PartnerSearch.objects.filter(user_id=user_id, is_active=True)
+                )
+            )
+
+    def remove_search(self, search_id):
+        with self._lock:
+            self._discard(search_id)
+
+    # Поиск
+
+    def top_k(self, search_id, k=10):
+        """Return [(search_id, score)] of the K best partners for a search."""
+        if k <= 0:
+            return []
+        self.ensure_fresh()
+        with self._lock:
+            target = self._candidates.get(search_id)
+            if target is None:
+                return []
+
+            buckets = self._buckets.get(target.sport, {})
+            # Корзины уровней NTRP от ближайшей к дальней
+            levels = sorted(buckets, key=lambda level: abs(level - target.ntrp))
+            best = []  # min-heap (score, search_id)
+            max_other = WEIGHT_LOCATION + WEIGHT_TIME + WEIGHT_RATING
+
+            for level in levels:
+                ntrp_score = max(0.0, 1 - abs(level - target.ntrp) / NTRP_MAX_DISTANCE)
+                upper_bound = WEIGHT_NTRP * ntrp_score + max_other
+                if len(best) >= k and upper_bound <= best[0][0]:
+                    break
+                for candidate in buckets[level].values():
+                    if candidate.user_id == target.user_id:
+                        continue
+                    value = score(target, candidate)
+                    if len(best) < k:
+                        heapq.heappush(best, (value, candidate.search_id))
+                    elif value > best[0][0]:
+                        heapq.heapreplace(best, (value, candidate.search_id))
+
+            return [
+                (sid, round(value, 3))
+                for value, sid in sorted(best, key=lambda item: (-item[0], item[1]))
+            ]
+
+
+partner_index = PartnerIndex()
+
+
+def recommend_partners(search, k=10):
+    """Return the K best matching active searches as PartnerSearch objects.
+
+    Each returned object has a ``match_score`` attribute in [0, 1].
+    """
+    ranked = partner_index.top_k(search.pk, k)
+    if not ranked:
+        return []
+    objects = PartnerSearch.objects.select_related(
+        "user", "user__player_rating"
+    ).in_bulk([sid for sid, _ in ranked])
+    result = []
+    for sid, value in ranked:
+        obj = objects.get(sid)
+        if obj is not None:
+            obj.match_score = value
+            result.append(obj)
+    return result
+
+
+@receiver(post_save, sender=PartnerSearch)
+def _partner_search_saved(sender, instance, **kwargs):
+    partner_index.refresh_search(instance)
+
+
+@receiver(post_delete, sender=PartnerSearch)
+def _partner_search_deleted(sender, instance, **kwargs):
+    partner_index.remove_search(instance.pk)
+
+
+@receiver(post_save, sender=Rating)
+def _rating_saved(sender, instance, **kwargs):
+    partner_index.refresh_user(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def _user_saved(sender, instance, **kwargs):
+    partner_index.refresh_user(instance.pk)
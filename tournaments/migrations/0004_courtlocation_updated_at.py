@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-19 07:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tournaments", "0003_ratinghistory"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="courtlocation",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Дата обновления"),
+        ),
+    ]
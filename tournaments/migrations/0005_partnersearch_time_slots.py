@@ -0,0 +1,132 @@
+# Generated by Django 5.0.14 on 2026-10-19 07:34
+
+import re
+
+from django.db import migrations, models
+
+# Копия разбора из tournaments.timeslots на момент миграции: историческая
+# миграция не должна меняться вместе с живым кодом
+
+PERIODS = 6
+PERIOD_HOURS = [(6, 9), (9, 12), (12, 15), (15, 18), (18, 21), (21, 24)]
+ALL_DAYS = frozenset(range(7))
+ALL_PERIODS = frozenset(range(PERIODS))
+ALL_SLOTS = (1 << (7 * PERIODS)) - 1
+
+DAY_PATTERNS = [
+    (r"будн|рабоч", {0, 1, 2, 3, 4}),
+    (r"выходн|уикенд", {5, 6}),
+    (r"ежедневн|каждый день|все дни|любой день", set(ALL_DAYS)),
+    (r"понедельн|\bпн\b", {0}),
+    (r"вторн|\bвт\b", {1}),
+    (r"\bсред[аыу]\b|\bср\b", {2}),
+    (r"четверг|\bчт\b", {3}),
+    (r"пятниц|\bпт\b", {4}),
+    (r"суббот|\bсб\b", {5}),
+    (r"воскресень|\bвс\b", {6}),
+]
+PERIOD_PATTERNS = [
+    (r"рано утром|ранн\w* утр", {0}),
+    (r"утр", {0, 1}),
+    (r"после обеда|послеобед", {3}),
+    (r"\bдн[её]м\b|\bдень\b|днев|обед", {2, 3}),
+    (r"поздн\w* вечер|поздно вечером|ноч", {5}),
+    (r"вечер", {4, 5}),
+]
+ANY_TIME_RE = re.compile(r"любое время|в любое|всегда|по договор|когда угодно")
+HOUR_RANGE_RE = re.compile(
+    r"(\d{1,2})(?:[:.]\d{2})?\s*(?:-|–|—|до)\s*(\d{1,2})(?:[:.]\d{2})?"
+)
+CLAUSE_SPLIT_RE = re.compile(r"[,;/\n]|\bили\b")
+
+
+def _parse_clause(clause):
+    days = set()
+    periods = set()
+    for pattern, values in DAY_PATTERNS:
+        if re.search(pattern, clause):
+            days |= values
+    matched_text = clause
+    for pattern, values in PERIOD_PATTERNS:
+        if re.search(pattern, matched_text):
+            periods |= values
+            matched_text = re.sub(pattern, " ", matched_text)
+    for start, end in HOUR_RANGE_RE.findall(clause):
+        start, end = int(start), int(end)
+        if start <= 24 and end <= 24:
+            if end <= start:
+                end = 24
+            periods |= {
+                index
+                for index, (period_start, period_end) in enumerate(PERIOD_HOURS)
+                if start < period_end and end > period_start
+            }
+    return days, periods
+
+
+def _slots_mask(days, periods):
+    mask = 0
+    for day in days:
+        for period in periods:
+            mask |= 1 << (day * PERIODS + period)
+    return mask
+
+
+def parse_time_slots(text):
+    text = (text or "").lower().replace("ё", "е")
+    if not text.strip() or ANY_TIME_RE.search(text):
+        return ALL_SLOTS
+
+    mask = 0
+    recognized = False
+    pending_days = set()
+    for clause in CLAUSE_SPLIT_RE.split(text):
+        days, periods = _parse_clause(clause)
+        if not days and not periods:
+            continue
+        recognized = True
+        if not periods:
+            pending_days |= days
+            continue
+        if not days and pending_days:
+            days = pending_days
+        elif pending_days:
+            days |= pending_days
+        pending_days = set()
+        mask |= _slots_mask(days or ALL_DAYS, periods)
+
+    if pending_days:
+        mask |= _slots_mask(pending_days, ALL_PERIODS)
+    return mask if recognized else ALL_SLOTS
+
+
+def backfill_time_slots(apps, schema_editor):
+    PartnerSearch = apps.get_model("tournaments", "PartnerSearch")
+    batch = []
+    for search in PartnerSearch.objects.only("id", "preferred_time").iterator(
+        chunk_size=1000
+    ):
+        search.time_slots = parse_time_slots(search.preferred_time)
+        batch.append(search)
+        if len(batch) >= 1000:
+            PartnerSearch.objects.bulk_update(batch, ["time_slots"])
+            batch = []
+    if batch:
+        PartnerSearch.objects.bulk_update(batch, ["time_slots"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tournaments", "0004_courtlocation_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="partnersearch",
+            name="time_slots",
+            field=models.BigIntegerField(
+                default=0, editable=False, verbose_name="Временные слоты"
+            ),
+        ),
+        migrations.RunPython(backfill_time_slots, migrations.RunPython.noop),
+    ]
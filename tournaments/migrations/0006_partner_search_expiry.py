@@ -0,0 +1,117 @@
+# Generated by Django 5.0.14 on 2026-10-19 07:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tournaments", "0005_partnersearch_time_slots"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PartnerSearchArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "original_id",
+                    models.BigIntegerField(unique=True, verbose_name="ID заявки"),
+                ),
+                (
+                    "sport_type",
+                    models.CharField(
+                        choices=[
+                            ("TENNIS", "Теннис"),
+                            ("TABLE_TENNIS", "Настольный теннис"),
+                            ("BADMINTON", "Бадминтон"),
+                            ("BEACH_TENNIS", "Пляжный теннис"),
+                            ("PADEL", "Падл-теннис"),
+                            ("SQUASH", "Сквош"),
+                            ("PICKLEBALL", "Пиклбол"),
+                        ],
+                        max_length=20,
+                        verbose_name="Вид спорта",
+                    ),
+                ),
+                (
+                    "skill_level",
+                    models.CharField(
+                        choices=[
+                            ("1.0", "1.0 - Начинающий"),
+                            ("1.5", "1.5"),
+                            ("2.0", "2.0"),
+                            ("2.5", "2.5"),
+                            ("3.0", "3.0 - Средний"),
+                            ("3.5", "3.5"),
+                            ("4.0", "4.0"),
+                            ("4.5", "4.5 - Продвинутый"),
+                            ("5.0", "5.0"),
+                            ("5.5", "5.5"),
+                            ("6.0", "6.0 - Профессионал"),
+                            ("6.5", "6.5"),
+                        ],
+                        max_length=5,
+                        verbose_name="Уровень игры (NTRP)",
+                    ),
+                ),
+                (
+                    "preferred_time",
+                    models.CharField(
+                        max_length=200, verbose_name="Предпочитаемое время"
+                    ),
+                ),
+                (
+                    "preferred_location",
+                    models.CharField(
+                        max_length=200, verbose_name="Предпочитаемое место"
+                    ),
+                ),
+                (
+                    "contact_info",
+                    models.TextField(blank=True, verbose_name="Контактная информация"),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Дата создания")),
+                ("updated_at", models.DateTimeField(verbose_name="Дата обновления")),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата архивации"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Архивная заявка на поиск партнера",
+                "verbose_name_plural": "Архив поиска партнеров",
+                "ordering": ["-archived_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="partnersearch",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-created_at"],
+                name="partnersearch_active_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="partnersearcharchive",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_partner_searches",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Пользователь",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-19 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tournaments", "0006_partner_search_expiry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="courtlocation",
+            name="geo_cell",
+            field=models.BigIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="Геоячейка",
+            ),
+        ),
+        migrations.AddField(
+            model_name="courtlocation",
+            name="latitude",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=6,
+                max_digits=9,
+                null=True,
+                verbose_name="Широта",
+            ),
+        ),
+        migrations.AddField(
+            model_name="courtlocation",
+            name="longitude",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=6,
+                max_digits=9,
+                null=True,
+                verbose_name="Долгота",
+            ),
+        ),
+    ]
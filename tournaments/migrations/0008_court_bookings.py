@@ -0,0 +1,255 @@
+# Generated by Django 5.0.14 on 2026-10-19 07:42
+
+import django.db.models.deletion
+from django.conf import settings
+from datetime import timedelta
+
+import re
+
+from django.db import migrations, models
+
+# Копия разбора из tournaments.schedule на момент миграции: историческая
+# миграция не должна меняться вместе с живым кодом
+
+MINUTES_PER_DAY = 24 * 60
+DEFAULT_WORKING_HOURS = "07:00 - 00:00"
+
+DAY_NAMES = [
+    (r"понедельн|\bпн\b", 0),
+    (r"вторн|\bвт\b", 1),
+    (r"\bсред[аыу]\b|\bср\b", 2),
+    (r"четверг|\bчт\b", 3),
+    (r"пятниц|\bпт\b", 4),
+    (r"суббот|\bсб\b", 5),
+    (r"воскресень|\bвс\b", 6),
+]
+DAY_GROUPS = [
+    (r"будн|рабоч", range(0, 5)),
+    (r"выходн\w* дн|выходные|уикенд", range(5, 7)),
+    (r"ежедневн|без выходных|все дни", range(0, 7)),
+]
+ROUND_THE_CLOCK_RE = re.compile(r"круглосуточн|24\s*/\s*7|24 часа")
+CLOSED_RE = re.compile(r"закрыт|выходной\b|не работа")
+TIME_RANGE_RE = re.compile(
+    r"(\d{1,2})(?:[:.](\d{2}))?\s*(?:-|–|—|до)\s*(\d{1,2})(?:[:.](\d{2}))?"
+)
+DAY_RANGE_RE = re.compile(r"([а-я]{2})\w*\s*[-–—]\s*([а-я]{2})\w*")
+SEGMENT_SPLIT_RE = re.compile(r"[,;\n]")
+SHORT_DAYS = {"пн": 0, "вт": 1, "ср": 2, "чт": 3, "пт": 4, "сб": 5, "вс": 6}
+
+# settings.MATCH_BOOKING_DURATION_MINUTES на момент миграции
+MATCH_BOOKING_DURATION_MINUTES = 90
+
+
+def _parse_days(segment):
+    days = set()
+    for match in DAY_RANGE_RE.finditer(segment):
+        first, last = SHORT_DAYS.get(match.group(1)), SHORT_DAYS.get(match.group(2))
+        if first is not None and last is not None:
+            days.update(
+                (first + offset) % 7 for offset in range((last - first) % 7 + 1)
+            )
+    for pattern, values in DAY_GROUPS:
+        if re.search(pattern, segment):
+            days.update(values)
+    for pattern, day in DAY_NAMES:
+        if re.search(pattern, segment):
+            days.add(day)
+    return days
+
+
+def _parse_intervals(segment):
+    intervals = []
+    for start_h, start_m, end_h, end_m in TIME_RANGE_RE.findall(segment):
+        start = int(start_h) * 60 + int(start_m or 0)
+        end = int(end_h) * 60 + int(end_m or 0)
+        if start > MINUTES_PER_DAY or end > MINUTES_PER_DAY:
+            continue
+        if end <= start:
+            end += MINUTES_PER_DAY
+        intervals.append((start, end))
+    return intervals
+
+
+def _merge(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def parse_working_hours(text):
+    text = (text or "").lower().replace("ё", "е")
+    week = [[] for _ in range(7)]
+    if ROUND_THE_CLOCK_RE.search(text):
+        return [[[0, MINUTES_PER_DAY]] for _ in range(7)]
+
+    recognized = False
+    pending_days = set()
+    for segment in SEGMENT_SPLIT_RE.split(text):
+        days = _parse_days(segment) | pending_days
+        intervals = _parse_intervals(segment)
+        if CLOSED_RE.search(segment) and days and not intervals:
+            recognized = True
+            pending_days = set()
+            continue
+        if not intervals:
+            pending_days = days
+            continue
+        recognized = True
+        pending_days = set()
+        for day in days or range(7):
+            for start, end in intervals:
+                week[day].append((start, min(end, MINUTES_PER_DAY)))
+                if end > MINUTES_PER_DAY:
+                    week[(day + 1) % 7].append((0, end - MINUTES_PER_DAY))
+
+    if not recognized:
+        return parse_working_hours(DEFAULT_WORKING_HOURS)
+    return [_merge(day) for day in week]
+
+
+def backfill_schedule(apps, schema_editor):
+    CourtLocation = apps.get_model("tournaments", "CourtLocation")
+    CourtBooking = apps.get_model("tournaments", "CourtBooking")
+    Match = apps.get_model("tournaments", "Match")
+
+    courts = list(CourtLocation.objects.only("id", "working_hours"))
+    for court in courts:
+        court.opening_hours = parse_working_hours(court.working_hours)
+    CourtLocation.objects.bulk_update(courts, ["opening_hours"], batch_size=500)
+
+    duration = timedelta(minutes=MATCH_BOOKING_DURATION_MINUTES)
+    matches = Match.objects.filter(
+        court_location__isnull=False, scheduled_date__isnull=False
+    ).only("id", "court_location_id", "scheduled_date", "status", "round")
+    CourtBooking.objects.bulk_create(
+        [
+            CourtBooking(
+                court_id=match.court_location_id,
+                match_id=match.pk,
+                start=match.scheduled_date,
+                end=match.scheduled_date + duration,
+                status="CANCELLED" if match.status == "CANCELLED" else "CONFIRMED",
+                note=f"Матч: {match.round}"[:200],
+            )
+            for match in matches.iterator(chunk_size=1000)
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tournaments", "0007_courtlocation_coordinates"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="courtlocation",
+            name="opening_hours",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                verbose_name="Расписание работы",
+            ),
+        ),
+        migrations.CreateModel(
+            name="CourtBooking",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.DateTimeField(verbose_name="Начало")),
+                ("end", models.DateTimeField(verbose_name="Окончание")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("CONFIRMED", "Подтверждено"),
+                            ("CANCELLED", "Отменено"),
+                        ],
+                        default="CONFIRMED",
+                        max_length=10,
+                        verbose_name="Статус",
+                    ),
+                ),
+                (
+                    "note",
+                    models.CharField(
+                        blank=True, max_length=200, verbose_name="Комментарий"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата создания"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Дата обновления"),
+                ),
+                (
+                    "booked_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="court_bookings",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Кто забронировал",
+                    ),
+                ),
+                (
+                    "court",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bookings",
+                        to="tournaments.courtlocation",
+                        verbose_name="Корт",
+                    ),
+                ),
+                (
+                    "match",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="court_booking",
+                        to="tournaments.match",
+                        verbose_name="Матч",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Бронирование корта",
+                "verbose_name_plural": "Бронирования кортов",
+                "ordering": ["start"],
+                "indexes": [
+                    models.Index(
+                        fields=["court", "start"], name="courtbooking_court_start_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="courtbooking",
+            constraint=models.CheckConstraint(
+                check=models.Q(("end__gt", models.F("start"))),
+                name="courtbooking_end_after_start",
+            ),
+        ),
+        migrations.RunPython(backfill_schedule, migrations.RunPython.noop),
+    ]
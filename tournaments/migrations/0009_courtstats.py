@@ -0,0 +1,62 @@
+# Generated by Django 5.0.14 on 2026-10-19 07:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tournaments", "0008_court_bookings"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourtStats",
+            fields=[
+                (
+                    "court",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="tournaments.courtlocation",
+                        verbose_name="Корт",
+                    ),
+                ),
+                (
+                    "matches_total",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Матчей проведено"
+                    ),
+                ),
+                (
+                    "matches_last_30_days",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Матчей за 30 дней"
+                    ),
+                ),
+                (
+                    "average_court_cost",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        verbose_name="Средняя стоимость корта",
+                    ),
+                ),
+                (
+                    "busiest_hours",
+                    models.JSONField(
+                        blank=True, default=list, verbose_name="Самые загруженные часы"
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField(verbose_name="Дата пересчета")),
+            ],
+            options={
+                "verbose_name": "Статистика корта",
+                "verbose_name_plural": "Статистика кортов",
+            },
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def analyze(apps, schema_editor):
+    # Новым индексам нужна статистика, иначе SQLite выбирает их по эвристике
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("ANALYZE")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tournaments", "0009_courtstats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="courtlocation",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["cost_per_hour"],
+                name="courtlocation_active_cost_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="courtlocation",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["region", "cost_per_hour"],
+                name="courtlocation_region_cost_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="match",
+            index=models.Index(
+                fields=["status", "-updated_at"], name="match_status_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="match",
+            index=models.Index(
+                fields=["tournament", "round", "scheduled_date"],
+                name="match_tournament_round_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="match",
+            index=models.Index(
+                fields=["-scheduled_date", "-created_at"], name="match_schedule_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="match",
+            index=models.Index(
+                fields=["status", "-scheduled_date", "-created_at"],
+                name="match_status_schedule_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="partnersearch",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["sport_type", "skill_level", "-created_at"],
+                name="partnersearch_filter_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["-points", "rank_position"], name="rating_points_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(fields=["rank_position"], name="rating_rank_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tournament",
+            index=models.Index(
+                fields=["status", "start_date", "end_date"],
+                name="tournament_status_dates_idx",
+            ),
+        ),
+        migrations.RunPython(analyze, migrations.RunPython.noop),
+    ]
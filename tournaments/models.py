@@ -1,7 +1,13 @@
 """Models for tournaments app."""
 
+from datetime import timedelta
+
 from django.db import models
 from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from . import geo, schedule
+from .timeslots import parse_time_slots
 
 
 class Tournament(models.Model):
@@ -101,6 +107,13 @@ class Tournament(models.Model):
         verbose_name = "Турнир"
         verbose_name_plural = "Турниры"
         ordering = ["-start_date"]
+        indexes = [
+            # Главная: предстоящие и идущие турниры по датам
+            models.Index(
+                fields=["status", "start_date", "end_date"],
+                name="tournament_status_dates_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
@@ -225,6 +238,25 @@ class Match(models.Model):
         verbose_name = "Матч"
         verbose_name_plural = "Матчи"
         ordering = ["scheduled_date", "round"]
+        indexes = [
+            # Последние результаты и число завершённых матчей на главной
+            models.Index(
+                fields=["status", "-updated_at"], name="match_status_updated_idx"
+            ),
+            # Сетка турнира: матчи по раундам и датам
+            models.Index(
+                fields=["tournament", "round", "scheduled_date"],
+                name="match_tournament_round_idx",
+            ),
+            # Список матчей: новые сверху, в том числе с фильтром по статусу
+            models.Index(
+                fields=["-scheduled_date", "-created_at"], name="match_schedule_idx"
+            ),
+            models.Index(
+                fields=["status", "-scheduled_date", "-created_at"],
+                name="match_status_schedule_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.player1.username} vs {self.player2.username}"
@@ -247,6 +279,40 @@ class Match(models.Model):
         """Check if both players confirmed the score."""
         return self.score_confirmed_by_player1 and self.score_confirmed_by_player2
 
+    @property
+    def booking_end(self):
+        """Planned end of the match used for the court booking."""
+        if not self.scheduled_date:
+            return None
+        return self.scheduled_date + timedelta(
+            minutes=settings.MATCH_BOOKING_DURATION_MINUTES
+        )
+
+    def clean(self):
+        super().clean()
+        if not (self.court_location_id and self.scheduled_date):
+            return
+        if self.status == "CANCELLED":
+            return
+        court = self.court_location
+        if not schedule.is_open(court, self.scheduled_date, self.booking_end):
+            raise ValidationError(
+                {"scheduled_date": f"Корт работает: {court.working_hours}"}
+            )
+        if self.booking_conflicts().exists():
+            raise ValidationError(
+                {"scheduled_date": "Корт уже забронирован на это время"}
+            )
+
+    def booking_conflicts(self):
+        """Confirmed bookings of other events on the match court and time."""
+        conflicts = CourtBooking.objects.filter(
+            court_id=self.court_location_id
+        ).overlapping(self.scheduled_date, self.booking_end)
+        if self.pk:
+            conflicts = conflicts.exclude(match=self)
+        return conflicts
+
 
 class CourtLocation(models.Model):
     """Tennis court location model."""
@@ -270,22 +336,108 @@ class CourtLocation(models.Model):
     working_hours = models.CharField(
         "Часы работы", max_length=100, default="07:00 - 00:00"
     )
+    # Часы работы по дням недели, см. tournaments/schedule.py
+    opening_hours = models.JSONField(
+        "Расписание работы", default=list, blank=True, editable=False
+    )
     facilities = models.TextField(
         "Удобства", blank=True, help_text="Раздевалки, душ, парковка и т.д."
     )
+    latitude = models.DecimalField(
+        "Широта", max_digits=9, decimal_places=6, null=True, blank=True
+    )
+    longitude = models.DecimalField(
+        "Долгота", max_digits=9, decimal_places=6, null=True, blank=True
+    )
+    # Ячейка пространственного индекса, см. tournaments/geo.py
+    geo_cell = models.BigIntegerField(
+        "Геоячейка", null=True, blank=True, editable=False, db_index=True
+    )
     has_indoor = models.BooleanField("Крытый корт", default=False)
     has_outdoor = models.BooleanField("Открытый корт", default=True)
     is_active = models.BooleanField("Активен", default=True)
     created_at = models.DateTimeField("Дата создания", auto_now_add=True)
+    updated_at = models.DateTimeField("Дата обновления", auto_now=True)
 
     class Meta:
         verbose_name = "Корт"
         verbose_name_plural = "Корты"
         ordering = ["city", "region", "name"]
+        indexes = [
+            # Список кортов: только активные, по цене и с фильтром по региону
+            models.Index(
+                fields=["cost_per_hour"],
+                condition=models.Q(is_active=True),
+                name="courtlocation_active_cost_idx",
+            ),
+            models.Index(
+                fields=["region", "cost_per_hour"],
+                condition=models.Q(is_active=True),
+                name="courtlocation_region_cost_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.region}) - {self.cost_per_hour} ₽/час"
 
+    @property
+    def has_coordinates(self):
+        return self.latitude is not None and self.longitude is not None
+
+    def save(self, *args, **kwargs):
+        self.geo_cell = (
+            geo.encode(self.latitude, self.longitude) if self.has_coordinates else None
+        )
+        self.opening_hours = schedule.parse_working_hours(self.working_hours)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if {"latitude", "longitude"} & update_fields:
+                update_fields.add("geo_cell")
+            if "working_hours" in update_fields:
+                update_fields.add("opening_hours")
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
+
+class CourtStats(models.Model):
+    """Usage statistics of a court, refreshed by ``refresh_court_stats``."""
+
+    court = models.OneToOneField(
+        CourtLocation,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name="Корт",
+    )
+    matches_total = models.PositiveIntegerField("Матчей проведено", default=0)
+    matches_last_30_days = models.PositiveIntegerField("Матчей за 30 дней", default=0)
+    average_court_cost = models.DecimalField(
+        "Средняя стоимость корта",
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+    )
+    # [[час, число матчей], ...] по убыванию загрузки
+    busiest_hours = models.JSONField("Самые загруженные часы", default=list, blank=True)
+    refreshed_at = models.DateTimeField("Дата пересчета")
+
+    class Meta:
+        verbose_name = "Статистика корта"
+        verbose_name_plural = "Статистика кортов"
+
+    def __str__(self):
+        return f"{self.court.name}: {self.matches_total} матчей"
+
+    @property
+    def popularity(self):
+        if self.matches_total > 10:
+            return "Высокая"
+        if self.matches_total > 5:
+            return "Средняя"
+        return "Новый"
+
 
 class PartnerSearch(models.Model):
     """Partner search model for finding tennis partners."""
@@ -332,6 +484,8 @@ class PartnerSearch(models.Model):
         max_length=200,
         help_text="Например: будни вечером, выходные днем",
     )
+    # Битовая маска 7 дней x 6 периодов, см. tournaments/timeslots.py
+    time_slots = models.BigIntegerField("Временные слоты", default=0, editable=False)
     preferred_location = models.CharField(
         "Предпочитаемое место", max_length=200, help_text="Район или название корта"
     )
@@ -344,10 +498,81 @@ class PartnerSearch(models.Model):
         verbose_name = "Поиск партнера"
         verbose_name_plural = "Поиск партнеров"
         ordering = ["-created_at"]
+        indexes = [
+            # Список заявок читает только активные строки
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(is_active=True),
+                name="partnersearch_active_idx",
+            ),
+            # Фильтр списка по виду спорта и уровню
+            models.Index(
+                fields=["sport_type", "skill_level", "-created_at"],
+                condition=models.Q(is_active=True),
+                name="partnersearch_filter_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.get_sport_type_display()} ({self.skill_level})"
 
+    def save(self, *args, **kwargs):
+        self.time_slots = parse_time_slots(self.preferred_time)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "preferred_time" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "time_slots"}
+        super().save(*args, **kwargs)
+
+
+class PartnerSearchArchive(models.Model):
+    """Expired partner search moved out of the active table."""
+
+    original_id = models.BigIntegerField("ID заявки", unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_partner_searches",
+        verbose_name="Пользователь",
+    )
+    sport_type = models.CharField(
+        "Вид спорта", max_length=20, choices=PartnerSearch.SPORT_CHOICES
+    )
+    skill_level = models.CharField(
+        "Уровень игры (NTRP)", max_length=5, choices=PartnerSearch.LEVEL_CHOICES
+    )
+    preferred_time = models.CharField("Предпочитаемое время", max_length=200)
+    preferred_location = models.CharField("Предпочитаемое место", max_length=200)
+    contact_info = models.TextField("Контактная информация", blank=True)
+    created_at = models.DateTimeField("Дата создания")
+    updated_at = models.DateTimeField("Дата обновления")
+    archived_at = models.DateTimeField("Дата архивации", auto_now_add=True)
+
+    ARCHIVED_FIELDS = [
+        "user_id",
+        "sport_type",
+        "skill_level",
+        "preferred_time",
+        "preferred_location",
+        "contact_info",
+        "created_at",
+        "updated_at",
+    ]
+
+    class Meta:
+        verbose_name = "Архивная заявка на поиск партнера"
+        verbose_name_plural = "Архив поиска партнеров"
+        ordering = ["-archived_at"]
+
+    def __str__(self):
+        return f"{self.user} - {self.get_sport_type_display()} (архив)"
+
+    @classmethod
+    def from_search(cls, search):
+        return cls(
+            original_id=search.pk,
+            **{field: getattr(search, field) for field in cls.ARCHIVED_FIELDS},
+        )
+
 
 class Rating(models.Model):
     """Player rating model."""
@@ -370,6 +595,11 @@ class Rating(models.Model):
         verbose_name = "Рейтинг"
         verbose_name_plural = "Рейтинги"
         ordering = ["-points", "rank_position"]
+        indexes = [
+            # Таблица рейтинга и топ-10 на главной
+            models.Index(fields=["-points", "rank_position"], name="rating_points_idx"),
+            models.Index(fields=["rank_position"], name="rating_rank_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.points} очков (NTRP {self.ntrp_level})"
@@ -469,3 +699,112 @@ class RatingHistory(models.Model):
     def __str__(self):
         change_str = f"+{self.change}" if self.change > 0 else str(self.change)
         return f"{self.user.username} - {self.points} ({change_str})"
+
+
+class CourtBookingQuerySet(models.QuerySet):
+    """Query helpers for court bookings."""
+
+    def overlapping(self, start, end):
+        """Confirmed bookings that intersect [start, end).
+
+        Bookings are never longer than COURT_BOOKING_MAX_HOURS, so an
+        overlapping booking starts in [start - max, end). The bounded range
+        on ``start`` turns the check into a short scan of the (court, start)
+        index instead of reading every earlier booking of the court.
+        """
+        max_duration = timedelta(hours=settings.COURT_BOOKING_MAX_HOURS)
+        return self.filter(
+            status=CourtBooking.STATUS_CONFIRMED,
+            start__gte=start - max_duration,
+            start__lt=end,
+            end__gt=start,
+        )
+
+
+class CourtBooking(models.Model):
+    """Time interval for which a court is reserved."""
+
+    STATUS_CONFIRMED = "CONFIRMED"
+    STATUS_CANCELLED = "CANCELLED"
+    STATUS_CHOICES = [
+        (STATUS_CONFIRMED, "Подтверждено"),
+        (STATUS_CANCELLED, "Отменено"),
+    ]
+
+    court = models.ForeignKey(
+        CourtLocation,
+        on_delete=models.CASCADE,
+        related_name="bookings",
+        verbose_name="Корт",
+    )
+    match = models.OneToOneField(
+        Match,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="court_booking",
+        verbose_name="Матч",
+    )
+    booked_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="court_bookings",
+        verbose_name="Кто забронировал",
+    )
+    start = models.DateTimeField("Начало")
+    end = models.DateTimeField("Окончание")
+    status = models.CharField(
+        "Статус", max_length=10, choices=STATUS_CHOICES, default=STATUS_CONFIRMED
+    )
+    note = models.CharField("Комментарий", max_length=200, blank=True)
+    created_at = models.DateTimeField("Дата создания", auto_now_add=True)
+    updated_at = models.DateTimeField("Дата обновления", auto_now=True)
+
+    objects = CourtBookingQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Бронирование корта"
+        verbose_name_plural = "Бронирования кортов"
+        ordering = ["start"]
+        indexes = [
+            models.Index(
+                fields=["court", "start"], name="courtbooking_court_start_idx"
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(end__gt=models.F("start")),
+                name="courtbooking_end_after_start",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.court.name}: {self.start:%d.%m.%Y %H:%M}-{self.end:%H:%M}"
+
+    def clean(self):
+        super().clean()
+        if not (self.start and self.end and self.court_id):
+            return
+        if self.end <= self.start:
+            raise ValidationError({"end": "Окончание должно быть позже начала"})
+        if self.end - self.start > timedelta(hours=settings.COURT_BOOKING_MAX_HOURS):
+            raise ValidationError(
+                {
+                    "end": f"Бронь не может быть длиннее {settings.COURT_BOOKING_MAX_HOURS} ч"
+                }
+            )
+        if self.status != self.STATUS_CONFIRMED:
+            return
+        if not schedule.is_open(self.court, self.start, self.end):
+            raise ValidationError(
+                {"start": f"Корт работает: {self.court.working_hours}"}
+            )
+        conflicts = CourtBooking.objects.filter(court_id=self.court_id).overlapping(
+            self.start, self.end
+        )
+        if self.pk:
+            conflicts = conflicts.exclude(pk=self.pk)
+        if conflicts.exists():
+            raise ValidationError("Корт уже забронирован на это время")
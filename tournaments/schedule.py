@@ -0,0 +1,197 @@
+"""Court opening hours and free booking slots.
+
+``CourtLocation.working_hours`` is free text ("07:00 - 00:00",
+"Пн-Пт 7:00-23:00, Сб-Вс 9:00-22:00", "круглосуточно"). It is parsed
+into opening intervals stored in ``CourtLocation.opening_hours`` as
+seven lists (Monday first) of ``[start, end]`` minutes since midnight.
+
+Free slots for a period are computed from the opening intervals minus
+the court bookings loaded with a single range query.
+"""
+import re
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+MINUTES_PER_DAY = 24 * 60
+DEFAULT_WORKING_HOURS = "07:00 - 00:00"
+
+DAY_NAMES = [
+    (r"понедельн|\bпн\b", 0),
+    (r"вторн|\bвт\b", 1),
+    (r"\bсред(?:а|ы|у|ам)\b|\bср\b", 2),
+    (r"четверг|\bчт\b", 3),
+    (r"пятниц|\bпт\b", 4),
+    (r"суббот|\bсб\b", 5),
+    (r"воскресень|\bвс\b", 6),
+]
+DAY_GROUPS = [
+    (r"будн|рабоч", range(0, 5)),
+    (r"выходн\w* дн|выходные|уикенд", range(5, 7)),
+    (r"ежедневн|без выходных|все дни", range(0, 7)),
+]
+ROUND_THE_CLOCK_RE = re.compile(r"круглосуточн|24\s*/\s*7|24 часа")
+CLOSED_RE = re.compile(r"закрыт|выходной\b|не работа")
+TIME_RANGE_RE = re.compile(
+    r"(\d{1,2})(?:[:.](\d{2}))?\s*(?:-|–|—|до)\s*(\d{1,2})(?:[:.](\d{2}))?"
+)
+DAY_RANGE_RE = re.compile(r"([а-я]{2})\w*\s*[-–—]\s*([а-я]{2})\w*")
+SEGMENT_SPLIT_RE = re.compile(r"[,;\n]")
+
+_SHORT_DAYS = {"пн": 0, "вт": 1, "ср": 2, "чт": 3, "пт": 4, "сб": 5, "вс": 6}
+
+
+def _parse_days(segment):
+    days = set()
+    for match in DAY_RANGE_RE.finditer(segment):
+        first, last = _SHORT_DAYS.get(match.group(1)), _SHORT_DAYS.get(match.group(2))
+        if first is not None and last is not None:
+            # Диапазон может переходить через воскресенье ("пт-пн")
+            days.update(
+                (first + offset) % 7 for offset in range((last - first) % 7 + 1)
+            )
+    for pattern, values in DAY_GROUPS:
+        if re.search(pattern, segment):
+            days.update(values)
+    for pattern, day in DAY_NAMES:
+        if re.search(pattern, segment):
+            days.add(day)
+    return days
+
+
+def _parse_intervals(segment):
+    intervals = []
+    for start_h, start_m, end_h, end_m in TIME_RANGE_RE.findall(segment):
+        start = int(start_h) * 60 + int(start_m or 0)
+        end = int(end_h) * 60 + int(end_m or 0)
+        if start > MINUTES_PER_DAY or end > MINUTES_PER_DAY:
+            continue
+        if end <= start:
+            # "07:00 - 00:00" и ночные интервалы заканчиваются на следующие сутки
+            end += MINUTES_PER_DAY
+        intervals.append((start, end))
+    return intervals
+
+
+def _merge(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def parse_working_hours(text):
+    """Parse ``working_hours`` into 7 lists of ``[start, end]`` minutes.
+
+    Days listed without hours take the hours of the next segment
+    ("сб, вс 9:00-22:00"); hours without days apply to the whole week.
+    Unrecognized text falls back to ``DEFAULT_WORKING_HOURS``.
+    """
+    text = (text or "").lower().replace("ё", "е")
+    week = [[] for _ in range(7)]
+    if ROUND_THE_CLOCK_RE.search(text):
+        return [[[0, MINUTES_PER_DAY]] for _ in range(7)]
+
+    recognized = False
+    pending_days = set()
+    for segment in SEGMENT_SPLIT_RE.split(text):
+        days = _parse_days(segment) | pending_days
+        intervals = _parse_intervals(segment)
+        if CLOSED_RE.search(segment) and days and not intervals:
+            recognized = True
+            pending_days = set()
+            continue
+        if not intervals:
+            pending_days = days
+            continue
+        recognized = True
+        pending_days = set()
+        for day in days or range(7):
+            for start, end in intervals:
+                week[day].append((start, min(end, MINUTES_PER_DAY)))
+                if end > MINUTES_PER_DAY:
+                    week[(day + 1) % 7].append((0, end - MINUTES_PER_DAY))
+
+    if not recognized:
+        return parse_working_hours(DEFAULT_WORKING_HOURS)
+    return [_merge(day) for day in week]
+
+
+def opening_intervals(court, day):
+    """Return aware (start, end) datetimes when ``court`` is open on ``day``."""
+    tz = timezone.get_current_timezone()
+    hours = court.opening_hours or parse_working_hours(court.working_hours)
+    midnight = timezone.make_aware(datetime.combine(day, time.min), tz)
+    return [
+        (midnight + timedelta(minutes=start), midnight + timedelta(minutes=end))
+        for start, end in hours[day.weekday()]
+    ]
+
+
+def is_open(court, start, end):
+    """Check that the whole [start, end) interval falls into opening hours."""
+    start, end = timezone.localtime(start), timezone.localtime(end)
+    day = start.date()
+    # Интервалы соседних суток склеиваются, если корт работает после полуночи
+    intervals = _merge(
+        opening_intervals(court, day)
+        + opening_intervals(court, day + timedelta(days=1))
+    )
+    return any(
+        open_start <= start and end <= open_end for open_start, open_end in intervals
+    )
+
+
+def free_slots(
+    court,
+    first_day,
+    days=7,
+    duration=timedelta(hours=1),
+    step=timedelta(minutes=30),
+    now=None,
+):
+    """Return ``[(day, [slot_start, ...]), ...]`` of free slots of ``duration``.
+
+    Slot starts are aligned to ``step`` within each opening interval;
+    slots in the past are skipped.
+    """
+    now = now or timezone.now()
+    tz = timezone.get_current_timezone()
+    period = [first_day + timedelta(days=offset) for offset in range(days)]
+    busy = list(
+        court.bookings.overlapping(
+            timezone.make_aware(datetime.combine(period[0], time.min), tz),
+            timezone.make_aware(
+                datetime.combine(period[-1] + timedelta(days=1), time.min), tz
+            ),
+        )
+        .order_by("start")
+        .values_list("start", "end")
+    )
+
+    result = []
+    index = 0  # первая бронь, которая может пересекаться с текущим слотом
+    for day in period:
+        starts = []
+        for open_start, open_end in opening_intervals(court, day):
+            slot = open_start
+            while slot + duration <= open_end:
+                slot_end = slot + duration
+                while index < len(busy) and busy[index][1] <= slot:
+                    index += 1
+                taken = False
+                for position in range(index, len(busy)):
+                    busy_start, busy_end = busy[position]
+                    if busy_start >= slot_end:
+                        break
+                    if busy_end > slot:
+                        taken = True
+                        break
+                if not taken and slot >= now:
+                    starts.append(slot)
+                slot += step
+        result.append((day, starts))
+    return result
@@ -0,0 +1,58 @@
+"""Keep court bookings and feeds in sync with tournaments and matches."""
+from django.core.exceptions import ValidationError
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from .models import CourtBooking, Match
+
+
+@receiver(pre_save, sender=Match)
+def check_match_booking(sender, instance, raw=False, **kwargs):
+    """Refuse to save a match that double-books its court.
+
+    ``Match.clean`` reports the same conflict in forms; this covers saves
+    that skip validation. A match whose booking does not move is not
+    checked again.
+    """
+    if raw or instance.status == "CANCELLED":
+        return
+    if not (instance.court_location_id and instance.scheduled_date):
+        return
+    if instance.pk:
+        unchanged = CourtBooking.objects.filter(
+            match_id=instance.pk,
+            court_id=instance.court_location_id,
+            start=instance.scheduled_date,
+            end=instance.booking_end,
+            status=CourtBooking.STATUS_CONFIRMED,
+        )
+        if unchanged.exists():
+            return
+    if instance.booking_conflicts().exists():
+        raise ValidationError({"scheduled_date": "Корт уже забронирован на это время"})
+
+
+@receiver(post_save, sender=Match)
+def sync_match_booking(sender, instance, raw=False, **kwargs):
+    """Book the match court for ``MATCH_BOOKING_DURATION_MINUTES``."""
+    if raw:
+        return
+    if not (instance.court_location_id and instance.scheduled_date):
+        CourtBooking.objects.filter(match=instance).delete()
+        return
+
+    status = (
+        CourtBooking.STATUS_CANCELLED
+        if instance.status == "CANCELLED"
+        else CourtBooking.STATUS_CONFIRMED
+    )
+    CourtBooking.objects.update_or_create(
+        match=instance,
+        defaults={
+            "court_id": instance.court_location_id,
+            "start": instance.scheduled_date,
+            "end": instance.booking_end,
+            "status": status,
+            "note": f"Матч: {instance.round}"[:200],
+        },
+    )
@@ -0,0 +1,141 @@
+"""Weekly availability as a bitmask of time slots.
+
+The week is split into 7 days x 6 periods; slot ``day * 6 + period`` is one
+bit of a 42-bit integer::
+
+    0 - раннее утро (06-09)   3 - после обеда (15-18)
+    1 - утро        (09-12)   4 - вечер       (18-21)
+    2 - день        (12-15)   5 - поздний вечер (21-24)
+
+``parse_time_slots("будни вечером, выходные днем")`` turns the free-text
+``PartnerSearch.preferred_time`` into such a mask, so availability can be
+compared with a bitwise AND in the database or in Python.
+"""
+import re
+
+from django.db.models import F
+
+DAYS = 7
+PERIODS = 6
+PERIOD_HOURS = [(6, 9), (9, 12), (12, 15), (15, 18), (18, 21), (21, 24)]
+
+ALL_DAYS = frozenset(range(DAYS))
+ALL_PERIODS = frozenset(range(PERIODS))
+ALL_SLOTS = (1 << (DAYS * PERIODS)) - 1
+
+# Основы слов -> дни недели (0 - понедельник)
+DAY_PATTERNS = [
+    (r"будн|рабоч", {0, 1, 2, 3, 4}),
+    (r"выходн|уикенд", {5, 6}),
+    (r"ежедневн|каждый день|все дни|любой день", set(ALL_DAYS)),
+    (r"понедельн|\bпн\b", {0}),
+    (r"вторн|\bвт\b", {1}),
+    (r"\bсред(?:а|ы|у|ам)\b|\bср\b", {2}),
+    (r"четверг|\bчт\b", {3}),
+    (r"пятниц|\bпт\b", {4}),
+    (r"суббот|\bсб\b", {5}),
+    (r"воскресень|\bвс\b", {6}),
+]
+
+# Основы слов -> периоды дня
+PERIOD_PATTERNS = [
+    (r"рано утром|ранн\w* утр", {0}),
+    (r"утр", {0, 1}),
+    (r"после обеда|послеобед", {3}),
+    (r"\bдн[её]м\b|\bдень\b|днев|обед", {2, 3}),
+    (r"поздн\w* вечер|поздно вечером|ноч", {5}),
+    (r"вечер", {4, 5}),
+]
+
+ANY_TIME_RE = re.compile(r"любое время|в любое|всегда|по договор|когда угодно")
+HOUR_RANGE_RE = re.compile(
+    r"(\d{1,2})(?:[:.]\d{2})?\s*(?:-|–|—|до)\s*(\d{1,2})(?:[:.]\d{2})?"
+)
+CLAUSE_SPLIT_RE = re.compile(r"[,;/\n]|\bили\b")
+
+
+def _periods_for_hours(start, end):
+    if end <= start:
+        end = 24
+    return {
+        index
+        for index, (period_start, period_end) in enumerate(PERIOD_HOURS)
+        if start < period_end and end > period_start
+    }
+
+
+def _parse_clause(clause):
+    """Return (days, periods) mentioned in one clause of the text."""
+    days = set()
+    periods = set()
+    for pattern, values in DAY_PATTERNS:
+        if re.search(pattern, clause):
+            days |= values
+    matched_text = clause
+    for pattern, values in PERIOD_PATTERNS:
+        if re.search(pattern, matched_text):
+            periods |= values
+            # "поздно вечером" не должно ещё раз сработать как просто "вечер"
+            matched_text = re.sub(pattern, " ", matched_text)
+    for start, end in HOUR_RANGE_RE.findall(clause):
+        start, end = int(start), int(end)
+        if start <= 24 and end <= 24:
+            periods |= _periods_for_hours(start, end)
+    return days, periods
+
+
+def slots_mask(days, periods):
+    """Build a mask from iterables of day and period indexes."""
+    mask = 0
+    for day in days:
+        for period in periods:
+            mask |= 1 << (day * PERIODS + period)
+    return mask
+
+
+def parse_time_slots(text):
+    """Convert a free-text availability description into a slot bitmask.
+
+    Clauses are separated by commas. Days listed without a time of day
+    take the time of the next clause ("пн, ср вечером"); a time without
+    days applies to the whole week.
+    Text that mentions neither (or says "любое время") means any time.
+    """
+    text = (text or "").lower().replace("ё", "е")
+    if not text.strip() or ANY_TIME_RE.search(text):
+        return ALL_SLOTS
+
+    mask = 0
+    recognized = False
+    # Дни без времени ("пн, ср с 18 до 21") относятся к следующему времени
+    pending_days = set()
+    for clause in CLAUSE_SPLIT_RE.split(text):
+        days, periods = _parse_clause(clause)
+        if not days and not periods:
+            continue
+        recognized = True
+        if not periods:
+            pending_days |= days
+            continue
+        if not days and pending_days:
+            days = pending_days
+        elif pending_days:
+            days |= pending_days
+        pending_days = set()
+        mask |= slots_mask(days or ALL_DAYS, periods)
+
+    if pending_days:
+        mask |= slots_mask(pending_days, ALL_PERIODS)
+    return mask if recognized else ALL_SLOTS
+
+
+def slot_count(mask):
+    """Number of slots set in a mask."""
+    return mask.bit_count()
+
+
+def filter_overlapping(queryset, mask, field="time_slots"):
+    """Restrict a queryset to rows whose slots intersect ``mask``."""
+    return queryset.alias(_slots_overlap=F(field).bitand(mask)).filter(
+        _slots_overlap__gt=0
+    )
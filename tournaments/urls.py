@@ -1,5 +1,6 @@
 """URL patterns for tournaments app."""
-from django.urls import path
+from django.urls import path, re_path
+from .feeds import MatchResultFeed, TournamentFeed
 from .views import (
     HomeView,
     TournamentListView,
@@ -12,6 +13,9 @@ from .views import (
     CourtLocationDetailView,
     PartnerSearchListView,
     PartnerSearchCreateView,
+    partner_search_matches,
+    courts_nearby,
+    court_free_slots,
     RatingListView,
     my_games_view,
     submit_match_result,
@@ -21,6 +25,11 @@ from .views import (
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
     path("tournaments/", TournamentListView.as_view(), name="tournament_list"),
+    re_path(
+        r"^tournaments/feed/(?P<fmt>rss|atom|json)/$",
+        TournamentFeed.as_view(),
+        name="tournament_feed",
+    ),
     path(
         "tournaments/<int:pk>/", TournamentDetailView.as_view(), name="tournament_detail"
     ),
@@ -35,16 +44,28 @@ urlpatterns = [
         name="tournament_draw",
     ),
     path("matches/", MatchListView.as_view(), name="match_list"),
+    re_path(
+        r"^matches/results/feed/(?P<fmt>rss|atom|json)/$",
+        MatchResultFeed.as_view(),
+        name="match_result_feed",
+    ),
     path("matches/<int:pk>/", MatchDetailView.as_view(), name="match_detail"),
     path("matches/<int:pk>/submit-result/", submit_match_result, name="match_submit_result"),
     
     # Корты
     path("courts/", CourtLocationListView.as_view(), name="court_list"),
+    path("courts/nearby/", courts_nearby, name="courts_nearby"),
     path("courts/<int:pk>/", CourtLocationDetailView.as_view(), name="court_detail"),
+    path("courts/<int:pk>/slots/", court_free_slots, name="court_free_slots"),
     
     # Поиск партнера
     path("partner-search/", PartnerSearchListView.as_view(), name="partner_search_list"),
     path("partner-search/create/", PartnerSearchCreateView.as_view(), name="partner_search_create"),
+    path(
+        "partner-search/<int:pk>/matches/",
+        partner_search_matches,
+        name="partner_search_matches",
+    ),
     
     # Рейтинг
     path("rating/", RatingListView.as_view(), name="rating_list"),
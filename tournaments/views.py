@@ -1,18 +1,29 @@
 """Views for tournaments app."""
 
 from typing import Any
+import math
 import random
+from datetime import date, timedelta
 from decimal import Decimal
 
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.generic import ListView, DetailView, CreateView
-from django.db.models import Q, Count, Case, When, IntegerField
+from django.db.models import Q, Count, Case, When, IntegerField, Max
 from django.contrib import messages
-from django.urls import reverse_lazy
+from django.conf import settings
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
 from loguru import logger
 
+from monitoring.metrics import RATING_RECOMPUTE_DURATION
+from monitoring.profiling import recent_profiles
+from tennis_league.mixins import ConditionalGetMixin
+
+from . import geo, schedule
+from .matching import recommend_partners
+from .timeslots import filter_overlapping, parse_time_slots
 from .models import (
     Tournament,
     Match,
@@ -124,7 +135,11 @@ class TournamentListView(ListView):
     paginate_by = 10
 
     def get_queryset(self):
-        queryset = Tournament.objects.all()
+        # Число участников одним запросом, а не COUNT на каждую карточку
+        # (с GROUP BY Meta.ordering не применяется - порядок задан явно)
+        queryset = Tournament.objects.annotate(
+            participants_count=Count("participants")
+        ).order_by("-start_date")
         category = self.request.GET.get("category")
         status = self.request.GET.get("status")
 
@@ -136,13 +151,36 @@ class TournamentListView(ListView):
         return queryset
 
 
-class TournamentDetailView(DetailView):
+class TournamentDetailView(ConditionalGetMixin, DetailView):
     """View for tournament details with bracket and draw logic."""
 
     model = Tournament
     template_name = "tournaments/tournament_detail.html"
     context_object_name = "tournament"
 
+    def get_conditional_timestamps(self):
+        tournament = self.object
+        self._matches_state = tournament.matches.aggregate(
+            last=Max("updated_at"), total=Count("id")
+        )
+        # Карточки участников показывают фото, имя и рейтинг игрока
+        self._participants_state = tournament.participants.aggregate(
+            last=Max("registered_at"),
+            last_user=Max("user__updated_at"),
+            last_rating=Max("user__player_rating__updated_at"),
+            total=Count("id"),
+        )
+        return [
+            tournament.updated_at,
+            self._matches_state["last"],
+            self._participants_state["last"],
+            self._participants_state["last_user"],
+            self._participants_state["last_rating"],
+        ]
+
+    def get_conditional_extra(self):
+        return [self._matches_state["total"], self._participants_state["total"]]
+
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         tournament = self.object
@@ -297,13 +335,34 @@ class MatchListView(ListView):
         return context
 
 
-class MatchDetailView(DetailView):
+class MatchDetailView(ConditionalGetMixin, DetailView):
     """View for match details."""
 
     model = Match
     template_name = "tournaments/match_detail.html"
     context_object_name = "match"
 
+    def get_queryset(self):
+        return Match.objects.select_related(
+            "tournament",
+            "court_location",
+            "winner",
+            "player1__player_rating",
+            "player2__player_rating",
+        )
+
+    def get_conditional_timestamps(self):
+        match = self.object
+        timestamps = [match.updated_at, match.tournament.updated_at]
+        for player in (match.player1, match.player2):
+            timestamps.append(player.updated_at)
+            rating = getattr(player, "player_rating", None)
+            if rating is not None:
+                timestamps.append(rating.updated_at)
+        if match.court_location:
+            timestamps.append(match.court_location.updated_at)
+        return timestamps
+
 
 # Новые views для функционала tennis-play.com
 
@@ -317,7 +376,7 @@ class CourtLocationListView(ListView):
     paginate_by = 12
 
     def get_queryset(self):
-        queryset = CourtLocation.objects.filter(is_active=True)
+        queryset = CourtLocation.objects.filter(is_active=True).select_related("stats")
 
         # Фильтрация
         region = self.request.GET.get("region")
@@ -334,21 +393,142 @@ class CourtLocationListView(ListView):
             except ValueError:
                 pass
 
+        # Корты рядом с точкой near=lat,lon, по возрастанию расстояния
+        self.near = geo.parse_point(self.request.GET.get("near"))
+        if self.near:
+            return geo.within_radius(queryset, *self.near, _radius_km(self.request))
+
         return queryset.order_by("cost_per_hour")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["region_choices"] = CourtLocation.REGION_CHOICES
+        context["near"] = self.near
         return context
 
 
-class CourtLocationDetailView(DetailView):
+def _radius_km(request):
+    try:
+        radius = float(request.GET.get("radius", settings.COURTS_NEAR_RADIUS_KM))
+    except ValueError:
+        radius = settings.COURTS_NEAR_RADIUS_KM
+    # float() принимает "nan" и "inf", а nan проходит через min/max
+    if not math.isfinite(radius):
+        radius = settings.COURTS_NEAR_RADIUS_KM
+    return min(max(radius, 0.1), geo.MAX_SEARCH_RADIUS_KM)
+
+
+def courts_nearby(request):
+    """Return the nearest active courts to ``near=lat,lon`` as JSON."""
+    point = geo.parse_point(request.GET.get("near"))
+    if point is None:
+        return JsonResponse({"error": "near=lat,lon is required"}, status=400)
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 10)), 50))
+    except ValueError:
+        limit = 10
+
+    queryset = CourtLocation.objects.filter(is_active=True)
+    if "radius" in request.GET:
+        courts = geo.within_radius(queryset, *point, _radius_km(request))[:limit]
+    else:
+        courts = geo.nearest(queryset, *point, k=limit)
+
+    results = [
+        {
+            "id": court.pk,
+            "name": court.name,
+            "address": court.address,
+            "city": court.city,
+            "latitude": float(court.latitude),
+            "longitude": float(court.longitude),
+            "cost_per_hour": float(court.cost_per_hour),
+            "distance_km": round(court.distance_km, 2),
+            "url": reverse("court_detail", args=[court.pk]),
+        }
+        for court in courts
+    ]
+    return JsonResponse({"near": list(point), "results": results})
+
+
+class CourtLocationDetailView(ConditionalGetMixin, DetailView):
     """View for court location details."""
 
     model = CourtLocation
     template_name = "tournaments/court_detail.html"
     context_object_name = "court"
 
+    def get_queryset(self):
+        return CourtLocation.objects.select_related("stats")
+
+    def get_conditional_timestamps(self):
+        self._bookings_state = self.object.bookings.aggregate(
+            last=Max("updated_at"), total=Count("id")
+        )
+        stats = getattr(self.object, "stats", None)
+        return [
+            self.object.updated_at,
+            self._bookings_state["last"],
+            stats.refreshed_at if stats else None,
+        ]
+
+    def get_conditional_extra(self):
+        # Прошедшие слоты пропадают из расписания - страница меняется каждый час
+        hour = timezone.localtime().strftime("%Y%m%d%H")
+        return [self._bookings_state["total"], hour]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["booking_minutes"] = settings.MATCH_BOOKING_DURATION_MINUTES
+        context["free_slots"] = schedule.free_slots(
+            self.object,
+            timezone.localdate(),
+            days=7,
+            duration=timedelta(minutes=settings.MATCH_BOOKING_DURATION_MINUTES),
+            step=timedelta(hours=1),
+        )
+        return context
+
+
+def court_free_slots(request, pk: int):
+    """Return free booking slots of a court as JSON.
+
+    Query parameters: ``date`` (YYYY-MM-DD, default today), ``days``
+    (1-14, default 7) and ``duration`` in minutes (default match length).
+    """
+    court = get_object_or_404(CourtLocation, pk=pk, is_active=True)
+    try:
+        first_day = (
+            date.fromisoformat(request.GET["date"])
+            if request.GET.get("date")
+            else timezone.localdate()
+        )
+        days = min(max(int(request.GET.get("days", 7)), 1), 14)
+        duration = int(
+            request.GET.get("duration", settings.MATCH_BOOKING_DURATION_MINUTES)
+        )
+    except ValueError:
+        return JsonResponse({"error": "invalid date, days or duration"}, status=400)
+    if not 15 <= duration <= settings.COURT_BOOKING_MAX_HOURS * 60:
+        return JsonResponse({"error": "invalid duration"}, status=400)
+
+    slots = schedule.free_slots(
+        court, first_day, days=days, duration=timedelta(minutes=duration)
+    )
+    return JsonResponse(
+        {
+            "court": court.pk,
+            "duration": duration,
+            "days": [
+                {
+                    "date": day.isoformat(),
+                    "slots": [timezone.localtime(start).isoformat() for start in starts],
+                }
+                for day, starts in slots
+            ],
+        }
+    )
+
 
 class PartnerSearchListView(ListView):
     """View for listing partner search requests with filters."""
@@ -367,6 +547,7 @@ class PartnerSearchListView(ListView):
         sport_type = self.request.GET.get("sport")
         skill_level = self.request.GET.get("level")
         city = self.request.GET.get("city")
+        preferred_time = self.request.GET.get("time", "").strip()
 
         if sport_type:
             queryset = queryset.filter(sport_type=sport_type)
@@ -374,6 +555,8 @@ class PartnerSearchListView(ListView):
             queryset = queryset.filter(skill_level=skill_level)
         if city:
             queryset = queryset.filter(user__city__icontains=city)
+        if preferred_time:
+            queryset = filter_overlapping(queryset, parse_time_slots(preferred_time))
 
         return queryset.order_by("-created_at")
 
@@ -381,6 +564,17 @@ class PartnerSearchListView(ListView):
         context = super().get_context_data(**kwargs)
         context["sport_choices"] = PartnerSearch.SPORT_CHOICES
         context["level_choices"] = PartnerSearch.LEVEL_CHOICES
+
+        # Рекомендации по последней активной заявке пользователя
+        if self.request.user.is_authenticated:
+            own_search = (
+                PartnerSearch.objects.filter(user=self.request.user, is_active=True)
+                .order_by("-created_at")
+                .first()
+            )
+            if own_search:
+                context["own_search"] = own_search
+                context["recommended_partners"] = recommend_partners(own_search, k=6)
         return context
 
 
@@ -403,11 +597,36 @@ class PartnerSearchCreateView(CreateView):
         # Деактивировать предыдущие заявки пользователя для этого вида спорта
         PartnerSearch.objects.filter(
             user=self.request.user, sport_type=form.instance.sport_type, is_active=True
-        ).update(is_active=False)
+        ).update(is_active=False, updated_at=timezone.now())
         messages.success(self.request, "Заявка на поиск партнера успешно создана!")
         return super().form_valid(form)
 
 
+@login_required
+def partner_search_matches(request, pk: int):
+    """Return the best matching partners for a search as JSON."""
+    search = get_object_or_404(PartnerSearch, pk=pk, is_active=True)
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 10)), 50))
+    except ValueError:
+        limit = 10
+
+    results = [
+        {
+            "id": match.pk,
+            "user": match.user.get_full_name() or match.user.username,
+            "username": match.user.username,
+            "sport_type": match.sport_type,
+            "skill_level": match.skill_level,
+            "preferred_time": match.preferred_time,
+            "preferred_location": match.preferred_location,
+            "score": match.match_score,
+        }
+        for match in recommend_partners(search, k=limit)
+    ]
+    return JsonResponse({"search": search.pk, "results": results})
+
+
 class RatingListView(ListView):
     """View for player ratings."""
 
@@ -681,10 +900,11 @@ def update_player_ratings(match):
 
 def recalculate_rankings():
     """Recalculate rank positions for all players."""
-    ratings = Rating.objects.all().order_by("-points")
-    for index, rating in enumerate(ratings, start=1):
-        rating.rank_position = index
-        rating.save(update_fields=["rank_position"])
+    with RATING_RECOMPUTE_DURATION.time():
+        ratings = Rating.objects.all().order_by("-points")
+        for index, rating in enumerate(ratings, start=1):
+            rating.rank_position = index
+            rating.save(update_fields=["rank_position"])
 
 
 @login_required
@@ -760,6 +980,7 @@ def admin_dashboard(request):
         "django_version": django_version,
         "python_version": python_version,
         "db_name": db_name,
+        "recent_profiles": recent_profiles(),
     }
     
     return render(request, "tournaments/admin_dashboard.html", context)